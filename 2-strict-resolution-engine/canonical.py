@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import re
+
+from cdcl import SELECTION as CDCL, ground_saturation, groundable
+from saturation import NEGATIVE, PROOF, SATURATED, Limits, ProfiledSaturation, Saturation, run_saturation
+from terms import Clause, Literal, Term, is_variable
+
+# Канонический вид набора клауз и кэш результатов резолюции.
+# Формализации одной задачи часто отличаются только именами переменных, порядком литералов и клауз
+# и написанием констант (скулемовских и прочих). Канонический вид убирает эти различия:
+# литералы и клаузы сортируются по "форме" (без имён переменных и констант), затем переменные
+# каждой клаузы получают имена x, y, z, ..., а константы и функции - C1, C2, ... и F1, F2, ...
+# Совпадение канонических видов означает, что наборы переименовываются друг в друга, поэтому
+# ответ и лог резолюции для них одинаковы с точностью до имён. Если форма не позволяет однозначно
+# упорядочить клаузы, равные наборы могут получить разный вид - это лишь промах кэша, а не ошибка.
+
+VARIABLE_NAMES = ("x", "y", "z", "u", "v", "w")
+
+
+# Форма аргумента без имён: переменная, константа или функция с формами аргументов
+def arg_shape(arg):
+    if isinstance(arg, Term):
+        return (2, len(arg.args), tuple(arg_shape(sub) for sub in arg.args))
+    if is_variable(arg):
+        return (0,)
+    return (1,)
+
+def literal_shape(literal):
+    return (literal.predicate, literal.negated, tuple(arg_shape(arg) for arg in literal.args))
+
+
+# Канонические имена: переменные клаузы - по порядку первого вхождения,
+# константы и функции - по порядку первого вхождения во всём наборе
+class Renaming:
+    def __init__(self, reserved):
+        self.reserved = reserved# Имена предикатов: канонические имена с ними не совпадают
+        self.symbols = {}# Исходное имя -> каноническое
+        self.counters = {}
+        self.variables = {}
+
+    def fresh(self, prefix):
+        number = self.counters.get(prefix, 0) + 1
+        while f"{prefix}{number}" in self.reserved:
+            number += 1
+        self.counters[prefix] = number
+        return f"{prefix}{number}"
+
+    def symbol(self, name, prefix):
+        if name not in self.symbols:
+            self.symbols[name] = self.fresh(prefix)
+        return self.symbols[name]
+
+    def variable(self, name):
+        if name not in self.variables:
+            count = len(self.variables)
+            letter = VARIABLE_NAMES[count % len(VARIABLE_NAMES)]
+            number = count // len(VARIABLE_NAMES)
+            self.variables[name] = f"{letter}{number}" if number else letter
+        return self.variables[name]
+
+    def arg(self, arg):
+        if isinstance(arg, Term):
+            return Term(self.symbol(arg.name, "F" if arg.args else "C"), [self.arg(sub) for sub in arg.args])
+        if is_variable(arg):
+            return self.variable(arg)
+        return self.symbol(arg, "C")
+
+    def clause(self, clause):
+        self.variables = {}
+        return Clause([Literal(literal.predicate, [self.arg(arg) for arg in literal.args], literal.negated)
+                       for literal in clause.literals])
+
+
+# Канонический вид набора клауз.
+# Вернёт канонические клаузы и словарь {каноническое имя: исходное} для констант и функций.
+# images - словарь, в который записывается канонический вид каждой исходной клаузы
+def canonicalize(clauses, images=None):
+    shaped = []
+    for clause in clauses:
+        literals = sorted(clause.literals, key=literal_shape)
+        shaped.append((tuple(map(literal_shape, literals)), literals, clause))
+    shaped.sort(key=lambda item: (len(item[0]), item[0]))
+
+    predicates = {literal.predicate for clause in clauses for literal in clause.literals}
+    renaming = Renaming(set(predicates))
+    renamed = [Clause(sorted(renaming.clause(Clause(literals)).literals, key=repr)) for _, literals, _ in shaped]
+    if images is not None:
+        images.update(zip((clause for _, _, clause in shaped), renamed))
+    # После переименования порядок уточняется по полному виду, одинаковые клаузы сливаются
+    canonical = sorted(dict.fromkeys(renamed), key=repr)
+    return canonical, {name: original for original, name in renaming.symbols.items()}
+
+def canonical_text(clauses):
+    return "\n".join(map(repr, clauses))
+
+# Возврат исходных имён констант и функций в строки лога
+def rename_log(log, symbols):
+    if not symbols:
+        return list(log)
+    pattern = re.compile(r"\w+")
+    return [pattern.sub(lambda match: str(symbols.get(match.group(), match.group())), entry) for entry in log]
+
+
+# Кэш результатов резолюции на диске: по JSON-файлу на канонический набор клауз, стратегию выбора,
+# множество поддержки и упорядочение.
+# Хранятся только окончательные ответы (противоречие найдено или клаузы насыщены).
+# Записи содержат сами канонические клаузы, поэтому кэш служит и набором регрессионных задач (replay)
+class ResultCache:
+    def __init__(self, directory, read_only=False):
+        self.directory = directory
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+
+    # support - None, NEGATIVE или канонические клаузы-цели, ordering и literal_selection - как в Saturation
+    @staticmethod
+    def key(canonical, selection, support=None, ordering=None, literal_selection=None):
+        parts = [selection, canonical_text(canonical)]
+        if support is not None:
+            parts.append(support if support == NEGATIVE else canonical_text(support))
+        if ordering is not None or literal_selection is not None:
+            parts.append([ordering, literal_selection])
+        data = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        if self.read_only:
+            return
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, path)
+
+    # Все записи кэша (отсутствующий каталог - пустой кэш)
+    def entries(self):
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".json"):
+                entry = self.get(name[:-len(".json")])
+                if entry is not None:
+                    yield name[:-len(".json")], entry
+
+
+# Резолюция через кэш. На промахе движок запускается на канонических клаузах,
+# лог всегда возвращается с исходными именами констант и функций.
+# Вернёт (True/False/None, лог), как resolution (proof_only, support, ordering, literal_selection, profile, sat
+# и herbrand - тоже; профиль заполняется только на промахе). Решённое CDCL-решателем хранится под стратегией cdcl
+def cached_resolution(clauses, cache, limits=None, selection="fifo", stats=None, proof_only=False, support=None,
+                      ordering=None, literal_selection=None, profile=None, sat=True, herbrand=None):
+    images = {}
+    canonical, symbols = canonicalize(clauses, images)
+    ground = sat and groundable(canonical, herbrand)
+    if ground:# Ответ CDCL-решателя не зависит от стратегии, решатель строится только на промахе
+        selection, support, ordering, literal_selection = CDCL, None, None, None
+    elif support is not None and support != NEGATIVE:
+        support = sorted({images[clause] for clause in support if clause in images}, key=repr)
+    key = ResultCache.key(canonical, selection, support, ordering, literal_selection)
+    entry = cache.get(key)
+    if entry is None or "proof_log" not in entry:# Записи без лога опровержения считаются промахом
+        options = {"support": support, "ordering": ordering, "literal_selection": literal_selection}
+        if ground:
+            saturation = ground_saturation(canonical, herbrand, stats)
+            if profile is not None:
+                profile.stats = saturation.stats
+        elif profile is None:
+            saturation = Saturation(canonical, selection, stats, **options)
+        else:
+            saturation = ProfiledSaturation(canonical, selection, stats, profile=profile, **options)
+        saturation, status = run_saturation(saturation, limits if limits is not None else Limits())
+        proof = {PROOF: True, SATURATED: False}.get(status)
+        if proof is None:
+            return None, rename_log(saturation.log, symbols)
+        entry = {
+            "selection": selection,
+            "clauses": [clause.to_dict() for clause in canonical],
+            "proof": proof,
+            "log": saturation.log,
+            "proof_log": saturation.proof_log(),
+        }
+        if support is not None:
+            entry["support"] = support if support == NEGATIVE else [clause.to_dict() for clause in support]
+        if ordering is not None or literal_selection is not None:
+            entry["ordering"] = ordering
+            entry["literal_selection"] = literal_selection
+        if ground and herbrand is not None:
+            entry["herbrand"] = herbrand
+        cache.put(key, entry)
+    if proof_only and entry["proof"]:
+        return True, rename_log(entry["proof_log"], symbols)
+    return entry["proof"], rename_log(entry["log"], symbols)
+
+
+# Повторный прогон всех записей кэша. parse - разбор JSON-текста клауз (parse_clauses из main).
+# Вернёт ключи записей, ответ или лог которых изменился
+def replay(cache, parse, limits=None):
+    changed = []
+    for key, entry in cache.entries():
+        clauses = parse(json.dumps(entry["clauses"], ensure_ascii=False))
+        support = entry.get("support")
+        if isinstance(support, list):
+            support = parse(json.dumps(support, ensure_ascii=False))
+        if entry["selection"] == CDCL:
+            saturation = ground_saturation(clauses, entry.get("herbrand"))
+        else:
+            saturation = Saturation(clauses, entry["selection"], support=support, ordering=entry.get("ordering"),
+                                    literal_selection=entry.get("literal_selection"))
+        saturation, status = run_saturation(saturation, limits if limits is not None else Limits())
+        proof = {PROOF: True, SATURATED: False}.get(status)
+        if proof != entry["proof"] or saturation.log != entry["log"]:
+            changed.append(key)
+    return changed
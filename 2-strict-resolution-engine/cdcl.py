@@ -0,0 +1,480 @@
+import heapq
+import itertools
+import time
+
+import saturation
+from terms import Clause, Term, is_variable
+
+# Быстрый путь для наборов клауз без переменных: встроенный CDCL SAT-решатель
+# (наблюдаемые литералы, выучивание клауз по первой точке единственности, перезапуски по Луби, активность переменных).
+# Клаузы с переменными без функций можно заземлить по универсуму Эрбрана (его константам) - набор основных
+# примеров равновыполним исходному, поэтому ответ точен в обе стороны.
+# Каждая выученная клауза - резольвента цепочки клауз из анализа конфликта; цепочки запоминаются, а шаги
+# резолюции (saturation.Step) строятся только для опровержения, когда оно найдено. Лог опровержения -
+# обычные шаги резолюции (и подстановки для основных примеров), модуль III читает его как прежде.
+# saturation и cdcl импортируют друг друга модулями целиком: имена разрешаются только при вызове
+
+SELECTION = "cdcl"# Имя стратегии в кэше результатов и в замерах
+CONFLICTS_PER_STEP = 100# Столько конфликтов считается одним шагом в Limits.max_steps
+RESTART_BASE = 100# Конфликтов между перезапусками - это число, умноженное на член последовательности Луби
+ACTIVITY_DECAY = 0.95
+FRESH_CONSTANT = "C"# Константа универсума Эрбрана, если в клаузах констант нет
+
+# Значения литералов
+TRUE = 1
+FALSE = -1
+UNASSIGNED = 0
+
+
+# i-й член последовательности Луби (с 1): 1 1 2 1 1 2 4 1 1 2 ...
+def luby(i):
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+# CDCL-решатель на числах: литерал переменной v - 2v (истинен атом) или 2v + 1 (отрицание).
+# Первые два литерала клаузы с двумя и более литералами наблюдаемые. У выведенного литерала первый литерал
+# клаузы-причины - он сам. Для каждой выученной клаузы в chains хранится, из чего она получена резолюцией
+class Solver:
+    def __init__(self, variables, stats):
+        self.stats = stats
+        self.clauses = []
+        self.watches = [[] for _ in range(2 * variables)]
+        self.value = [UNASSIGNED] * (2 * variables)
+        self.level = [0] * variables
+        self.reason = [None] * variables
+        self.position = [0] * variables# Место переменной в trail
+        self.polarity = [1] * variables# Сохранённая фаза: 1 - атом ложен
+        self.activity = [0.0] * variables
+        self.increment = 1.0
+        self.heap = [(0.0, v) for v in range(variables)]# Кандидаты для решения (ленивое удаление)
+        self.seen = bytearray(variables)
+        self.trail = []
+        self.levels = []# Начало каждого уровня решений в trail
+        self.head = 0# Сколько литералов trail уже распространено
+        self.inputs = 0
+        self.units = []
+        # Номер выученной клаузы -> (клауза конфликта, [(клауза-причина, переменная)...], переменные уровня 0).
+        # Клауза получается резолюцией клаузы конфликта с причинами по порядку, затем с причинами переменных уровня 0
+        self.chains = {}
+        self.final = None# То же для пустой клаузы
+        self.restarts = 0
+        self.since_restart = 0
+
+    # Добавление исходной клаузы (до решения, литералы без повторов)
+    def add_clause(self, literals):
+        number = len(self.clauses)
+        self.clauses.append(literals)
+        if len(literals) == 1:
+            self.units.append(number)
+        else:
+            self.watches[literals[0]].append(number)
+            self.watches[literals[1]].append(number)
+        self.inputs += 1
+        return number
+
+    def enqueue(self, literal, reason):
+        v = literal >> 1
+        self.value[literal] = TRUE
+        self.value[literal ^ 1] = FALSE
+        self.level[v] = len(self.levels)
+        self.reason[v] = reason
+        self.position[v] = len(self.trail)
+        self.trail.append(literal)
+
+    # Распространение единичных клауз. Вернёт номер клаузы конфликта или None
+    def propagate(self):
+        value = self.value
+        watches = self.watches
+        clauses = self.clauses
+        trail = self.trail
+        while self.head < len(trail):
+            false_literal = trail[self.head] ^ 1
+            self.head += 1
+            self.stats["propagations"] += 1
+            watching = watches[false_literal]
+            kept = 0
+            for i, number in enumerate(watching):
+                clause = clauses[number]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                if value[first] != TRUE:
+                    for k in range(2, len(clause)):
+                        if value[clause[k]] != FALSE:
+                            clause[1], clause[k] = clause[k], false_literal
+                            watches[clause[1]].append(number)
+                            break
+                    else:
+                        watching[kept] = number
+                        kept += 1
+                        if value[first] == FALSE:
+                            for rest in watching[i + 1:]:
+                                watching[kept] = rest
+                                kept += 1
+                            del watching[kept:]
+                            return number
+                        self.enqueue(first, number)
+                    continue
+                watching[kept] = number
+                kept += 1
+            del watching[kept:]
+        return None
+
+    # Анализ конфликта: выученная клауза (первый литерал - утверждаемый) и её цепочка для chains
+    def analyze(self, conflict):
+        seen = self.seen
+        level = self.level
+        trail = self.trail
+        current = len(self.levels)
+        learnt = [0]
+        chain = []
+        zero = []
+        marked = []
+        counter = 0
+        literals = self.clauses[conflict]
+        index = len(trail) - 1
+        while True:
+            for literal in literals:
+                v = literal >> 1
+                if not seen[v]:
+                    seen[v] = 1
+                    marked.append(v)
+                    if level[v] == current:
+                        counter += 1
+                        self.bump(v)
+                    elif level[v] > 0:
+                        learnt.append(literal)
+                        self.bump(v)
+                    else:
+                        zero.append(v)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            pivot = trail[index]
+            index -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            reason = self.reason[pivot >> 1]
+            chain.append((reason, pivot >> 1))
+            literals = self.clauses[reason][1:]
+        learnt[0] = pivot ^ 1
+        for v in marked:
+            seen[v] = 0
+        return learnt, (conflict, chain, zero)
+
+    def bump(self, v):
+        self.activity[v] += self.increment
+        if self.activity[v] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+            self.heap = [(-self.activity[u], u) for u in range(len(self.activity)) if self.value[2 * u] == UNASSIGNED]
+            heapq.heapify(self.heap)
+        elif self.value[2 * v] == UNASSIGNED:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    # Отмена решений выше уровня level
+    def cancel(self, level):
+        if len(self.levels) <= level:
+            return
+        start = self.levels[level]
+        for literal in reversed(self.trail[start:]):
+            v = literal >> 1
+            self.value[literal] = self.value[literal ^ 1] = UNASSIGNED
+            self.reason[v] = None
+            self.polarity[v] = literal & 1
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[start:]
+        del self.levels[level:]
+        self.head = start
+
+    # Переменная для следующего решения (самая активная из неозначенных) или None
+    def pick(self):
+        heap = self.heap
+        while heap:
+            activity, v = heapq.heappop(heap)
+            if self.value[2 * v] == UNASSIGNED and -activity == self.activity[v]:
+                return v
+        return None
+
+    # Поиск в пределах limits. Вернёт (True - выполнимо, False - невыполнимо, None - ресурсы исчерпаны; причина)
+    def solve(self, limits):
+        stats = self.stats
+        started = time.monotonic()
+        conflicts = stats["conflicts"]
+        generated = stats["generated"]
+        if not self.levels and not self.trail:# Первый запуск: единичные исходные клаузы
+            for number in self.units:
+                literal = self.clauses[number][0]
+                if self.value[literal] == FALSE:
+                    self.final = (number, [], [literal >> 1])
+                    return False, None
+                if self.value[literal] == UNASSIGNED:
+                    self.enqueue(literal, number)
+        while True:
+            conflict = self.propagate()
+            if conflict is None:
+                v = self.pick()
+                if v is None:
+                    return True, None
+                stats["decisions"] += 1
+                self.levels.append(len(self.trail))
+                self.enqueue(2 * v + self.polarity[v], None)
+                continue
+            stats["conflicts"] += 1
+            if not self.levels:
+                self.final = (conflict, [], [literal >> 1 for literal in self.clauses[conflict]])
+                return False, None
+            learnt, chain = self.analyze(conflict)
+            back = 0
+            if len(learnt) > 1:
+                second = max(range(1, len(learnt)), key=lambda i: self.level[learnt[i] >> 1])
+                learnt[1], learnt[second] = learnt[second], learnt[1]
+                back = self.level[learnt[1] >> 1]
+            self.cancel(back)
+            number = len(self.clauses)
+            self.clauses.append(learnt)
+            if len(learnt) > 1:
+                self.watches[learnt[0]].append(number)
+                self.watches[learnt[1]].append(number)
+            self.chains[number] = chain
+            stats["generated"] += 1
+            self.enqueue(learnt[0], number)
+            self.increment /= ACTIVITY_DECAY
+            self.since_restart += 1
+            if self.since_restart >= RESTART_BASE * luby(self.restarts + 1):
+                self.cancel(0)
+                self.restarts += 1
+                self.since_restart = 0
+                stats["restarts"] += 1
+            reason = limits.exceeded((stats["conflicts"] - conflicts) // CONFLICTS_PER_STEP, time.monotonic() - started,
+                                     stats["generated"] - generated)
+            if reason is not None:
+                return None, reason
+
+
+# Универсум Эрбрана - константы набора (только для наборов без функций).
+# Вернёт список констант или None, если есть функции или основных примеров клауз больше max_instances
+def herbrand_universe(clauses, max_instances):
+    constants = {}
+    for clause in clauses:
+        for literal in clause.literals:
+            for arg in literal.args:
+                if isinstance(arg, Term):
+                    return None
+                if not is_variable(arg):
+                    constants[arg] = None
+    universe = list(constants) or [FRESH_CONSTANT]
+    if sum(len(universe) ** len(clause.variables()) for clause in clauses) > max_instances:
+        return None
+    return universe
+
+
+# Основные примеры клауз над универсумом Эрбрана.
+# Вернёт список (исходная клауза, пример, подстановка) или None, если есть функции или примеров больше max_instances
+def herbrand_instances(clauses, max_instances):
+    universe = herbrand_universe(clauses, max_instances)
+    if universe is None:
+        return None
+    instances = []
+    for clause in clauses:
+        variables = clause.variables()
+        for values in itertools.product(universe, repeat=len(variables)):
+            substitution = dict(zip(variables, values))
+            literals = [literal.apply_substitution(substitution) for literal in clause.literals]
+            instances.append((clause, Clause(saturation.without_duplicates(literals)), substitution))
+    return instances
+
+
+# Насыщение-заменитель для основных клауз: тот же интерфейс, что у saturation.Saturation
+# (run, status, reason, stats, log, proof_log), но поиск ведёт CDCL-решатель.
+# instances - основные примеры клауз (из herbrand_instances) или None, если клаузы уже основные.
+# Лог при найденном противоречии - шаги опровержения, при выполнимости - выполняющая оценка.
+# Ответ точен, поэтому complete всегда истинно
+class GroundSaturation:
+    def __init__(self, clauses, instances=None, stats=None, trace=False):
+        self.stats = stats if stats is not None else {}
+        for counter in ("generated", "tautologies", "instances", "decisions", "conflicts", "propagations", "restarts"):
+            self.stats.setdefault(counter, 0)
+        self.trace = trace
+        self.complete = True
+        self.status = None
+        self.reason = None
+        self.contradiction = None
+        self.step = 1
+        self.steps = []# Шаги, построенные для опровержения
+        self.inputs = [saturation.Step(None, saturation.INPUT, clause) for clause in clauses]
+        self.clause_steps = {}# Номер клаузы решателя -> её шаг (строится при необходимости)
+        self.sources = []# Номер исходной клаузы решателя -> (пример, шаг исходной клаузы, подстановка)
+        self.variables = {}# Атом (литерал без отрицания) -> номер переменной
+        if instances is None:
+            sources = [(step.clause, step, {}) for step in self.inputs]
+        else:
+            steps = {step.clause: step for step in self.inputs}
+            sources = [(instance, steps[clause], substitution) for clause, instance, substitution in instances]
+            self.stats["instances"] += len(instances)
+        encoded = []
+        for source in sources:
+            if not source[0].literals:
+                self.status = saturation.PROOF
+                self.contradiction = self.source_step(source)
+                return
+            codes = list(dict.fromkeys(self.code(literal) for literal in source[0].literals))
+            if any(code ^ 1 in codes for code in codes):
+                self.stats["tautologies"] += 1
+                continue
+            self.sources.append(source)
+            encoded.append(codes)
+        self.solver = Solver(len(self.variables), self.stats)
+        for codes in encoded:
+            self.solver.add_clause(codes)
+
+    # Число-литерал решателя для литерала
+    def code(self, literal):
+        atom = literal.negate() if literal.negated else literal
+        if atom not in self.variables:
+            self.variables[atom] = len(self.variables)
+        return 2 * self.variables[atom] + literal.negated
+
+    def run(self, limits=None):
+        if self.status in (saturation.PROOF, saturation.SATURATED):
+            return self.status
+        satisfiable, self.reason = self.solver.solve(limits if limits is not None else saturation.Limits())
+        if satisfiable is None:
+            self.status = saturation.UNKNOWN
+        elif satisfiable:
+            self.status = saturation.SATURATED
+        else:
+            self.status = saturation.PROOF
+            self.contradiction = self.refutation()
+        return self.status
+
+    # Лог: шаги опровержения или выполняющая оценка (атомы в порядке появления)
+    @property
+    def log(self):
+        if self.status == saturation.PROOF:
+            return self.proof_log()
+        if self.status == saturation.SATURATED:
+            value = self.solver.value
+            model = [atom if value[2 * v] == TRUE else atom.negate() for atom, v in self.variables.items()]
+            return [f"Выполняющая оценка: {', '.join(map(str, model))}."]
+        return []
+
+    def proof_log(self):
+        if self.contradiction is None:
+            return []
+        lines = []
+        for number, step in enumerate(self.contradiction.ancestors(), 1):
+            lines += step.render(number, self.trace)
+        return lines
+
+    def new_step(self, kind, clause, parents, pair):
+        step = saturation.Step(self.step, kind, clause, parents, pair)
+        self.step += 1
+        self.steps.append(step)
+        return step
+
+    # Шаг исходной клаузы решателя: сама исходная клауза или подстановка в неё
+    def source_step(self, source):
+        instance, parent, substitution = source
+        if not substitution:
+            return parent
+        return self.new_step(saturation.INSTANCE, instance, (parent,), tuple(substitution.items()))
+
+    # Резольвента клаузы шага given и клаузы шага partner по переменной v (в partner литерал истинен)
+    def resolve(self, given, partner, v):
+        def position(step):
+            return next(i for i, literal in enumerate(step.clause.literals) if self.variables[literal.negate() if literal.negated else literal] == v)
+        i, j = position(partner), position(given)
+        pivot, other = partner.clause.literals[i], given.clause.literals[j]
+        literals = [literal for literal in partner.clause.literals if literal is not pivot]
+        literals += [literal for literal in given.clause.literals if literal is not other]
+        return self.new_step(saturation.RESOLUTION, Clause(saturation.without_duplicates(literals)), (partner, given), (i, j))
+
+    # Шаги резолюции по цепочке из Solver.chains: сначала с причинами из анализа конфликта,
+    # затем с причинами переменных уровня 0 - от назначенных последними к первым
+    def derive(self, chain):
+        solver = self.solver
+        conflict, reasons, zero = chain
+        step = self.solver_step(conflict)
+        for reason, v in reasons:
+            step = self.resolve(step, self.solver_step(reason), v)
+        pending = [(-solver.position[v], v) for v in zero]
+        heapq.heapify(pending)
+        queued = set(zero)
+        while pending:
+            _, v = heapq.heappop(pending)
+            reason = solver.reason[v]
+            step = self.resolve(step, self.solver_step(reason), v)
+            for literal in solver.clauses[reason]:
+                u = literal >> 1
+                if u not in queued:
+                    queued.add(u)
+                    heapq.heappush(pending, (-solver.position[u], u))
+        return step
+
+    # Шаг клаузы решателя с номером number. Выученные клаузы зависят только от клауз с меньшими номерами,
+    # поэтому все нужные для неё выученные клаузы сначала собираются, а затем строятся по возрастанию номеров
+    def solver_step(self, number):
+        if number in self.clause_steps:
+            return self.clause_steps[number]
+        solver = self.solver
+        if number < solver.inputs:
+            self.clause_steps[number] = self.source_step(self.sources[number])
+            return self.clause_steps[number]
+        needed = set()
+        stack = [number]
+        while stack:
+            current = stack.pop()
+            if current in needed or current in self.clause_steps or current < solver.inputs:
+                continue
+            needed.add(current)
+            stack.extend(self.dependencies(solver.chains[current]))
+        for current in sorted(needed):
+            self.clause_steps[current] = self.derive(solver.chains[current])
+        return self.clause_steps[number]
+
+    # Номера клауз, с которыми резольвирует цепочка (включая причины переменных уровня 0)
+    def dependencies(self, chain):
+        solver = self.solver
+        conflict, reasons, zero = chain
+        result = [conflict] + [reason for reason, _ in reasons]
+        stack = list(zero)
+        visited = set(zero)
+        while stack:
+            reason = solver.reason[stack.pop()]
+            result.append(reason)
+            for literal in solver.clauses[reason]:
+                if literal >> 1 not in visited:
+                    visited.add(literal >> 1)
+                    stack.append(literal >> 1)
+        return result
+
+    # Шаг пустой клаузы
+    def refutation(self):
+        return self.derive(self.solver.final)
+
+
+# Применим ли быстрый путь ground_saturation (без заземления и построения решателя)
+def groundable(clauses, herbrand=None):
+    if all(literal.ground for clause in clauses for literal in clause.literals):
+        return True
+    return herbrand is not None and herbrand_universe(clauses, herbrand) is not None
+
+
+# Быстрый путь для clauses: GroundSaturation, если клаузы основные или (при herbrand - наибольшем числе
+# основных примеров) их можно заземлить по универсуму Эрбрана, иначе None
+def ground_saturation(clauses, herbrand=None, stats=None, trace=False):
+    if all(literal.ground for clause in clauses for literal in clause.literals):
+        return GroundSaturation(clauses, None, stats, trace)
+    if herbrand is None:
+        return None
+    instances = herbrand_instances(clauses, herbrand)
+    if instances is None:
+        return None
+    return GroundSaturation(clauses, instances, stats, trace)
@@ -0,0 +1,160 @@
+import sys
+
+from terms import Clause, ClauseFormatError, Literal, Term
+
+# Двоичное представление клауз: таблица символов и клаузы, записанные номерами символов (целые в формате varint).
+# Используется для файлов клауз и состояний насыщения (serialization.py) и для обмена с процессами (parallel.py)
+
+
+# Двоичный формат: varint - целое без знака, по 7 бит в байте, старший бит - признак продолжения
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+# Все целые из последовательности varint (один проход по байтам)
+def read_varints(data):
+    values = []
+    value = 0
+    shift = 0
+    for byte in data:
+        if byte < 0x80:
+            values.append(value | byte << shift)
+            value = 0
+            shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    if shift:
+        raise ClauseFormatError("двоичные данные оборвались посреди числа")
+    return values
+
+# Кодирование клауз номерами символов. Таблица символов пополняется по ходу записи.
+# Кодировщик можно использовать для серии сообщений: в каждое попадают только новые символы
+class Encoder:
+    def __init__(self):
+        self.symbols = {}
+        self.sent = 0# Сколько символов уже записано в прежние сообщения
+        self.body = bytearray()
+
+    def symbol(self, name):
+        number = self.symbols.get(name)
+        if number is None:
+            number = self.symbols[name] = len(self.symbols)
+        return number
+
+    # Аргумент: номер символа * 2 + признак функции, у функции далее арность и аргументы
+    def arg(self, out, arg):
+        if isinstance(arg, Term):
+            write_varint(out, self.symbol(arg.name) * 2 + 1)
+            write_varint(out, len(arg.args))
+            for sub in arg.args:
+                self.arg(out, sub)
+        else:
+            write_varint(out, self.symbol(arg) * 2)
+
+    # Раздел клауз (с длиной в байтах): число клауз, у клаузы - число литералов,
+    # у литерала - номер предиката * 2 + отрицание, число аргументов и аргументы
+    def clauses(self, clauses):
+        clauses = list(clauses)
+        out = bytearray()
+        write_varint(out, len(clauses))
+        for clause in clauses:
+            write_varint(out, len(clause.literals))
+            for literal in clause.literals:
+                write_varint(out, self.symbol(literal.predicate) * 2 + literal.negated)
+                write_varint(out, len(literal.args))
+                for arg in literal.args:
+                    self.arg(out, arg)
+        self.blob(out)
+
+    # Раздел целых чисел (с длиной в байтах)
+    def integers(self, values):
+        out = bytearray()
+        for value in values:
+            write_varint(out, value)
+        self.blob(out)
+
+    def blob(self, data):
+        write_varint(self.body, len(data))
+        self.body += data
+
+    # Сообщение: сигнатура, новые символы и закодированные данные. После него тело очищается
+    def result(self, magic=b""):
+        out = bytearray(magic)
+        names = list(self.symbols)[self.sent:]
+        write_varint(out, len(names))
+        for name in names:
+            data = name.encode("utf-8")
+            write_varint(out, len(data))
+            out += data
+        out += self.body
+        self.sent = len(self.symbols)
+        self.body = bytearray()
+        return bytes(out)
+
+# Декодер сообщений Encoder. Таблица символов накапливается от сообщения к сообщению
+class Decoder:
+    def __init__(self):
+        self.symbols = []
+        self.data = b""
+        self.pos = 0
+
+    # Начало разбора очередного сообщения. Вернёт сам декодер
+    def feed(self, data, magic=b""):
+        if data[:len(magic)] != magic:
+            raise ClauseFormatError("неизвестный двоичный формат или версия")
+        self.data = data
+        self.pos = len(magic)
+        self.symbols += [sys.intern(self.blob().decode("utf-8")) for _ in range(self.varint())]
+        return self
+
+    def integers(self):
+        return read_varints(self.blob())
+
+    def varint(self):
+        data = self.data
+        value = 0
+        shift = 0
+        try:
+            while True:
+                byte = data[self.pos]
+                self.pos += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    return value
+                shift += 7
+        except IndexError:
+            raise ClauseFormatError(f"двоичные данные оборвались (смещение {self.pos})") from None
+
+    def blob(self):
+        size = self.varint()
+        if self.pos + size > len(self.data):
+            raise ClauseFormatError(f"двоичные данные оборвались (смещение {self.pos})")
+        self.pos += size
+        return self.data[self.pos - size:self.pos]
+
+    # Раздел клауз: числа раздела читаются разом, затем из них собираются объекты
+    def clauses(self):
+        symbols = self.symbols
+        values = read_varints(self.blob())
+        take = iter(values).__next__
+
+        def arg():
+            code = take()
+            if not code & 1:
+                return symbols[code >> 1]
+            return Term(symbols[code >> 1], [arg() for _ in range(take())])
+
+        clauses = []
+        try:
+            for _ in range(take()):
+                literals = []
+                for _ in range(take()):
+                    code = take()
+                    literals.append(Literal(symbols[code >> 1], [arg() for _ in range(take())], bool(code & 1)))
+                clauses.append(Clause(literals))
+        except (StopIteration, IndexError):
+            raise ClauseFormatError("повреждённый раздел клауз в двоичных данных") from None
+        return clauses
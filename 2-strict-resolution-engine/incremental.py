@@ -0,0 +1,95 @@
+import collections
+
+from saturation import INPUT, PROOF, SATURATED, Limits, Saturation, Step, forward_subsumed, is_tautology
+
+# Инкрементальное решение: много целей при одних и тех же посылках.
+# Посылки насыщаются один раз (полностью или до ограничений), их состояние с индексами сохраняется.
+# Для каждой цели поверх него строится слой предположений (Assumptions): отрицание цели - множество поддержки,
+# резольвируются только пары с клаузой слоя, а все хранимые клаузы посылок служат готовыми партнёрами.
+# Следствия посылок между собой заново не выводятся, поэтому время на цель - только вывод от цели.
+# Слой ничего не меняет в посылках: чтобы отказаться от предположений, слой достаточно отбросить.
+# Если посылки насыщены полностью (SATURATED), насыщение слоя доказывает, что противоречия нет
+# (множество поддержки при выполнимых посылках полно); иначе run() вернёт UNKNOWN с причиной "support".
+
+
+# Слой предположений над насыщением посылок premises. clauses - предположения (обычно отрицание цели).
+# Клаузы слоя поглощаются клаузами посылок, но не наоборот: посылки остаются нетронутыми.
+# Шаги слоя нумеруются продолжая шаги посылок, в лог слоя входит и лог посылок.
+# После продолжения насыщения посылок слой устаревает и run() сообщает об ошибке
+class Assumptions(Saturation):
+    def __init__(self, premises, clauses, selection="unit", stats=None, trace=None):
+        self.premises = premises
+        super().__init__([], selection, stats, premises.trace if trace is None else trace,
+                         ordering=premises.ordering, literal_selection=premises.literal_selection)
+        self.version = premises.processed.count# Сколько клауз посылок было обработано при создании слоя
+        self.derivations = collections.ChainMap({}, premises.derivations)
+        self.eligible = collections.ChainMap({}, premises.eligible)
+        self.step = premises.step
+        self.complete = premises.status == SATURATED and self.ordering is None and self.literal_selection is None
+        if premises.status == PROOF:# Посылки противоречивы сами по себе
+            self.status = PROOF
+            self.contradiction = premises.contradiction
+            return
+        for clause in clauses:
+            if self.keep(clause):
+                self.record(Step(None, INPUT, clause))
+
+    @property
+    def log(self):
+        return self.premises.log + super().log
+
+    def run(self, limits=None):
+        if self.premises.processed.count != self.version:
+            raise ValueError("Насыщение посылок продолжено после добавления предположений, слой устарел")
+        return super().run(limits)
+
+    # Дубликаты и клаузы, поглощённые посылками, отсекаются до проверок самого слоя
+    def keep(self, clause, usable=False):
+        premises = self.premises
+        if clause not in self.seen:
+            if clause in premises.seen:
+                self.seen.add(clause)
+                self.stats["duplicates"] += 1
+                return False
+            if not is_tautology(clause) and forward_subsumed(clause, premises.kept):
+                self.seen.add(clause)
+                self.stats["forward_subsumed"] += 1
+                return False
+        return super().keep(clause, usable)
+
+    # Партнёры: все хранимые клаузы посылок, затем обработанные клаузы слоя
+    def partners(self, given):
+        offset = self.premises.kept.count
+        partners = self.premises.kept.partners(given)
+        partners += [(offset + number, partner, pairs) for number, partner, pairs in self.processed.partners(given)]
+        if self.ordering is not None or self.literal_selection is not None:
+            partners = self.restrict(given, partners)
+        return partners
+
+
+# Решатель для серии целей при общих посылках. premises - клаузы посылок или готовое насыщение
+# (например, загруженное read_state); limits - ограничения первого насыщения посылок.
+# selection, stats, trace, ordering и literal_selection - параметры насыщения посылок (как в Saturation)
+class IncrementalSolver:
+    def __init__(self, premises, limits=None, selection="fifo", stats=None, trace=False, ordering=None,
+                 literal_selection=None):
+        if not isinstance(premises, Saturation):
+            premises = Saturation(premises, selection, stats, trace, ordering=ordering, literal_selection=literal_selection)
+        self.premises = premises
+        self.saturate(limits)
+
+    # Продолжение насыщения посылок (уже созданные слои предположений после этого устаревают)
+    def saturate(self, limits=None):
+        return self.premises.run(limits)
+
+    # Слой предположений clauses над посылками; отказ от предположений - просто отбросить слой
+    def assume(self, clauses, selection="unit", stats=None):
+        return Assumptions(self.premises, clauses, selection, stats)
+
+    # Решение для одной цели: goals - клаузы отрицания заключения. Вернёт то же, что saturation.resolution
+    def prove(self, goals, limits=None, proof_only=False, selection="unit", stats=None):
+        assumptions = self.assume(goals, selection, stats)
+        status = assumptions.run(limits if limits is not None else Limits())
+        if proof_only and status == PROOF:
+            return True, assumptions.proof_log()
+        return {PROOF: True, SATURATED: False}.get(status), assumptions.log
@@ -0,0 +1,202 @@
+# Индексы клауз для быстрого поиска партнёров по резолюции
+
+
+# Индекс литералов по ключу (предикат, арность, знак).
+# Для каждого ключа хранится список (номер клаузы, клауза, позиция литерала в клаузе)
+class PredicateIndex:
+    def __init__(self):
+        self.entries = {}
+        self.count = 0# Номер следующей добавляемой клаузы, задаёт порядок выдачи партнёров
+        self.size = 0# Количество клауз в индексе сейчас
+
+    def __len__(self):
+        return self.size
+
+    # Ключ индекса для литерала
+    @staticmethod
+    def key(literal):
+        return literal.predicate, len(literal.args), literal.negated
+
+    # Добавление клаузы в индекс (инкрементально, по мере обработки клауз)
+    def add(self, clause):
+        for position, literal in enumerate(clause.literals):
+            self.entries.setdefault(self.key(literal), []).append((self.count, clause, position))
+        self.count += 1
+        self.size += 1
+
+    # Удаление клаузы из индекса (например, поглощённой более общей). Вернёт False, если её там нет
+    def remove(self, clause):
+        found = False
+        for literal in clause.literals:
+            entries = self.entries.get(self.key(literal))
+            if entries:
+                kept = [entry for entry in entries if entry[1] is not clause]
+                found = found or len(kept) != len(entries)
+                self.entries[self.key(literal)] = kept
+        if found:
+            self.size -= 1
+        return found
+
+    # Все вхождения литералов, которые могут образовать контрарную пару с данным
+    def complementary(self, literal):
+        return self.entries.get((literal.predicate, len(literal.args), not literal.negated), ())
+
+    # Списки вхождений литералов
+    def leaves(self):
+        return self.entries.values()
+
+    # Клаузы индекса в порядке добавления
+    def clauses(self):
+        numbered = {}
+        for entries in self.leaves():
+            for number, clause, _ in entries:
+                numbered[number] = clause
+        return [numbered[number] for number in sorted(numbered)]
+
+    # Партнёры по резолюции для клаузы в порядке их добавления в индекс.
+    # Для каждого партнёра возвращаются его номер в индексе и пары позиций (литерал партнёра, литерал клаузы)
+    def partners(self, clause):
+        candidates = {}
+        for i, literal in enumerate(clause.literals):
+            for number, partner, j in self.complementary(literal):
+                candidates.setdefault(number, (partner, []))[1].append((j, i))
+        result = []
+        for number in sorted(candidates):
+            partner, pairs = candidates[number]
+            pairs.sort()
+            result.append((number, partner, pairs))
+        return result
+
+
+# Символ переменной в дереве различения: все переменные неразличимы
+VARIABLE = "*"
+
+# Режимы поиска в дереве различения
+UNIFIABLE = "unifiable"# Литералы, унифицируемые с запросом
+INSTANCES = "instances"# Литералы, являющиеся частными случаями запроса
+GENERALIZATIONS = "generalizations"# Литералы, обобщающие запрос
+
+
+# Символ аргумента: переменная или пара (имя, арность)
+def symbol_of(arg):
+    if isinstance(arg, str):
+        return VARIABLE if arg.islower() else (arg, 0)
+    return arg.name, len(arg.args)
+
+# Аргументы литерала в виде последовательности символов в прямом порядке обхода
+def flatten(args):
+    symbols = []
+    stack = list(reversed(args))
+    while stack:
+        arg = stack.pop()
+        symbols.append(symbol_of(arg))
+        if not isinstance(arg, str):
+            stack.extend(reversed(arg.args))
+    return symbols
+
+# Для каждой позиции последовательности - позиция сразу за подтермом, который там начинается
+def subterm_ends(symbols):
+    ends = [0] * len(symbols)
+    for i in range(len(symbols) - 1, -1, -1):
+        end = i + 1
+        if symbols[i] != VARIABLE:
+            for _ in range(symbols[i][1]):
+                end = ends[end]
+        ends[i] = end
+    return ends
+
+# Все узлы дерева, в которые можно попасть, пропустив count целых подтермов
+def skip_terms(node, count):
+    if count == 0:
+        yield node
+        return
+    for symbol, child in node.items():
+        if symbol is None:
+            continue
+        arity = 0 if symbol == VARIABLE else symbol[1]
+        yield from skip_terms(child, count - 1 + arity)
+
+
+# Дерево различения (discrimination tree) над аргументами литералов.
+# Корни деревьев разделены тем же ключом, что и в PredicateIndex, а ветви - символами аргументов.
+# Поиск возвращает надмножество подходящих литералов: повторные переменные не учитываются,
+# поэтому окончательную проверку делает унификация, но заведомо несовместимые литералы отсекаются.
+class TermIndex(PredicateIndex):
+    def add(self, clause):
+        for position, literal in enumerate(clause.literals):
+            node = self.entries.setdefault(self.key(literal), {})
+            for symbol in flatten(literal.args):
+                node = node.setdefault(symbol, {})
+            node.setdefault(None, []).append((self.count, clause, position))
+        self.count += 1
+        self.size += 1
+
+    def leaves(self):
+        stack = list(self.entries.values())
+        while stack:
+            node = stack.pop()
+            for symbol, child in node.items():
+                if symbol is None:
+                    yield child
+                else:
+                    stack.append(child)
+
+    def remove(self, clause):
+        found = False
+        for literal in clause.literals:
+            node = self.entries.get(self.key(literal))
+            for symbol in flatten(literal.args):
+                if node is None:
+                    break
+                node = node.get(symbol)
+            if node is not None and None in node:
+                entries = node[None]
+                node[None] = [entry for entry in entries if entry[1] is not clause]
+                found = found or len(node[None]) != len(entries)
+        if found:
+            self.size -= 1
+        return found
+
+    # Вхождения литералов противоположного знака, с которыми возможна унификация
+    def complementary(self, literal):
+        return self.retrieve((literal.predicate, len(literal.args), not literal.negated), literal.args, UNIFIABLE)
+
+    def unifiable(self, literal):
+        return self.retrieve(self.key(literal), literal.args, UNIFIABLE)
+
+    def instances(self, literal):
+        return self.retrieve(self.key(literal), literal.args, INSTANCES)
+
+    def generalizations(self, literal):
+        return self.retrieve(self.key(literal), literal.args, GENERALIZATIONS)
+
+    # Поиск вхождений литералов с данным ключом, совместимых с аргументами args в режиме mode
+    def retrieve(self, key, args, mode):
+        root = self.entries.get(key)
+        if root is None:
+            return []
+        symbols = flatten(args)
+        result = []
+        self._retrieve(root, symbols, subterm_ends(symbols), 0, mode, result)
+        return result
+
+    def _retrieve(self, node, symbols, ends, i, mode, result):
+        if i == len(symbols):
+            result.extend(node.get(None, ()))
+            return
+        symbol = symbols[i]
+        if symbol == VARIABLE:
+            if mode == GENERALIZATIONS:
+                # Переменная запроса обобщается только переменной
+                if VARIABLE in node:
+                    self._retrieve(node[VARIABLE], symbols, ends, i + 1, mode, result)
+            else:
+                # Переменная запроса сопоставляется любому подтерму в дереве
+                for child in skip_terms(node, 1):
+                    self._retrieve(child, symbols, ends, i + 1, mode, result)
+            return
+        if mode != INSTANCES and VARIABLE in node:
+            # Переменная в дереве сопоставляется целому подтерму запроса
+            self._retrieve(node[VARIABLE], symbols, ends, ends[i], mode, result)
+        if symbol in node:
+            self._retrieve(node[symbol], symbols, ends, i + 1, mode, result)
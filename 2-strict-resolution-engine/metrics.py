@@ -0,0 +1,103 @@
+import json
+import time
+
+from terms import Term
+
+# Профиль запуска насыщения: счётчики, время по фазам, гистограммы длин клауз и глубин термов,
+# пиковое число хранимых клауз и периодические сообщения о ходе поиска.
+# Заполняется классом saturation.ProfiledSaturation; обычный Saturation профиль не ведёт и не платит за него.
+# Фазы вложены (отбор избыточных клауз идёт внутри резолюции), время каждой фазы - собственное, без вложенных.
+
+# Фазы
+SELECTION = "selection"# Выбор данной клаузы
+FACTORING = "factoring"# Построение факторов
+INDEXING = "indexing"# Поиск партнёров в индексе (и отсев пар упорядочением)
+RESOLUTION = "resolution"# Унификация и построение резольвент
+REDUNDANCY = "redundancy"# Проверки дубликатов, тавтологий и поглощения
+OTHER = "other"# Остальная работа цикла: проверка ограничений и т.п.
+
+
+# Глубина аргумента: переменная и константа - 0, функция - 1 + наибольшая глубина аргументов
+def term_depth(arg):
+    depth = 0
+    stack = [(arg, 0)]
+    while stack:
+        arg, level = stack.pop()
+        if isinstance(arg, Term):
+            level += 1
+            depth = max(depth, level)
+            stack.extend((sub, level) for sub in arg.args)
+    return depth
+
+def clause_depth(clause):
+    return max((term_depth(arg) for literal in clause.literals for arg in literal.args), default=0)
+
+
+class Profile:
+    # progress - функция, которой раз в interval секунд передаётся снимок хода поиска (словарь)
+    def __init__(self, progress=None, interval=1.0):
+        self.progress = progress
+        self.interval = interval
+        self.counters = {"given": 0, "factors": 0, "resolvents": 0, "unification_attempts": 0}
+        self.stats = {}# Счётчики насыщения (тот же словарь, что Saturation.stats)
+        self.times = {}
+        self.clause_lengths = {}# Длина сохранённой клаузы -> количество
+        self.term_depths = {}# Глубина сохранённой клаузы -> количество
+        self.peak_store = 0# Наибольшее число одновременно хранимых клауз
+        self.peak_memory_mb = None
+        self.stack = []# Начатые фазы: [фаза, время начала, время вложенных фаз]
+        self.last_progress = time.monotonic()
+
+    def start(self, phase):
+        self.stack.append([phase, time.perf_counter(), 0.0])
+
+    def stop(self):
+        phase, started, nested = self.stack.pop()
+        elapsed = time.perf_counter() - started
+        self.times[phase] = self.times.get(phase, 0.0) + elapsed - nested
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    # Учёт сохранённой клаузы; store - число хранимых клауз после её сохранения
+    def kept(self, clause, store):
+        length = len(clause.literals)
+        self.clause_lengths[length] = self.clause_lengths.get(length, 0) + 1
+        depth = clause_depth(clause)
+        self.term_depths[depth] = self.term_depths.get(depth, 0) + 1
+        self.peak_store = max(self.peak_store, store)
+
+    # Пора ли сообщить о ходе поиска
+    def due(self):
+        if self.progress is None:
+            return False
+        now = time.monotonic()
+        if now - self.last_progress < self.interval:
+            return False
+        self.last_progress = now
+        return True
+
+    def to_dict(self):
+        counters = {**self.stats, **self.counters}
+        counters["unification_failures"] = counters["unification_attempts"] - counters["resolvents"]
+        return {
+            "counters": counters,
+            "seconds": {phase: round(seconds, 6) for phase, seconds in sorted(self.times.items())},
+            "clause_lengths": {str(length): count for length, count in sorted(self.clause_lengths.items())},
+            "term_depths": {str(depth): count for depth, count in sorted(self.term_depths.items())},
+            "peak_store": self.peak_store,
+            "peak_memory_mb": self.peak_memory_mb,
+        }
+
+    # Краткая сводка для печати: счётчики и время фаз
+    def summary(self):
+        data = self.to_dict()
+        counters = ", ".join(f"{name} {value}" for name, value in data["counters"].items())
+        phases = ", ".join(f"{phase} {seconds:.3f} с" for phase, seconds in data["seconds"].items())
+        return f"Счётчики: {counters}\nВремя по фазам: {phases}\nНаибольшее число хранимых клауз: {self.peak_store}"
+
+
+# Запись профиля в JSON-файл
+def write_profile(profile, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(profile.to_dict(), f, ensure_ascii=False, indent=1)
+        f.write("\n")
@@ -0,0 +1,182 @@
+import re
+import sys
+
+from terms import Clause, ClauseFormatError, Literal, Term
+
+# Разбор клауз в текстовой записи, которую печатает сам движок: ¬P(x) ∨ Q(f(x), A).
+# Файл клауз - по клаузе на строке (или через ';'), комментарии начинаются с '#'.
+# Внутри скобок и после '∨' перевод строки не завершает клаузу, поэтому длинную клаузу можно переносить.
+# Вместо '¬' можно писать '~', вместо '∨' - '|'. Имя без скобок - переменная (строчные буквы) или константа,
+# имя со скобками - функция. Текст разбирается за один проход лексером и нисходящим разбором без рекурсии,
+# поэтому время линейно по длине текста, а глубина вложенности термов не ограничена стеком.
+
+TOKEN = re.compile(r"""
+    (?P<space>[^\S\n]+|\#[^\n]*)
+  | (?P<newline>\n)
+  | (?P<not>[¬~])
+  | (?P<or>[∨|])
+  | (?P<name>\w+)
+  | (?P<open>\()
+  | (?P<close>\))
+  | (?P<comma>,)
+  | (?P<semicolon>;)
+""", re.VERBOSE)
+
+# Названия лексем для сообщений об ошибках
+TOKEN_NAMES = {
+    "newline": "конец строки",
+    "not": "'¬'",
+    "or": "'∨'",
+    "name": "имя",
+    "open": "'('",
+    "close": "')'",
+    "comma": "','",
+    "semicolon": "';'",
+    "end": "конец текста",
+}
+
+
+# Ошибка с местом в тексте: строка, столбец и сама строка с указателем
+def syntax_error(text, offset, message):
+    line = text.count("\n", 0, offset) + 1
+    line_start = text.rfind("\n", 0, offset) + 1
+    line_end = text.find("\n", offset)
+    source = text[line_start:line_end if line_end != -1 else len(text)]
+    column = offset - line_start + 1
+    return ClauseFormatError(f"строка {line}, столбец {column}: {message}\n{source}\n{' ' * (column - 1)}^")
+
+# Лексемы (вид, текст, смещение). Переводы строк внутри скобок и после '∨' пропускаются
+def tokenize(text):
+    tokens = []
+    depth = 0
+    pos = 0
+    match = TOKEN.match
+    while pos < len(text):
+        found = match(text, pos)
+        if found is None:
+            raise syntax_error(text, pos, f"неожиданный символ {text[pos]!r}")
+        kind = found.lastgroup
+        pos = found.end()
+        if kind == "space":
+            continue
+        if kind == "newline" and (depth or tokens and tokens[-1][0] in ("newline", "semicolon", "or", "not")):
+            continue
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            if not depth:
+                raise syntax_error(text, found.start(), "лишняя закрывающая скобка")
+            depth -= 1
+        tokens.append((kind, found.group(), found.start()))
+    tokens.append(("end", "", len(text)))
+    return tokens
+
+
+class Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos][0]
+
+    def take(self, kind, expected):
+        token_kind, value, offset = self.tokens[self.pos]
+        if token_kind != kind:
+            raise syntax_error(self.text, offset, f"ожидалось {expected}, встречено {TOKEN_NAMES[token_kind]}"
+                               + (f" {value!r}" if token_kind == "name" else ""))
+        self.pos += 1
+        return value
+
+    # Терм: имя или имя(аргументы). Вложенные функции разбираются со своим стеком, а не рекурсией
+    def term(self):
+        stack = []# Незаконченные функции: (имя, аргументы)
+        while True:
+            name = sys.intern(self.take("name", "имя терма"))
+            if self.peek() == "open":
+                self.pos += 1
+                if self.peek() != "close":
+                    stack.append((name, []))
+                    continue
+                self.pos += 1
+                arg = Term(name, [])
+            else:
+                arg = name
+            # Готовый аргумент добавляется к функции на вершине стека, закрытые функции сворачиваются
+            while stack:
+                stack[-1][1].append(arg)
+                if self.peek() == "comma":
+                    self.pos += 1
+                    break
+                self.take("close", "',' или ')'")
+                function, args = stack.pop()
+                arg = Term(function, args)
+            else:
+                return arg
+
+    def literal(self):
+        negated = False
+        while self.peek() == "not":
+            self.pos += 1
+            negated = not negated
+        predicate = sys.intern(self.take("name", "имя предиката"))
+        args = []
+        if self.peek() == "open":
+            self.pos += 1
+            if self.peek() != "close":
+                args.append(self.term())
+                while self.peek() == "comma":
+                    self.pos += 1
+                    args.append(self.term())
+            self.take("close", "',' или ')'")
+        return Literal(predicate, args, negated)
+
+    def clause(self):
+        literals = [self.literal()]
+        while self.peek() == "or":
+            self.pos += 1
+            literals.append(self.literal())
+        return Clause(literals)
+
+    # Клаузы до конца текста, по одной
+    def clauses(self):
+        while True:
+            while self.peek() in ("newline", "semicolon"):
+                self.pos += 1
+            if self.peek() == "end":
+                return
+            yield self.clause()
+            if self.peek() not in ("newline", "semicolon", "end"):
+                self.take("newline", "'∨', ';' или конец строки")
+
+    # Разбор правилом rule, после которого текст должен закончиться
+    def whole(self, rule):
+        result = rule(self)
+        while self.peek() == "newline":
+            self.pos += 1
+        self.take("end", "конец текста")
+        return result
+
+
+# Разбор одного терма, литерала или клаузы. Весь текст должен быть разобран
+def parse_term_text(text):
+    return Parser(text).whole(Parser.term)
+
+def parse_literal_text(text):
+    return Parser(text).whole(Parser.literal)
+
+def parse_clause_text(text):
+    return Parser(text).whole(Parser.clause)
+
+# Разбор набора клауз в текстовой записи
+def parse_clause_set(text):
+    return list(Parser(text).clauses())
+
+def read_clause_set(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return parse_clause_set(f.read())
+
+# Запись клауз в текстовой записи (по клаузе на строке) - её же читает parse_clause_set
+def format_clause_set(clauses):
+    return "".join(f"{clause}\n" for clause in clauses)
@@ -0,0 +1,130 @@
+from terms import Term, is_variable
+
+# Упорядочения термов и литералов для упорядоченной резолюции.
+# Резольвировать разрешается только максимальные литералы клауз (или выбранные отрицательные),
+# поэтому большая часть пар литералов отбрасывается ещё до унификации, а полнота сохраняется.
+# Старшинство символов: большая арность старше, при равной - по имени. Веса всех символов (KBO) равны 1.
+# Атом литерала сравнивается как терм с предикатом в вершине, при равных атомах ¬A старше A.
+
+# Упорядочения термов
+KBO = "kbo"# Упорядочение Кнута-Бендикса
+LPO = "lpo"# Лексикографическое упорядочение путей
+ORDERINGS = (KBO, LPO)
+
+# Функции выбора литералов
+SELECT_NEGATIVE = "negative"# Выбирается самый тяжёлый отрицательный литерал клаузы
+LITERAL_SELECTIONS = (SELECT_NEGATIVE,)
+
+# Результаты сравнения
+GREATER = ">"
+EQUAL = "="
+INCOMPARABLE = "?"
+
+
+# Имя и аргументы терма любого вида (у константы аргументов нет)
+def head(term):
+    if isinstance(term, Term):
+        return term.name, term.args
+    return term, ()
+
+# Старшинство символа
+def precedence(name, arity):
+    return arity, name
+
+# Вес терма и число вхождений каждой переменной
+def weight_and_variables(term):
+    weight = 0
+    variables = {}
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        weight += 1
+        if isinstance(term, Term):
+            stack.extend(term.args)
+        elif is_variable(term):
+            variables[term] = variables.get(term, 0) + 1
+    return weight, variables
+
+def occurs(variable, term):
+    stack = [term]
+    while stack:
+        term = stack.pop()
+        if term == variable:
+            return True
+        if isinstance(term, Term) and not term.ground:
+            stack.extend(term.args)
+    return False
+
+
+# s > t в KBO. При равных весах и вершинах сравниваются первые различные аргументы -
+# это снова сравнение KBO, поэтому спуск идёт циклом, а не рекурсией
+def kbo_greater(s, t):
+    while True:
+        if s == t or is_variable(s):
+            return False
+        s_weight, s_variables = weight_and_variables(s)
+        t_weight, t_variables = weight_and_variables(t)
+        if any(s_variables.get(var, 0) < count for var, count in t_variables.items()):
+            return False
+        if s_weight != t_weight:
+            return s_weight > t_weight
+        s_name, s_args = head(s)
+        t_name, t_args = head(t)
+        if s_name != t_name or len(s_args) != len(t_args):
+            return precedence(s_name, len(s_args)) > precedence(t_name, len(t_args))
+        for s, t in zip(s_args, t_args):
+            if s != t:
+                break
+        else:
+            return False
+
+# s > t в LPO (рекурсивно, глубина термов ограничена стеком)
+def lpo_greater(s, t):
+    if s == t or is_variable(s):
+        return False
+    if is_variable(t):
+        return occurs(t, s)
+    s_name, s_args = head(s)
+    t_name, t_args = head(t)
+    if any(arg == t or lpo_greater(arg, t) for arg in s_args):
+        return True
+    if s_name == t_name and len(s_args) == len(t_args):
+        for position, (s_arg, t_arg) in enumerate(zip(s_args, t_args)):
+            if s_arg != t_arg:
+                return lpo_greater(s_arg, t_arg) and all(lpo_greater(s, arg) for arg in t_args[position + 1:])
+        return False
+    if precedence(s_name, len(s_args)) > precedence(t_name, len(t_args)):
+        return all(lpo_greater(s, arg) for arg in t_args)
+    return False
+
+TERM_ORDERINGS = {KBO: kbo_greater, LPO: lpo_greater}
+
+
+# Атом литерала как терм
+def atom(literal):
+    return Term(literal.predicate, literal.args)
+
+# Сравнение литералов: GREATER (l1 > l2), EQUAL или INCOMPARABLE (в том числе l1 < l2)
+def compare_literals(l1, l2, ordering):
+    greater = TERM_ORDERINGS[ordering]
+    a1, a2 = atom(l1), atom(l2)
+    if a1 is a2:
+        if l1.negated == l2.negated:
+            return EQUAL
+        return GREATER if l1.negated else INCOMPARABLE
+    return GREATER if greater(a1, a2) else INCOMPARABLE
+
+# Позиции литералов клаузы, по которым разрешена резолюция: выбранный литерал,
+# а если выбранного нет - максимальные (не меньшие никакого другого литерала клаузы; без упорядочения - все).
+# Вернёт (позиции, выбран ли литерал)
+def eligible_literals(clause, ordering, literal_selection=None):
+    literals = clause.literals
+    if literal_selection == SELECT_NEGATIVE:
+        negative = [i for i, literal in enumerate(literals) if literal.negated]
+        if negative:
+            return frozenset([max(negative, key=lambda i: weight_and_variables(atom(literals[i]))[0])]), True
+    if ordering is None:
+        return frozenset(range(len(literals))), False
+    maximal = [i for i, literal in enumerate(literals)
+               if not any(compare_literals(other, literal, ordering) == GREATER for other in literals)]
+    return frozenset(maximal), False
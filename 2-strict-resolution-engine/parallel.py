@@ -0,0 +1,165 @@
+import multiprocessing
+
+import saturation
+from codec import Decoder, Encoder
+
+# Параллельное построение резольвент данной клаузы.
+# Обработанные клаузы распределены между процессами по номеру в индексе (номер % число процессов),
+# каждая клауза передаётся своему процессу один раз, а удалённые из индекса (поглощённые) процесс забывает. Для данной клаузы процесс получает её саму и список
+# своих партнёров с парами литералов, а возвращает все резольвенты. Главный процесс собирает их в
+# порядке партнёров и проверяет так же, как при последовательной работе, поэтому лог и ответ не зависят
+# от числа процессов. Клаузы передаются в двоичном виде (codec.py), у каждого канала своя таблица символов.
+# saturation и parallel импортируют друг друга модулями целиком: имена разрешаются только при вызове
+
+ADD = 0# Новые обработанные клаузы (номера и клаузы) и номера удалённых
+RESOLVE = 1# Данная клауза и партнёры: номер, число пар, пары
+STOP = 2
+
+
+# Цикл процесса-исполнителя
+def worker(connection):
+    clauses = {}
+    decoder = Decoder()
+    encoder = Encoder()
+    while True:
+        decoder.feed(connection.recv_bytes())
+        command = decoder.varint()
+        if command == STOP:
+            return
+        if command == ADD:
+            numbers = decoder.integers()
+            added = decoder.clauses()
+            # Сначала удаление: после clear номер удалённой клаузы может получить новая
+            for number in decoder.integers():
+                del clauses[number]
+            clauses.update(zip(numbers, added))
+            continue
+        given = decoder.clauses()[0]
+        request = iter(decoder.integers())
+        counts = []
+        pairs_out = []
+        new_clauses = []
+        for number in request:
+            pairs = [(next(request), next(request)) for _ in range(next(request))]
+            count = 0
+            for new_clause, _, (i, j) in saturation.resolvents(saturation.rename_apart(given, clauses[number]), given, pairs):
+                new_clauses.append(new_clause)
+                pairs_out += (i, j)
+                count += 1
+            counts.append(count)
+        encoder.integers(counts)
+        encoder.integers(pairs_out)
+        encoder.clauses(new_clauses)
+        connection.send_bytes(encoder.result())
+
+
+class ResolventPool:
+    # workers - число процессов, min_partners - с какого числа партнёров работа отдаётся процессам
+    def __init__(self, workers, min_partners=32):
+        self.min_partners = min_partners
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.processes = []
+        for _ in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.encoders = [Encoder() for _ in range(workers)]
+        self.decoders = [Decoder() for _ in range(workers)]
+        self.pending = [[] for _ in range(workers)]# Клаузы, ещё не отправленные своему процессу
+        self.removed = [[] for _ in range(workers)]# Номера удалённых клауз, о которых процесс ещё не знает
+        self.numbers = {}# Клауза -> её номер в индексе (для клауз, переданных или ожидающих передачи)
+
+    # Новая обработанная клауза с номером number в индексе
+    def add(self, number, clause):
+        self.numbers[clause] = number
+        self.pending[number % len(self.connections)].append((number, clause))
+
+    # Клауза удалена из индекса обработанных (поглощена): процесс её забудет при следующей отправке
+    def remove(self, clause):
+        number = self.numbers.pop(clause, None)
+        if number is None:
+            return
+        worker_number = number % len(self.connections)
+        pending = self.pending[worker_number]
+        if any(pending_number == number for pending_number, _ in pending):
+            pending[:] = [(pending_number, item) for pending_number, item in pending if pending_number != number]
+        else:
+            self.removed[worker_number].append(number)
+
+    # Забыть все клаузы: следующий поиск с этим пулом (см. Saturation.without_support) нумерует клаузы заново
+    def clear(self):
+        for clause in list(self.numbers):
+            self.remove(clause)
+
+    def flush(self, worker_number):
+        pending = self.pending[worker_number]
+        removed = self.removed[worker_number]
+        if not pending and not removed:
+            return
+        encoder = self.encoders[worker_number]
+        encoder.body.append(ADD)
+        encoder.integers(number for number, _ in pending)
+        encoder.clauses(clause for _, clause in pending)
+        encoder.integers(removed)
+        self.connections[worker_number].send_bytes(encoder.result())
+        pending.clear()
+        removed.clear()
+
+    # Резольвенты данной клаузы со всеми партнёрами [(номер, партнёр, пары), ...].
+    # Вернёт список (партнёр, [(резольвента, None, пара), ...]) в порядке партнёров
+    def resolvents(self, given, partners):
+        workers = len(self.connections)
+        shards = [[] for _ in range(workers)]
+        for position, (number, partner, pairs) in enumerate(partners):
+            shards[number % workers].append(position)
+        for worker_number, shard in enumerate(shards):
+            if not shard:
+                continue
+            self.flush(worker_number)
+            request = []
+            for position in shard:
+                number, _, pairs = partners[position]
+                request += (number, len(pairs))
+                for i, j in pairs:
+                    request += (i, j)
+            encoder = self.encoders[worker_number]
+            encoder.body.append(RESOLVE)
+            encoder.clauses([given])
+            encoder.integers(request)
+            self.connections[worker_number].send_bytes(encoder.result())
+        results = [None] * len(partners)
+        for worker_number, shard in enumerate(shards):
+            if not shard:
+                continue
+            decoder = self.decoders[worker_number].feed(self.connections[worker_number].recv_bytes())
+            counts = decoder.integers()
+            pairs = decoder.integers()
+            new_clauses = decoder.clauses()
+            start = 0
+            for position, count in zip(shard, counts):
+                results[position] = [(new_clauses[k], None, (pairs[2 * k], pairs[2 * k + 1]))
+                                     for k in range(start, start + count)]
+                start += count
+        return [(partners[position][1], results[position]) for position in range(len(partners))]
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send_bytes(bytes([0, STOP]))# Пустая таблица символов и команда
+            except OSError:
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,107 @@
+import multiprocessing
+import queue
+import time
+
+from cdcl import SELECTION as CDCL, ground_saturation
+from ordering import KBO, SELECT_NEGATIVE
+from saturation import NEGATIVE, PROOF, SATURATED, UNKNOWN, Limits, Saturation, run_saturation
+from serialization import dump_binary, load_binary
+
+# Портфель стратегий: один набор клауз решается несколькими стратегиями одновременно в отдельных процессах.
+# Побеждает первая, нашедшая противоречие или полностью насытившая клаузы (если её насыщение доказывает
+# отсутствие противоречия), остальные процессы останавливаются. Какая стратегия победила, попадает в отчёт -
+# по накопленным отчётам можно выбирать стратегии по умолчанию.
+
+# Стратегия: имя -> (параметры Saturation, полна ли она - т.е. доказывает ли насыщение отсутствие противоречия)
+STRATEGIES = {
+    "fifo": ({"selection": "fifo"}, True),
+    "weight": ({"selection": "weight"}, True),
+    "ratio": ({"selection": "ratio"}, True),
+    "unit": ({"selection": "unit"}, True),
+    "sos": ({"selection": "unit", "support": NEGATIVE}, True),# Множество поддержки из отрицательных клауз полно
+    "ordered": ({"selection": "weight", "ordering": KBO, "literal_selection": SELECT_NEGATIVE}, True),
+}
+
+
+# Параметры Saturation для стратегии name. goals - клаузы, отмеченные как цели: если они есть,
+# множество поддержки стратегии составляют они, а не отрицательные клаузы
+def strategy_options(name, goals=None):
+    options = dict(STRATEGIES[name][0])
+    if "support" in options and goals:
+        options["support"] = goals
+    return options
+
+
+# Запуск одной стратегии в процессе портфеля. Результат кладётся в очередь results.
+# goals - клаузы целей (в формате dump_binary) или None; если есть, они заменяют множество поддержки стратегии
+def run_strategy(name, data, options, limits, proof_only, results, goals=None):
+    started = time.monotonic()
+    if goals is not None and "support" in options:
+        options = dict(options, support=load_binary(goals))
+    saturation = Saturation(load_binary(data), **options)
+    saturation, status = run_saturation(saturation, Limits(**limits))
+    log = saturation.proof_log() if proof_only and status == PROOF else saturation.log
+    results.put((name, status, saturation.reason, log, round(time.monotonic() - started, 3)))
+
+
+# Решение портфелем стратегий. strategies - словарь в формате STRATEGIES (по умолчанию - он сам),
+# limits - ограничения каждой стратегии (словарь аргументов Limits), proof_only - как в resolution.
+# goals - клаузы, отмеченные как цели (см. strategy_options). sat и herbrand - как в resolution: клаузы,
+# которые можно заземлить, решает CDCL-решатель в этом же процессе (в отчёте он единственная стратегия, cdcl).
+# Вернёт (True/False/None, лог победителя, отчёт). Отчёт: {"winner": имя или None,
+# "strategies": {имя: {"status": ..., "reason": ..., "seconds": ...}}}; у остановленных стратегий статус "cancelled"
+def portfolio_resolution(clauses, strategies=None, limits=None, proof_only=False, goals=None, sat=True, herbrand=None):
+    if strategies is None:
+        strategies = STRATEGIES
+    if limits is None:
+        limits = {"max_steps": 500}
+    ground = ground_saturation(clauses, herbrand) if sat else None
+    if ground is not None:
+        started = time.monotonic()
+        status = ground.run(Limits(**limits))
+        report = {"status": status, "reason": ground.reason, "seconds": round(time.monotonic() - started, 3)}
+        proof = {PROOF: True, SATURATED: False}.get(status)
+        log = ground.proof_log() if proof_only and status == PROOF else ground.log
+        return proof, log, {"winner": CDCL if proof is not None else None, "strategies": {CDCL: report}}
+    data = dump_binary(clauses)
+    goal_data = dump_binary(goals) if goals else None
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = {}
+    for name, (options, _) in strategies.items():
+        process = context.Process(target=run_strategy, args=(name, data, options, limits, proof_only, results, goal_data), daemon=True)
+        process.start()
+        processes[name] = process
+
+    report = {"winner": None, "strategies": {}}
+    proof = None
+    log = []
+    try:
+        while len(report["strategies"]) < len(processes):
+            try:
+                name, status, reason, strategy_log, seconds = results.get(timeout=1)
+            except queue.Empty:
+                # Процесс, упавший без результата, больше ничего не пришлёт
+                for name, process in processes.items():
+                    if name not in report["strategies"] and not process.is_alive() and process.exitcode != 0:
+                        report["strategies"][name] = {"status": "failed", "reason": f"код выхода {process.exitcode}", "seconds": None}
+                continue
+            report["strategies"][name] = {"status": status, "reason": reason, "seconds": seconds}
+            complete = strategies[name][1]
+            if status == PROOF or status == SATURATED and complete:
+                report["winner"] = name
+                proof = status == PROOF
+                log = strategy_log
+                break
+            if status != UNKNOWN:# Насыщение неполной стратегии ничего не доказывает
+                report["strategies"][name]["status"] = "incomplete"
+            if not log:
+                log = strategy_log# Если победителя не будет, возвращается лог первой завершившейся стратегии
+    finally:
+        for name, process in processes.items():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            report["strategies"].setdefault(name, {"status": "cancelled", "reason": None, "seconds": None})
+        results.close()
+    return proof, log, report
@@ -0,0 +1,708 @@
+import heapq
+import itertools
+import os
+import sys
+import time
+
+import cdcl
+import parallel
+import metrics
+from index import TermIndex
+from ordering import LITERAL_SELECTIONS, ORDERINGS, eligible_literals
+from terms import Clause, Term
+from unification import resolved_substitution, undo, unify_literal_args
+
+try:
+    import resource
+except ImportError:# Нет на Windows - ограничение по памяти тогда не проверяется
+    resource = None
+
+# Сопоставление аргументов: подстановка только для переменных образца, такая что pattern θ = target
+def match_args(pattern, target, substitution):
+    if isinstance(pattern, str) and pattern.islower():
+        if pattern in substitution:
+            return substitution if substitution[pattern] == target else None
+        return {**substitution, pattern: target}
+    if isinstance(pattern, Term) and isinstance(target, Term):
+        if pattern.name != target.name or len(pattern.args) != len(target.args):
+            return None
+        for a1, a2 in zip(pattern.args, target.args):
+            substitution = match_args(a1, a2, substitution)
+            if substitution is None:
+                return None
+        return substitution
+    return substitution if pattern == target else None
+
+# Сопоставление литералов одного знака
+def match_literal(l1, l2, substitution):
+    if l1.predicate != l2.predicate or l1.negated != l2.negated or len(l1.args) != len(l2.args):
+        return None
+    for a1, a2 in zip(l1.args, l2.args):
+        substitution = match_args(a1, a2, substitution)
+        if substitution is None:
+            return None
+    return substitution
+
+# Поглощение: c1 поглощает c2, если c1 не длиннее c2 и при некоторой подстановке θ c1θ ⊆ c2
+def subsumes(c1, c2):
+    if len(c1.literals) > len(c2.literals):
+        return False
+    def search(i, substitution):
+        if i == len(c1.literals):
+            return True
+        for l2 in c2.literals:
+            new_substitution = match_literal(c1.literals[i], l2, substitution)
+            if new_substitution is not None and search(i + 1, new_substitution):
+                return True
+        return False
+    return search(0, {})
+
+# Тавтология - клауза, содержащая литерал вместе с его отрицанием
+def is_tautology(clause):
+    literals = set(clause.literals)
+    return any(literal.negate() in literals for literal in literals)
+
+# Прямое поглощение: есть ли в индексе клауза, поглощающая данную
+def forward_subsumed(clause, index):
+    # Кандидат должен обобщать литералы клаузы всеми своими литералами
+    hits = {}
+    for literal in clause.literals:
+        for number, candidate, position in index.generalizations(literal):
+            hits.setdefault(number, (candidate, set()))[1].add(position)
+    for candidate, positions in hits.values():
+        if len(positions) == len(candidate.literals) and subsumes(candidate, clause):
+            return True
+    return False
+
+# Обратное поглощение: клаузы из индекса, которые поглощаются данной
+def backward_subsumed(clause, index):
+    # Каждый литерал клаузы должен иметь частный случай в кандидате
+    hits = {}
+    for i, literal in enumerate(clause.literals):
+        for number, candidate, _ in index.instances(literal):
+            hits.setdefault(number, (candidate, set()))[1].add(i)
+    return [candidate for number, (candidate, positions) in sorted(hits.items())
+            if len(positions) == len(clause.literals) and subsumes(clause, candidate)]
+
+# Применение подстановки к литералу
+def apply_substitution(literal, substitution):
+    return literal.apply_substitution(substitution)
+
+# Переименование переменных клаузы c2, совпадающих с переменными c1 (standardizing apart).
+# К имени переменной добавляется наименьший номер, при котором она не встречается ни в одной из клауз.
+# Если общих переменных нет, возвращается сама c2
+def rename_apart(c1, c2):
+    variables1 = c1.variables()
+    variables2 = c2.variables()
+    shared = [var for var in variables2 if var in variables1]
+    if not shared:
+        return c2
+    used = set(variables1) | set(variables2)
+    renaming = {}
+    for var in shared:
+        number = 1
+        while f"{var}{number}" in used:
+            number += 1
+        renaming[var] = f"{var}{number}"
+        used.add(renaming[var])
+    return Clause([apply_substitution(lit, renaming) for lit in c2.literals])
+
+# Литералы без повторов (клауза - множество литералов)
+def without_duplicates(literals):
+    return list(dict.fromkeys(literals))
+
+# Все бинарные резольвенты двух клауз с разделёнными переменными.
+# Для каждой резольвенты возвращаются подстановка и позиции резольвируемых литералов
+# pairs - пары позиций литералов (в c1, в c2), которые стоит проверять; по умолчанию все пары
+def resolvents(c1, c2, pairs=None):
+    if pairs is None:
+        pairs = itertools.product(range(len(c1.literals)), range(len(c2.literals)))
+    bindings = {}
+    trail = []
+    for i, j in pairs:
+        l1, l2 = c1.literals[i], c2.literals[j]
+        if l1.is_negation_of(l2):# Условие резолюции - противоположные знаки
+            if unify_literal_args(l1, l2, bindings, trail):# Ищем подстановку, что бы резольвировать
+                substitution = resolved_substitution(bindings)
+                undo(bindings, trail, 0)
+                # Собираем не выбранные литералы обеих клауз для применения к ним подстановки
+                new_literals = [apply_substitution(lit, substitution)
+                                for lit in c1.literals[:i] + c1.literals[i + 1:] + c2.literals[:j] + c2.literals[j + 1:]]
+                yield Clause(without_duplicates(new_literals)), substitution, (i, j)# Новая клауза и данные для лога
+
+# Первая резольвента двух клауз (или None, None)
+def resolve(c1, c2, pairs=None):
+    for new_clause, substitution, _ in resolvents(rename_apart(c2, c1), c2, pairs):
+        return new_clause, substitution
+    return None, None
+
+# Факторы клаузы: два литерала одного знака склеиваются их унификатором
+def factors(clause):
+    literals = clause.literals
+    bindings = {}
+    trail = []
+    for i, j in itertools.combinations(range(len(literals)), 2):
+        l1, l2 = literals[i], literals[j]
+        if l1 is l2 or l1.predicate != l2.predicate or l1.negated != l2.negated:
+            continue
+        if unify_literal_args(l1, l2, bindings, trail):
+            substitution = resolved_substitution(bindings)
+            undo(bindings, trail, 0)
+            new_literals = [apply_substitution(lit, substitution) for lit in literals[:j] + literals[j + 1:]]
+            yield Clause(without_duplicates(new_literals)), substitution, (i, j)
+
+# Шаги унификации двух литералов для подробного лога (с отступом)
+def unification_trace(l1, l2):
+    trace = []
+    unify_literal_args(l1, l2, {}, [], trace)
+    return ["    " + entry for entry in trace]
+
+# Унификатор двух литералов (для вывода шага)
+def unifier(l1, l2):
+    bindings = {}
+    unify_literal_args(l1, l2, bindings, [])
+    return resolved_substitution(bindings)
+
+# Виды шагов вывода
+INPUT = "input"# Исходная клауза
+FACTOR = "factor"# Фактор клаузы-родителя
+RESOLUTION = "resolution"# Резольвента двух родителей (пустая клауза - противоречие)
+INSTANCE = "instance"# Основной пример клаузы-родителя (для SAT-решателя, см. cdcl.py), pair - пары подстановки
+
+# Вершина графа вывода: клауза, её родители и позиции склеенных или резольвированных литералов.
+# Строки лога не хранятся, а строятся по запросу (render): переименование и унификатор вычисляются заново
+class Step:
+    __slots__ = ("number", "kind", "clause", "parents", "pair")
+
+    def __init__(self, number, kind, clause, parents=(), pair=None):
+        self.number = number# Номер шага в полном логе (у исходных клауз - None)
+        self.kind = kind
+        self.clause = clause
+        self.parents = parents# Для резольвенты - (шаг партнёра, шаг данной клаузы)
+        self.pair = pair
+
+    # Строки лога для шага. number - номер шага в выводе (по умолчанию - номер в полном логе),
+    # trace - добавить шаги унификации
+    def render(self, number=None, trace=False):
+        if number is None:
+            number = self.number
+        if self.kind == INSTANCE:
+            return [f"Шаг {number}: Подстановка {dict(self.pair)} в {self.parents[0].clause} -> {self.clause}."]
+        i, j = self.pair
+        if self.kind == FACTOR:
+            given = self.parents[0].clause
+            l1, l2 = given.literals[i], given.literals[j]
+            lines = [f"Шаг {number}: Факторизация {unifier(l1, l2)} в {given} -> {self.clause}."]
+        else:
+            given = self.parents[1].clause
+            partner = rename_apart(given, self.parents[0].clause)
+            l1, l2 = partner.literals[i], given.literals[j]
+            if self.clause.literals:
+                lines = [f"Шаг {number}: Унификация {unifier(l1, l2)} в {partner} и {given}. Резолюция -> {self.clause}."]
+            else:
+                lines = [f"Шаг {number}: Резолюция {partner} и {given} -> Противоречие."]
+        if trace:
+            lines += unification_trace(l1, l2)
+        return lines
+
+    # Шаги вывода, от которых зависит данный (включая его самого), в порядке полного лога
+    def ancestors(self):
+        found = {}
+        stack = [self]
+        while stack:
+            step = stack.pop()
+            if step.kind != INPUT and id(step) not in found:
+                found[id(step)] = step
+                stack.extend(step.parents)
+        return sorted(found.values(), key=lambda step: step.number)
+
+# Вес терма - количество символов в нём
+def term_weight(term):
+    if isinstance(term, Term):
+        return 1 + sum(term_weight(arg) for arg in term.args)
+    return 1
+
+# Вес клаузы - суммарное количество символов предикатов и аргументов
+def clause_weight(clause):
+    return sum(1 + sum(term_weight(arg) for arg in literal.args) for literal in clause.literals)
+
+# Стратегии выбора данной клаузы:
+# "fifo" - самая старая, "weight" - самая лёгкая, "ratio" - чередование возраста и веса,
+# "unit" - предпочтение единичных: самая короткая клауза, среди равных по длине - самая лёгкая
+SELECTION_STRATEGIES = ("fifo", "weight", "ratio", "unit")
+
+# Приоритет клаузы в куче весов (меньше - раньше)
+def clause_priority(clause, selection):
+    if selection == "unit":
+        return len(clause.literals), clause_weight(clause)
+    return clause_weight(clause)
+
+# Очередь необработанных клауз для цикла данной клаузы
+class ClauseQueue:
+    # pick_ratio - сколько раз подряд берётся самая лёгкая клауза перед самой старой (для "ratio")
+    def __init__(self, selection="fifo", pick_ratio=4):
+        if selection not in SELECTION_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия выбора клауз: {selection}")
+        self.selection = selection
+        self.pick_ratio = pick_ratio
+        self.by_age = []
+        self.by_weight = []
+        self.selected = set()# Возрасты выбранных и удалённых клауз (ленивое удаление из куч)
+        self.ages = {}# Возраст каждой клаузы, ещё лежащей в очереди
+        self.age = 0
+        self.picks = 0
+
+    def __len__(self):
+        return self.age - len(self.selected)
+
+    def push(self, clause):
+        # Возраст уникален, поэтому сами клаузы в кучах никогда не сравниваются
+        if self.selection in ("fifo", "ratio"):
+            heapq.heappush(self.by_age, (self.age, self.age, clause))
+        if self.selection != "fifo":
+            heapq.heappush(self.by_weight, (clause_priority(clause, self.selection), self.age, clause))
+        self.ages[clause] = self.age
+        self.age += 1
+
+    # Удаление клаузы из очереди без выбора. Вернёт False, если её в очереди нет
+    def remove(self, clause):
+        age = self.ages.pop(clause, None)
+        if age is None:
+            return False
+        self.selected.add(age)
+        return True
+
+    def pop(self):
+        if self.selection == "fifo":
+            heap = self.by_age
+        elif self.selection != "ratio":
+            heap = self.by_weight
+        else:
+            heap = self.by_age if self.picks % (self.pick_ratio + 1) == self.pick_ratio else self.by_weight
+        self.picks += 1
+        while heap[0][1] in self.selected:
+            heapq.heappop(heap)
+        _, age, clause = heapq.heappop(heap)
+        self.selected.add(age)
+        del self.ages[clause]
+        return clause
+
+# Исходы насыщения
+PROOF = "proof"# Выведена пустая клауза - противоречие найдено
+SATURATED = "saturated"# Новых клауз нет - противоречия нет
+UNKNOWN = "unknown"# Исчерпаны ресурсы - ответ неизвестен, поиск можно продолжить
+
+# Множество поддержки по умолчанию: клаузы из одних отрицательных литералов (в задачах это отрицание заключения).
+# Остальные клаузы выполнимы (все атомы истинны), поэтому стратегия остаётся полной
+NEGATIVE = "negative"
+
+def is_negative(clause):
+    return all(literal.negated for literal in clause.literals)
+
+# Пиковый объём памяти процесса в мегабайтах (None, если узнать нельзя)
+def peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024# На macOS в байтах, иначе в килобайтах
+
+# Текущий объём памяти процесса (resident set) в мегабайтах по /proc; None, если /proc нет
+def current_memory_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            resident = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+# Ограничения ресурсов на один запуск насыщения. None - без ограничения
+class Limits:
+    def __init__(self, max_steps=500, max_seconds=None, max_clauses=None, max_memory_mb=None):
+        self.max_steps = max_steps# Количество выбранных данных клауз
+        self.max_seconds = max_seconds# Время работы
+        self.max_clauses = max_clauses# Количество построенных резольвент и факторов
+        self.max_memory_mb = max_memory_mb# Текущий объём памяти процесса
+
+    # Причина остановки или None, если ресурсы ещё есть
+    def exceeded(self, steps, seconds, clauses):
+        if self.max_steps is not None and steps >= self.max_steps:
+            return "steps"
+        if self.max_seconds is not None and seconds >= self.max_seconds:
+            return "time"
+        if self.max_clauses is not None and clauses >= self.max_clauses:
+            return "clauses"
+        if self.max_memory_mb is not None:
+            # Пик за всю жизнь процесса не подходит: после одной большой задачи долгоживущий процесс
+            # останавливал бы все следующие. Пик - только запасной вариант там, где нет /proc
+            memory = current_memory_mb()
+            if memory is None:
+                memory = peak_memory_mb()
+            if memory is not None and memory >= self.max_memory_mb:
+                return "memory"
+        return None
+
+# Состояние насыщения (цикл данной клаузы в стиле Otter/DISCOUNT).
+# Каждая новая клауза резольвируется только с уже обработанными (и с собой) и только один раз,
+# при этом строятся все резольвенты пары клауз и все факторы данной клаузы.
+# Тавтологии и поглощённые клаузы удаляются, их количество записывается в stats.
+# Если run() остановился из-за ограничений, его можно вызвать снова с новыми ограничениями -
+# поиск продолжится с того же места, без повторных вычислений.
+# trace - добавлять в лог шаги унификации для каждого записанного шага (строятся только для них).
+# Каждая сохранённая клауза записывается шагом графа вывода (Step) с указателями на родителей;
+# лог строится из шагов только при обращении к нему, а proof_log() выдаёт лишь шаги опровержения.
+# pool - пул процессов для построения резольвент (parallel.ResolventPool), на результат не влияет.
+# support - множество поддержки (set of support): резольвируются только пары, в которых хотя бы одна
+# клауза поддержана. Поддержаны клаузы support и все выведенные, остальные исходные клаузы (посылки)
+# сразу становятся обработанными и данными не выбираются. support - набор клауз (цели, отмеченные
+# формализатором) или NEGATIVE. Насыщение с явно заданными целями не доказывает отсутствие противоречия
+# (посылки могут противоречить друг другу) - тогда run() вернёт UNKNOWN с причиной "support",
+# а run_saturation повторит поиск без множества поддержки (without_support).
+# ordering - упорядоченная резолюция (ordering.KBO или ordering.LPO): резольвируются только максимальные
+# литералы, literal_selection - функция выбора литералов (ordering.SELECT_NEGATIVE): в клаузе с выбранным
+# литералом резольвируется только он. Отброшенные пары литералов считаются в stats ("ordering_skipped" и
+# "selection_skipped"). Вместе с множеством поддержки эти ограничения не гарантируют полноты
+class Saturation:
+    def __init__(self, clauses, selection="fifo", stats=None, trace=False, pool=None, support=None, ordering=None,
+                 literal_selection=None):
+        if ordering is not None and ordering not in ORDERINGS:
+            raise ValueError(f"Неизвестное упорядочение термов: {ordering}")
+        if literal_selection is not None and literal_selection not in LITERAL_SELECTIONS:
+            raise ValueError(f"Неизвестная функция выбора литералов: {literal_selection}")
+        self.options = (clauses, selection)# Для повторного поиска без множества поддержки
+        self.inputs = []# Шаги исходных клауз
+        self.steps = []# Шаги вывода в порядке полного лога
+        self.derivations = {}# Клауза -> её шаг
+        self.contradiction = None# Шаг, на котором выведена пустая клауза
+        self.rendered_log = []# Уже построенная часть полного лога
+        self.rendered = 0# Сколько шагов в неё вошло
+        self.pool = pool
+        self.step = 1
+        self.stats = stats if stats is not None else {}
+        for counter in ("generated", "duplicates", "tautologies", "forward_subsumed", "backward_subsumed"):
+            self.stats.setdefault(counter, 0)
+        self.ordering = ordering
+        self.literal_selection = literal_selection
+        self.eligible = {}# Клауза -> позиции литералов, по которым разрешена резолюция
+        if ordering is not None or literal_selection is not None:
+            self.stats.setdefault("ordering_skipped", 0)
+            self.stats.setdefault("selection_skipped", 0)
+        self.trace = trace
+        self.seen = set()
+        self.processed = TermIndex()# Обработанные клаузы, проиндексированные деревом различения
+        self.unprocessed = ClauseQueue(selection)
+        self.kept = TermIndex()# Все хранимые клаузы (обработанные, необработанные и данная) - для поглощения
+        self.given = None
+        self.given_removed = False
+        self.status = None
+        self.reason = None# Какое ограничение остановило последний запуск
+        # Доказывает ли насыщение отсутствие противоречия
+        self.complete = support is None or support == NEGATIVE and ordering is None and literal_selection is None
+        if support is None:
+            for clause in clauses:
+                if self.keep(clause):
+                    self.record(Step(None, INPUT, clause))
+            return
+        if support == NEGATIVE:
+            supported = {clause for clause in clauses if is_negative(clause)}
+        else:
+            supported = set(support)
+        # Поддержанные клаузы сохраняются первыми: посылка, поглощающая цель, сама становится поддержанной
+        usable = []
+        for clause in sorted(clauses, key=lambda clause: clause not in supported):
+            if self.keep(clause, clause not in supported):
+                self.record(Step(None, INPUT, clause))
+                if clause not in self.unprocessed.ages:
+                    usable.append(clause)
+        # Посылки не бывают данными клаузами, поэтому их факторы строятся сразу
+        for clause in usable:
+            self.add_factors(clause, True)
+
+    # Полный лог (строки достраиваются для новых шагов при обращении)
+    @property
+    def log(self):
+        while self.rendered < len(self.steps):
+            self.rendered_log += self.steps[self.rendered].render(trace=self.trace)
+            self.rendered += 1
+        return self.rendered_log
+
+    # Лог только тех шагов, которые использованы в опровержении, с номерами по порядку (пусто, если его нет)
+    def proof_log(self):
+        if self.contradiction is None:
+            return []
+        lines = []
+        for number, step in enumerate(self.contradiction.ancestors(), 1):
+            lines += step.render(number, self.trace)
+        return lines
+
+    # Запись шага в граф вывода
+    def record(self, step):
+        if step.kind == INPUT:
+            self.inputs.append(step)
+        else:
+            self.steps.append(step)
+        self.derivations[step.clause] = step
+
+    # Проверки избыточности и сохранение клаузы. Вернёт False, если клауза избыточна.
+    # usable - посылка вне множества поддержки: она сразу становится обработанной
+    def keep(self, clause, usable=False):
+        stats = self.stats
+        if clause in self.seen:
+            stats["duplicates"] += 1
+            return False
+        self.seen.add(clause)
+        if is_tautology(clause):
+            stats["tautologies"] += 1
+            return False
+        if forward_subsumed(clause, self.kept):
+            stats["forward_subsumed"] += 1
+            return False
+        for old in backward_subsumed(clause, self.kept):
+            stats["backward_subsumed"] += 1
+            self.kept.remove(old)
+            if old is self.given:
+                self.given_removed = True
+            if not self.unprocessed.remove(old):
+                self.processed.remove(old)
+                if self.pool is not None:
+                    self.pool.remove(old)
+            else:
+                usable = False# Поглощённая клауза была поддержана - поддержка переходит к поглотившей
+        self.kept.add(clause)
+        if usable:
+            if self.pool is not None:
+                self.pool.add(self.processed.count, clause)
+            self.processed.add(clause)
+        else:
+            self.unprocessed.push(clause)
+        return True
+
+    # Позиции литералов клаузы, по которым разрешена резолюция, и выбран ли в ней литерал
+    def eligible_literals(self, clause):
+        if clause not in self.eligible:
+            self.eligible[clause] = eligible_literals(clause, self.ordering, self.literal_selection)
+        return self.eligible[clause]
+
+    # Партнёры без пар литералов, запрещённых упорядочением или выбором литералов
+    def restrict(self, given, partners):
+        given_eligible, given_selected = self.eligible_literals(given)
+        result = []
+        for number, partner, pairs in partners:
+            partner_eligible, partner_selected = self.eligible_literals(partner)
+            allowed = []
+            for j, i in pairs:
+                if j in partner_eligible and i in given_eligible:
+                    allowed.append((j, i))
+                elif j not in partner_eligible and partner_selected or i not in given_eligible and given_selected:
+                    self.stats["selection_skipped"] += 1
+                else:
+                    self.stats["ordering_skipped"] += 1
+            if allowed:
+                result.append((number, partner, allowed))
+        return result
+
+    # Запуск (или продолжение) насыщения в пределах limits. Ограничения проверяются между данными клаузами
+    def run(self, limits=None):
+        if self.status in (PROOF, SATURATED):
+            return self.status
+        if limits is None:
+            limits = Limits()
+        started = time.monotonic()
+        generated = self.stats["generated"]
+        steps = 0
+        while True:
+            if not self.unprocessed:# Все клаузы обработаны, а новых нет - противоречия не будет
+                self.status, self.reason = (SATURATED, None) if self.complete else (UNKNOWN, "support")
+                return self.status
+            reason = limits.exceeded(steps, time.monotonic() - started, self.stats["generated"] - generated)
+            if reason is not None:
+                self.status, self.reason = UNKNOWN, reason
+                return self.status
+            steps += 1
+            if self.process(self.select()):
+                self.status, self.reason = PROOF, None
+                return self.status
+
+    # Выбор следующей данной клаузы
+    def select(self):
+        return self.unprocessed.pop()
+
+    # Новое насыщение тех же клауз с теми же параметрами, но без множества поддержки (полное)
+    def without_support(self):
+        clauses, selection = self.options
+        if self.pool is not None:
+            self.pool.clear()
+        return type(self)(clauses, selection, self.stats, self.trace, self.pool, None, self.ordering,
+                          self.literal_selection)
+
+    # Построение и сохранение факторов клаузы (usable - как в keep)
+    def add_factors(self, clause, usable=False):
+        for factor, _, pair in factors(clause):
+            self.stats["generated"] += 1
+            if self.keep(factor, usable):
+                self.record(Step(self.step, FACTOR, factor, (self.derivations[clause],), pair))
+                self.step += 1
+
+    # Партнёры данной клаузы: только с литералом другого знака, который может унифицироваться
+    def partners(self, given):
+        partners = self.processed.partners(given)
+        if self.ordering is not None or self.literal_selection is not None:
+            partners = self.restrict(given, partners)
+        return partners
+
+    # Вывод всех факторов и резольвент данной клаузы. Вернёт True, если найдено противоречие
+    def process(self, given):
+        self.given = given
+        self.given_removed = False
+        given_step = self.derivations[given]
+        if self.pool is not None:
+            self.pool.add(self.processed.count, given)
+        self.processed.add(given)# Данная клауза сразу становится обработанной, чтобы резольвироваться и сама с собой
+        self.add_factors(given)
+        partners = self.partners(given)
+        if self.pool is not None and len(partners) >= self.pool.min_partners:
+            generated = self.pool.resolvents(given, partners)
+        else:
+            generated = ((partner, resolvents(rename_apart(given, partner), given, pairs)) for _, partner, pairs in partners)
+        for partner, new_clauses in generated:
+            if self.given_removed:# Данная клауза могла быть поглощена собственной резольвентой
+                break
+            parents = (self.derivations[partner], given_step)
+            for new_clause, _, pair in new_clauses:
+                self.stats["generated"] += 1
+                if not new_clause.literals:
+                    self.contradiction = Step(self.step, RESOLUTION, new_clause, parents, pair)
+                    self.steps.append(self.contradiction)
+                    return True
+                if self.keep(new_clause):
+                    self.record(Step(self.step, RESOLUTION, new_clause, parents, pair))
+                    self.step += 1
+        return False
+
+# Насыщение с профилем (metrics.Profile): время фаз, счётчики унификаций, гистограммы сохранённых клауз,
+# пиковое число хранимых клауз и сообщения о ходе поиска. Результат тот же, что у Saturation.
+# Неудачные унификации - пары литералов-кандидатов, не давшие резольвенты
+class ProfiledSaturation(Saturation):
+    def __init__(self, clauses, *args, profile=None, **kwargs):
+        self.profile = profile if profile is not None else metrics.Profile()
+        self.store = 0# Число хранимых клауз
+        self.started = time.monotonic()
+        super().__init__(clauses, *args, **kwargs)
+        self.profile.stats = self.stats
+
+    def run(self, limits=None):
+        self.profile.start(metrics.OTHER)
+        try:
+            return super().run(limits)
+        finally:
+            self.profile.stop()
+            self.profile.peak_memory_mb = peak_memory_mb()
+
+    def without_support(self):
+        clauses, selection = self.options
+        if self.pool is not None:
+            self.pool.clear()
+        return ProfiledSaturation(clauses, selection, self.stats, self.trace, self.pool, None, self.ordering,
+                                  self.literal_selection, profile=self.profile)
+
+    def select(self):
+        profile = self.profile
+        profile.start(metrics.SELECTION)
+        given = super().select()
+        profile.stop()
+        profile.counters["given"] += 1
+        if profile.due():
+            profile.progress(self.snapshot())
+        return given
+
+    def process(self, given):
+        profile = self.profile
+        generated = self.stats["generated"]
+        factors_before = profile.counters["factors"]
+        profile.start(metrics.RESOLUTION)
+        try:
+            return super().process(given)
+        finally:
+            profile.stop()
+            profile.counters["resolvents"] += self.stats["generated"] - generated - (profile.counters["factors"] - factors_before)
+
+    def add_factors(self, clause, usable=False):
+        generated = self.stats["generated"]
+        self.profile.start(metrics.FACTORING)
+        super().add_factors(clause, usable)
+        self.profile.stop()
+        self.profile.counters["factors"] += self.stats["generated"] - generated
+
+    def partners(self, given):
+        self.profile.start(metrics.INDEXING)
+        partners = super().partners(given)
+        self.profile.stop()
+        self.profile.counters["unification_attempts"] += sum(len(pairs) for _, _, pairs in partners)
+        return partners
+
+    def keep(self, clause, usable=False):
+        removed = self.stats["backward_subsumed"]
+        self.profile.start(metrics.REDUNDANCY)
+        kept = super().keep(clause, usable)
+        self.profile.stop()
+        self.store -= self.stats["backward_subsumed"] - removed
+        if kept:
+            self.store += 1
+            self.profile.kept(clause, self.store)
+        return kept
+
+    # Снимок хода поиска для сообщения о нём
+    def snapshot(self):
+        return {
+            "seconds": round(time.monotonic() - self.started, 3),
+            "given": self.profile.counters["given"],
+            "generated": self.stats["generated"],
+            "store": self.store,
+            "unprocessed": len(self.unprocessed),
+        }
+
+# Запуск насыщения в пределах limits с запасным полным поиском. Если множество поддержки насыщено без
+# противоречия (UNKNOWN с причиной "support"), посылки могут противоречить друг другу, поэтому поиск
+# повторяется без множества поддержки в пределах оставшегося времени. Вернёт (насыщение, статус)
+def run_saturation(saturation, limits):
+    started = time.monotonic()
+    status = saturation.run(limits)
+    if status == UNKNOWN and saturation.reason == "support":
+        if limits.max_seconds is not None:
+            limits = Limits(limits.max_steps, max(limits.max_seconds - (time.monotonic() - started), 0),
+                            limits.max_clauses, limits.max_memory_mb)
+        saturation = saturation.without_support()
+        status = saturation.run(limits)
+    return saturation, status
+
+# Алгоритм резолюции. Вернёт (True, лог), если найдено противоречие, (False, лог), если его нет,
+# и (None, лог), если ресурсы исчерпаны раньше. Продолжить поиск позволяет Saturation.
+# max_steps - ограничение на количество выбранных данных клауз (если limits не заданы),
+# proof_only - при найденном противоречии вернуть лог только шагов опровержения,
+# workers - строить резольвенты в стольких процессах (ответ и лог те же, что без них),
+# support, ordering и literal_selection - множество поддержки и упорядоченная резолюция (см. Saturation;
+# насыщение с неполной стратегией досчитывается без множества поддержки, см. run_saturation),
+# profile - заполнить профиль запуска (metrics.Profile, см. ProfiledSaturation),
+# sat - решать основные клаузы CDCL-решателем (cdcl.py; стратегия, упорядочение и процессы тогда не нужны),
+# herbrand - заземлять клаузы без функций, если основных примеров не больше стольких (см. cdcl.ground_saturation)
+def resolution(clauses, max_steps=500, selection="fifo", stats=None, trace=False, limits=None, proof_only=False,
+               workers=None, support=None, ordering=None, literal_selection=None, profile=None, sat=True, herbrand=None):
+    if limits is None:
+        limits = Limits(max_steps)
+    saturation = cdcl.ground_saturation(clauses, herbrand, stats, trace) if sat else None
+    if saturation is not None:
+        status = saturation.run(limits)
+        if profile is not None:
+            profile.stats = saturation.stats
+    else:
+        pool = parallel.ResolventPool(workers) if workers is not None and workers > 1 else None
+        try:
+            options = (clauses, selection, stats, trace, pool, support, ordering, literal_selection)
+            saturation = Saturation(*options) if profile is None else ProfiledSaturation(*options, profile=profile)
+            saturation, status = run_saturation(saturation, limits)
+        finally:
+            if pool is not None:
+                pool.close()
+    if proof_only and status == PROOF:
+        return True, saturation.proof_log()
+    return {PROOF: True, SATURATED: False}.get(status), saturation.log
+
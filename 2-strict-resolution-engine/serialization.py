@@ -0,0 +1,258 @@
+import io
+import json
+import sys
+
+from codec import Decoder, Encoder
+from notation import parse_clause_set
+from saturation import Saturation, Step
+from terms import Clause, ClauseFormatError, Literal, Term
+
+# Чтение и запись клауз.
+# JSON (формат модуля I) читается потоково: клаузы разбираются по одной, сразу проверяются по схеме
+# и превращаются в объекты движка, поэтому ошибка в ответе LLM сообщается с номером клаузы и местом в тексте.
+# Клауза может быть отмечена полем "goal": true - это цель (отрицание заключения), с неё начинается
+# поиск в стратегии множества поддержки (Saturation, support).
+# Двоичный формат (codec.py) - таблица символов и клаузы, записанные номерами символов.
+# Он заметно компактнее JSON и читается без разбора текста; в нём же сохраняется состояние насыщения.
+
+CLAUSES_MAGIC = b"RCL\x01"# Набор клауз, версия 1
+STATE_MAGIC = b"RST\x01"# Состояние насыщения, версия 1
+
+
+# Проверка и преобразование аргумента. path - путь к аргументу для сообщения об ошибке
+def arg_from_json(data, path):
+    if isinstance(data, str):
+        if not data:
+            raise ClauseFormatError(f"{path}: пустое имя аргумента")
+        return sys.intern(data)
+    if not isinstance(data, dict):
+        raise ClauseFormatError(f"{path}: аргумент должен быть строкой или объектом функции, получено {json.dumps(data, ensure_ascii=False)}")
+    name = data.get("name")
+    if not isinstance(name, str) or not name:
+        raise ClauseFormatError(f"{path}: у функции должно быть непустое строковое поле \"name\"")
+    args = data.get("args")
+    if not isinstance(args, list):
+        raise ClauseFormatError(f"{path}: у функции {name} должно быть поле \"args\" со списком аргументов")
+    return Term(sys.intern(name), [arg_from_json(arg, f"{path}, аргумент {number}") for number, arg in enumerate(args, 1)])
+
+def literal_from_json(data, path):
+    if not isinstance(data, dict):
+        raise ClauseFormatError(f"{path}: литерал должен быть объектом")
+    predicate = data.get("predicate")
+    if not isinstance(predicate, str) or not predicate:
+        raise ClauseFormatError(f"{path}: у литерала должно быть непустое строковое поле \"predicate\"")
+    args = data.get("args")
+    if not isinstance(args, list):
+        raise ClauseFormatError(f"{path}: у литерала {predicate} должно быть поле \"args\" со списком аргументов")
+    negated = data.get("negated")
+    if not isinstance(negated, bool):
+        raise ClauseFormatError(f"{path}: у литерала {predicate} поле \"negated\" должно быть true или false")
+    return Literal(sys.intern(predicate), [arg_from_json(arg, f"{path}, аргумент {number}") for number, arg in enumerate(args, 1)], negated)
+
+def clause_from_json(data, path):
+    if not isinstance(data, dict):
+        raise ClauseFormatError(f"{path}: клауза должна быть объектом с полем \"literals\"")
+    literals = data.get("literals")
+    if not isinstance(literals, list):
+        raise ClauseFormatError(f"{path}: у клаузы должно быть поле \"literals\" со списком литералов")
+    if not isinstance(data.get("goal", False), bool):
+        raise ClauseFormatError(f"{path}: поле \"goal\" должно быть true или false")
+    return Clause([literal_from_json(literal, f"{path}, литерал {number}") for number, literal in enumerate(literals, 1)])
+
+
+# Потоковое чтение JSON-массива клауз из текстового потока: клаузы выдаются по одной по мере чтения.
+# goals - список, в который добавляются клаузы, отмеченные как цели
+def iter_clauses(stream, chunk_size=1 << 16, goals=None):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    # Строк и символов последней строки в уже отброшенной части текста (для места ошибки)
+    lines = 0
+    column = 0
+
+    def fill():
+        nonlocal buffer, pos, eof, lines, column
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        newlines = buffer.count("\n", 0, pos)
+        if newlines:
+            lines += newlines
+            column = pos - buffer.rfind("\n", 0, pos) - 1
+        else:
+            column += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def error(message):
+        newlines = buffer.count("\n", 0, pos)
+        if newlines:
+            line, place = lines + newlines + 1, pos - buffer.rfind("\n", 0, pos)
+        else:
+            line, place = lines + 1, column + pos + 1
+        return ClauseFormatError(f"строка {line}, столбец {place}: {message}")
+
+    # Следующий значащий символ (None в конце текста)
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return None
+
+    first = peek()
+    if first is None:
+        raise error("пустой текст, ожидался JSON-массив клауз")
+    if first != "[":
+        hint = " (ответ обёрнут в ```)" if buffer.startswith("```", pos) else ""
+        raise error(f"ожидался JSON-массив клауз, начинающийся с '['{hint}")
+    pos += 1
+    number = 0
+    while True:
+        char = peek()
+        if char == "]":
+            pos += 1
+            break
+        if number:
+            if char != ",":
+                raise error("ожидалась ',' или ']' после клаузы" if char is not None else "текст оборвался внутри массива клауз")
+            pos += 1
+            char = peek()
+        if char is None:
+            raise error("текст оборвался внутри массива клауз")
+        number += 1
+        while True:
+            try:
+                data, end = decoder.raw_decode(buffer, pos)
+                break
+            except json.JSONDecodeError as decode_error:
+                if not eof and fill():
+                    continue
+                pos = decode_error.pos
+                raise error(f"клауза {number}: некорректный JSON ({decode_error.msg})") from None
+        try:
+            clause = clause_from_json(data, f"клауза {number}")
+        except ClauseFormatError as format_error:
+            raise error(str(format_error)) from None
+        pos = end
+        if goals is not None and data.get("goal"):
+            goals.append(clause)
+        yield clause
+    if peek() is not None:
+        raise error("лишний текст после массива клауз")
+
+# Разбор клауз из JSON-текста (ответа формализатора). goals - как в iter_clauses
+def parse_clauses(text, goals=None):
+    return list(iter_clauses(io.StringIO(text), goals=goals))
+
+
+def dump_binary(clauses):
+    encoder = Encoder()
+    encoder.clauses(clauses)
+    return encoder.result(CLAUSES_MAGIC)
+
+def load_binary(data):
+    return Decoder().feed(data, CLAUSES_MAGIC).clauses()
+
+# Чтение клауз из файла. Двоичный формат определяется по сигнатуре, JSON - по первому символу '['
+# (или '`', чтобы сообщить о разметке вокруг JSON), остальное читается как текстовая запись ¬P(x) ∨ Q(x).
+# goals - как в iter_clauses (цели отмечаются только в JSON)
+def read_clauses(filename, goals=None):
+    with open(filename, "rb") as f:
+        magic = f.read(len(CLAUSES_MAGIC))
+        if magic == CLAUSES_MAGIC:
+            return load_binary(magic + f.read())
+    with open(filename, "r", encoding="utf-8") as f:
+        head = f.read(256).lstrip("\ufeff \t\r\n")
+        f.seek(0)
+        if not head or head[0] in "[`":
+            return list(iter_clauses(f, goals=goals))
+        return parse_clause_set(f.read())
+
+def write_binary(clauses, filename):
+    with open(filename, "wb") as f:
+        f.write(dump_binary(clauses))
+
+
+# Состояние насыщения: граф вывода (клаузы шагов, их виды и родители), обработанные клаузы и очередь
+# необработанных (номерами шагов) и счётчики. Множество уже встреченных клауз не сохраняется -
+# повторно выведенные клаузы после загрузки отсекаются проверкой поглощения, а не как дубликаты.
+# Последний раздел - исходный набор клауз: по нему run_saturation повторяет поиск без множества поддержки
+def dump_state(saturation):
+    steps = saturation.inputs + saturation.steps
+    numbers = {id(step): number for number, step in enumerate(steps)}
+    encoder = Encoder()
+    encoder.clauses(step.clause for step in steps)
+    queue = saturation.unprocessed
+    meta = {
+        "selection": queue.selection,
+        "pick_ratio": queue.pick_ratio,
+        "picks": queue.picks,
+        "step": saturation.step,
+        "stats": saturation.stats,
+        "trace": saturation.trace,
+        "status": saturation.status,
+        "reason": saturation.reason,
+        "complete": saturation.complete,
+        "ordering": saturation.ordering,
+        "literal_selection": saturation.literal_selection,
+        "steps": [[step.kind, step.number, [numbers[id(parent)] for parent in step.parents], step.pair]
+                  for step in steps],
+        "processed": [numbers[id(saturation.derivations[clause])] for clause in saturation.processed.clauses()],
+        "unprocessed": [numbers[id(saturation.derivations[clause])] for clause in queue.ages],
+    }
+    encoder.blob(json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    encoder.clauses(saturation.options[0])
+    return encoder.result(STATE_MAGIC)
+
+def load_state(data):
+    decoder = Decoder().feed(data, STATE_MAGIC)
+    clauses = decoder.clauses()
+    meta = json.loads(decoder.blob().decode("utf-8"))
+    inputs = decoder.clauses() if decoder.pos < len(decoder.data) else None
+    saturation = Saturation([], meta["selection"], meta["stats"], meta["trace"],
+                            ordering=meta.get("ordering"), literal_selection=meta.get("literal_selection"))
+    saturation.unprocessed.pick_ratio = meta["pick_ratio"]
+    steps = []
+    for clause, (kind, number, parents, pair) in zip(clauses, meta["steps"]):
+        steps.append(Step(number, kind, clause, tuple(steps[parent] for parent in parents),
+                          tuple(pair) if pair is not None else None))
+        if clause.literals:
+            saturation.record(steps[-1])
+        else:
+            saturation.steps.append(steps[-1])
+            saturation.contradiction = steps[-1]
+    for number in meta["processed"]:
+        clause = steps[number].clause
+        saturation.seen.add(clause)
+        saturation.kept.add(clause)
+        saturation.processed.add(clause)
+    for number in meta["unprocessed"]:
+        clause = steps[number].clause
+        saturation.seen.add(clause)
+        saturation.kept.add(clause)
+        saturation.unprocessed.push(clause)
+    saturation.unprocessed.picks = meta["picks"]
+    saturation.step = meta["step"]
+    saturation.status = meta["status"]
+    saturation.reason = meta["reason"]
+    saturation.complete = meta.get("complete", True)
+    # В состояниях без раздела исходных клауз их заменяют сохранённые исходные шаги (равновыполнимый набор)
+    if inputs is None:
+        inputs = [step.clause for step in saturation.inputs]
+    saturation.options = (inputs, meta["selection"])
+    return saturation
+
+def save_state(saturation, filename):
+    with open(filename, "wb") as f:
+        f.write(dump_state(saturation))
+
+def read_state(filename):
+    with open(filename, "rb") as f:
+        return load_state(f.read())
@@ -0,0 +1,220 @@
+import weakref
+
+# Хранилища уже созданных термов и литералов (hash-consing):
+# структурно равные термы - это один и тот же объект, поэтому сравнение сводится к проверке "is"
+_terms = weakref.WeakValueDictionary()
+_literals = weakref.WeakValueDictionary()
+
+
+# Ошибка формата клауз во входных данных (JSON, двоичном или текстовом). Сообщение содержит место ошибки
+class ClauseFormatError(ValueError):
+    pass
+
+
+# Является ли аргумент переменной (переменные - строки из строчных букв)
+def is_variable(arg):
+    return isinstance(arg, str) and arg.islower()
+
+# Является ли аргумент (переменная, константа или терм) основным, т.е. без переменных
+def is_ground(arg):
+    if isinstance(arg, str):
+        return not arg.islower()
+    return arg.ground
+
+# Добавление переменных аргумента в словарь variables (упорядоченное множество)
+def collect_variables(arg, variables):
+    if isinstance(arg, str):
+        if arg.islower():
+            variables[arg] = None
+    elif not arg.ground:
+        for sub in arg.args:
+            collect_variables(sub, variables)
+
+# Применение подстановки к аргументу любого вида
+def substitute(arg, substitution):
+    if isinstance(arg, Term):
+        return arg.apply_substitution(substitution)
+    return substitution.get(arg, arg)
+
+
+# Неизменяемые объекты: все поля задаются один раз при создании
+class Immutable:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} неизменяем")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} неизменяем")
+
+
+class Term(Immutable):
+    __slots__ = ("name", "args", "ground", "_hash", "__weakref__")
+
+    def __new__(cls, name, args=None):
+        args = tuple(args) if args else ()
+        key = (name, args)
+        term = _terms.get(key)
+        if term is None:
+            term = object.__new__(cls)
+            object.__setattr__(term, "name", name)
+            object.__setattr__(term, "args", args)
+            object.__setattr__(term, "ground", all(is_ground(arg) for arg in args))
+            object.__setattr__(term, "_hash", hash(key))
+            _terms[key] = term
+        return term
+
+    # Для pickle: при загрузке терм снова попадает в хранилище
+    def __reduce__(self):
+        return Term, (self.name, self.args)
+
+    def __repr__(self):
+        if not self.args:
+            return str(self.name)
+        return f"{self.name}({', '.join(map(str, self.args))})"
+
+    # Сравнение по умолчанию (по идентичности) корректно благодаря hash-consing
+    def __hash__(self):
+        return self._hash
+
+    # Применение подстановки к терму. Если ничего не меняется, возвращается сам терм
+    def apply_substitution(self, substitution):
+        if not substitution:
+            return self
+        if isinstance(self.name, str) and self.name in substitution:
+            substituted = substitution[self.name]
+            if isinstance(substituted, Term):
+                return substituted.apply_substitution(substitution)
+            return substituted
+        if self.ground:
+            return self
+        new_args = tuple(substitute(arg, substitution) for arg in self.args)
+        if all(new is old for new, old in zip(new_args, self.args)):
+            return self
+        return Term(self.name, new_args)
+
+    # Проверка на наличие переменной в терме
+    def occurs_check(self, var):
+        if isinstance(self.name, str) and self.name == var:
+            return True
+        if self.ground:
+            return False
+        for arg in self.args:
+            if isinstance(arg, Term) and arg.occurs_check(var):
+                return True
+            if arg == var:
+                return True
+        return False
+
+    # Для JSON
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "args": [arg.to_dict() if isinstance(arg, Term) else arg for arg in self.args]
+        }
+
+class Literal(Immutable):
+    __slots__ = ("predicate", "args", "negated", "ground", "_hash", "__weakref__")
+
+    # Процедура создания литерала. negated - флаг отрицания
+    def __new__(cls, predicate, args, negated=False):
+        args = tuple(args)
+        key = (predicate, args, negated)
+        literal = _literals.get(key)
+        if literal is None:
+            literal = object.__new__(cls)
+            object.__setattr__(literal, "predicate", predicate)
+            object.__setattr__(literal, "args", args)
+            object.__setattr__(literal, "negated", negated)
+            object.__setattr__(literal, "ground", all(is_ground(arg) for arg in args))
+            object.__setattr__(literal, "_hash", hash(key))
+            _literals[key] = literal
+        return literal
+
+    def __reduce__(self):
+        return Literal, (self.predicate, self.args, self.negated)
+
+    # Возврат строки в читаемом виде
+    def __repr__(self):
+        return ("¬" if self.negated else "") + f"{self.predicate}({', '.join(map(str, self.args))})"
+
+    # Хеш для встроенных структур данных (вычислен при создании)
+    def __hash__(self):
+        return self._hash
+
+    # Вернёт отрицание
+    def negate(self):
+        return Literal(self.predicate, self.args, not self.negated)
+
+    # Встроенное сравнение "противоречия"
+    def is_negation_of(self, other):
+        return self.predicate == other.predicate and self.negated != other.negated
+
+    # Применение подстановки к литералу. Если ничего не меняется, возвращается сам литерал
+    def apply_substitution(self, substitution):
+        if self.ground or not substitution:
+            return self
+        new_args = tuple(substitute(arg, substitution) for arg in self.args)
+        if all(new is old for new, old in zip(new_args, self.args)):
+            return self
+        return Literal(self.predicate, new_args, self.negated)
+
+    # Переменные литерала в порядке первого вхождения
+    def variables(self):
+        variables = {}
+        if not self.ground:
+            for arg in self.args:
+                collect_variables(arg, variables)
+        return list(variables)
+
+    # Для JSON
+    def to_dict(self):
+        return {
+            "predicate": self.predicate,
+            "args": [arg.to_dict() if isinstance(arg, Term) else arg for arg in self.args],
+            "negated": self.negated
+        }
+
+class Clause(Immutable):
+    __slots__ = ("literals", "_hash")
+
+    # Клауза хранит литералы в исходном порядке (для вывода), а сравнивается как множество.
+    # Повторы литералов убираются сразу: иначе P ∨ P равна P, но резольвируется как двухлитеральная
+    def __init__(self, literals):
+        literals = tuple(dict.fromkeys(literals))
+        object.__setattr__(self, "literals", literals)
+        object.__setattr__(self, "_hash", hash(frozenset(literals)))
+
+    def __reduce__(self):
+        return Clause, (self.literals,)
+
+    # Читаемый вид
+    def __repr__(self):
+        return " ∨ ".join(map(str, self.literals))
+
+    # Сравнил быстро и мощно: множества литералов сравниваются, только если совпали хеши
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Clause) or self._hash != other._hash:
+            return False
+        return self.literals == other.literals or set(self.literals) == set(other.literals)
+
+    # Хеш для std (вычислен при создании)
+    def __hash__(self):
+        return self._hash
+
+    # Переменные клаузы в порядке первого вхождения
+    def variables(self):
+        variables = {}
+        for literal in self.literals:
+            if not literal.ground:
+                for arg in literal.args:
+                    collect_variables(arg, variables)
+        return list(variables)
+
+    # Для JSON
+    def to_dict(self):
+        return {
+            "literals": [literal.to_dict() for literal in self.literals]
+        }
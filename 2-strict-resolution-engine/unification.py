@@ -0,0 +1,111 @@
+from terms import Term, is_variable
+
+# Ядро унификации.
+# Привязки переменных хранятся в треугольном виде: bindings[x] может ссылаться на терм с другими
+# привязанными переменными, поэтому при чтении переменные разыменовываются до конца (walk).
+# Каждая новая привязка записывается в trail, откат к отметке mark снимает все привязки после неё.
+# Строки лога строятся только если передан список trace.
+
+
+# Полное разыменование переменной по цепочке привязок
+def walk(arg, bindings):
+    while isinstance(arg, str) and arg in bindings:
+        arg = bindings[arg]
+    return arg
+
+# Откат привязок, сделанных после отметки mark
+def undo(bindings, trail, mark):
+    while len(trail) > mark:
+        del bindings[trail.pop()]
+
+# Проверка вхождения переменной var в терм с учётом привязок
+def occurs(var, term, bindings):
+    stack = [term]
+    while stack:
+        arg = walk(stack.pop(), bindings)
+        if arg == var:
+            return True
+        if isinstance(arg, Term) and not arg.ground:
+            stack.extend(arg.args)
+    return False
+
+# Аргумент с полностью применёнными привязками
+def instantiate(arg, bindings):
+    arg = walk(arg, bindings)
+    if isinstance(arg, str) or arg.ground:
+        return arg
+    return Term(arg.name, [instantiate(sub, bindings) for sub in arg.args])
+
+# Идемпотентная подстановка из треугольных привязок (её можно применять за один проход)
+def resolved_substitution(bindings):
+    return {var: instantiate(value, bindings) for var, value in bindings.items()}
+
+# Унификация двух аргументов без рекурсии. Вернёт False и откатит свои привязки, если унификация невозможна
+def unify_args(a1, a2, bindings, trail, trace=None):
+    mark = len(trail)
+    stack = [(a1, a2)]
+    while stack:
+        a1, a2 = stack.pop()
+        a1 = walk(a1, bindings)
+        a2 = walk(a2, bindings)
+
+        if a1 == a2:
+            if trace is not None:
+                trace.append(f"Шаг {len(trace) + 1}: {a1} и {a2} уже унифицированы.")
+            continue
+
+        if not is_variable(a1) and is_variable(a2):
+            a1, a2 = a2, a1
+        if is_variable(a1):
+            if isinstance(a2, Term) and occurs(a1, a2, bindings):
+                if trace is not None:
+                    trace.append(f"Шаг {len(trace) + 1}: Циклическая подстановка: переменная {a1} входит в терм {a2}.")
+                undo(bindings, trail, mark)
+                return False
+            if trace is not None:
+                trace.append(f"Шаг {len(trace) + 1}: Переменная {a1} связана с {a2}.")
+            bindings[a1] = a2
+            trail.append(a1)
+            continue
+
+        if isinstance(a1, Term) and isinstance(a2, Term):
+            if a1.name != a2.name or len(a1.args) != len(a2.args):
+                if trace is not None:
+                    trace.append(f"Шаг {len(trace) + 1}: Унификация {a1} и {a2} невозможна: разные имена или количество аргументов.")
+                undo(bindings, trail, mark)
+                return False
+            if trace is not None:
+                trace.append(f"Шаг {len(trace) + 1}: Унификация термов {a1} и {a2}.")
+            # Аргументы кладутся в обратном порядке, чтобы разбираться слева направо
+            stack.extend(reversed(list(zip(a1.args, a2.args))))
+            continue
+
+        if trace is not None:
+            trace.append(f"Шаг {len(trace) + 1}: Унификация {a1} и {a2} невозможна: несовместимые типы.")
+        undo(bindings, trail, mark)
+        return False
+    return True
+
+# Унификация аргументов двух литералов (предикаты и знаки не проверяются)
+def unify_literal_args(l1, l2, bindings, trail, trace=None):
+    if len(l1.args) != len(l2.args):
+        return False
+    mark = len(trail)
+    for a1, a2 in zip(l1.args, l2.args):
+        if not unify_args(a1, a2, bindings, trail, trace):
+            undo(bindings, trail, mark)
+            return False
+    return True
+
+# Унификация литералов: предикаты должны совпадать, а знаки отличаться.
+# Вернёт идемпотентную подстановку или None
+def unify(l1, l2, substitution, trace=None):
+    # Проверка по умолчанию - смысла в ней вероятно уже нет, но и вреда тоже
+    if substitution is None:
+        return None
+    if l1.predicate != l2.predicate or l1.negated == l2.negated:
+        return None
+    bindings = dict(substitution)
+    if not unify_literal_args(l1, l2, bindings, [], trace):
+        return None
+    return resolved_substitution(bindings)
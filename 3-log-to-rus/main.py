@@ -1,41 +1,41 @@
+import functools
 import os
-import requests
-from config import *
+import sys
 
 PROMPT_FILE = "prompt.txt"
 INPUT_FILE = "input.txt"
 OUTPUT_FILE = "output.txt"
 
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.append(os.path.dirname(MODULE_DIR))# Общий клиент LLM лежит в корне проекта
+from llm_client import get_client, load_config
+
+DEEPSEEK_API_KEY = load_config(MODULE_DIR).DEEPSEEK_API_KEY
+
 def read_file(filename):
     with open(filename, 'r', encoding='utf-8') as f:
         return f.read().strip()
 
+# Системный промпт читается с диска один раз за процесс
+@functools.lru_cache(maxsize=None)
+def system_prompt():
+    return read_file(os.path.join(MODULE_DIR, PROMPT_FILE))
+
+# Запрос к LLM: системный промпт и сообщение пользователя -> текст ответа.
+# deadline - крайний срок по time.monotonic() (см. LLMClient.request) или None
+def ask(system_prompt, user_message, deadline=None):
+    return get_client(DEEPSEEK_API_KEY).chat(system_prompt, user_message, temperature=0.1, deadline=deadline)
+
+# Объяснение лога резолюции на русском языке
+def explain(log_text, deadline=None):
+    return ask(system_prompt(), log_text.strip(), deadline)
+
 def main():
-    system_prompt = read_file(PROMPT_FILE)
-    user_message = read_file(INPUT_FILE)
-
-    url = "https://api.deepseek.com/v1/chat/completions"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}"
-    }
-    data = {
-        "model": "deepseek-coder",
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-
-        ],
-        "temperature": 0.1
-    }
-
-    response = requests.post(url, json=data, headers=headers)
-    response.raise_for_status()
-
-    result = response.json()['choices'][0]['message']['content']
+    result = explain(read_file(INPUT_FILE))
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         f.write(result)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
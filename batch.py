@@ -0,0 +1,124 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import llm_cache
+import llm_client
+import main as pipeline
+from tests.problem import problem
+
+# Пакетное решение задач.
+# Каждая задача проходит все три модуля в своём потоке: запросы к LLM ограничены общим клиентом LLM,
+# а резолюция (нагрузка на процессор) выполняется в пуле процессов.
+# Результаты пишутся в JSONL по мере готовности, поэтому их порядок может отличаться от порядка задач.
+
+DEFAULT_LIMITS = {"max_steps": 500, "max_seconds": 60}
+
+
+# Корпус задач: встроенный список из tests/problem.py или JSONL-файл.
+# Строка JSONL - объект {"id": ..., "problem": "текст"} или просто строка с текстом задачи
+def load_corpus(path=None):
+    if path is None:
+        return [{"id": index, "problem": text} for index, text in enumerate(problem)]
+    corpus = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"problem": item}
+            item.setdefault("id", number)
+            corpus.append(item)
+    return corpus
+
+
+# Модуль II в процессе пула. Ограничения передаются словарём: объекты движка в новом процессе ещё не импортированы.
+# strategy - как в pipeline.prove
+def prove_worker(formalization, limits, strategy="sos"):
+    engine = pipeline.load_module(*pipeline.ENGINE)
+    _, proof, log, log_text = pipeline.prove(formalization, engine.Limits(**limits), strategy=strategy)
+    return proof, log, log_text
+
+
+# Решение корпуса задач с записью результатов в output_path (JSONL).
+# workers - число процессов для резолюции, llm_concurrency - сколько запросов к LLM идёт одновременно.
+# on_result вызывается для каждой готовой записи. Вернёт количество задач, решённых без ошибок
+def solve_batch(corpus, output_path, workers=None, llm_concurrency=4, limits=None, on_result=None):
+    if limits is None:
+        limits = DEFAULT_LIMITS
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    # Модули загружаются заранее, до появления потоков. Движок нужен и здесь: его исключения из процессов
+    # (например, ClauseFormatError на неверной формализации) иначе не распаковываются, и пул ломается для всех задач
+    formalizer = pipeline.load_module(*pipeline.FORMALIZER)
+    explainer = pipeline.load_module(*pipeline.EXPLAINER)
+    pipeline.load_module(*pipeline.ENGINE)
+    llm_client.configure(concurrency=llm_concurrency)
+    solved = 0
+
+    # spawn вместо fork: процессы создаются из рабочих потоков
+    engines = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    # Одновременно в работе столько задач, чтобы были заняты и LLM, и все процессы резолюции
+    threads = ThreadPoolExecutor(llm_concurrency + workers)
+
+    def solve_one(item):
+        started = time.monotonic()
+        record = {"id": item["id"], "problem": item["problem"]}
+        try:
+            record["formalization"] = formalizer.formalize(item["problem"])
+            proof, log, log_text = engines.submit(prove_worker, record["formalization"], limits).result()
+            record["proof"] = proof
+            record["log"] = log
+            record["explanation"] = explainer.explain(log_text)
+        except Exception as error:# Ошибка одной задачи не должна останавливать весь пакет
+            record["error"] = f"{type(error).__name__}: {error}"
+        record["seconds"] = round(time.monotonic() - started, 3)
+        return record
+
+    with engines, threads, open(output_path, "w", encoding="utf-8") as out:
+        futures = [threads.submit(solve_one, item) for item in corpus]
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if "error" not in record:
+                solved += 1
+            if on_result is not None:
+                on_result(record)
+    return solved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетное решение задач")
+    parser.add_argument("--corpus", help="JSONL-файл с задачами (по умолчанию - задачи из tests/problem.py)")
+    parser.add_argument("--output", default="batch_output.jsonl", help="JSONL-файл для результатов")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов для резолюции")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="число одновременных запросов к LLM")
+    parser.add_argument("--llm-cache", choices=llm_cache.MODES, default=os.environ.get("LLM_CACHE", "rw"),
+                        help="кэш ответов LLM: rw - чтение и запись, ro - только чтение (воспроизводимый прогон), off - без кэша")
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_LIMITS["max_steps"])
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_LIMITS["max_seconds"])
+    args = parser.parse_args()
+    os.environ["LLM_CACHE"] = args.llm_cache# Общий клиент LLM настраивает кэш по переменным окружения
+
+    corpus = load_corpus(args.corpus)
+    done = 0
+
+    def report(record):
+        nonlocal done
+        done += 1
+        outcome = record.get("error", f"противоречие найдено: {record.get('proof')}")
+        print(f"[{done}/{len(corpus)}] задача {record['id']}: {outcome} ({record['seconds']} с)")
+
+    limits = {"max_steps": args.max_steps, "max_seconds": args.max_seconds}
+    solved = solve_batch(corpus, args.output, args.workers, args.llm_concurrency, limits, report)
+    print(f"Решено без ошибок: {solved} из {len(corpus)}. Результаты: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
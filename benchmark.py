@@ -0,0 +1,266 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import main as pipeline
+
+# Замеры движка резолюций без LLM.
+# Наборы клауз строятся генераторами (принцип Дирихле, цепочки импликаций, случайные k-КНФ,
+# вложенные скулемовские термы, случайные клаузы из повторяющихся литералов) или берутся из tests/formalized -
+# замороженных формализаций задач из tests/problem.py (pN.json - N-я задача, цели отмечены полем "goal").
+# Каждый прогон идёт в отдельном процессе, поэтому пиковая память процесса относится только к нему.
+# Стратегия cdcl - встроенный SAT-решатель: основные задачи и задачи без функций (заземлённые по универсуму
+# Эрбрана); остальные задачи ею не прогоняются.
+# Результаты сравниваются с сохранённой базой: изменение ответа или числа клауз - изменение поведения,
+# рост времени больше допуска - замедление. В обоих случаях программа завершается с кодом 1.
+
+FORMALIZED_DIR = os.path.join(pipeline.BASE_DIR, "tests", "formalized")
+BASELINE_PATH = os.path.join(pipeline.BASE_DIR, "tests", "bench_baseline.json")
+
+# Ограничения по шагам и клаузам, а не по времени: тогда ответ и счётчики не зависят от скорости машины
+DEFAULT_LIMITS = {"max_steps": 2000, "max_clauses": 20000}
+DEFAULT_STRATEGIES = ("fifo", "sos", "ordered", "cdcl")
+HERBRAND = 100000# Наибольшее число основных примеров для стратегии cdcl
+MIN_SECONDS = 0.05# Более короткие прогоны не сравниваются по времени - слишком велик шум
+
+
+# Генераторы наборов клауз. Каждый возвращает клаузы движка; клаузы-цели (если есть) кладутся в goals
+
+# Принцип Дирихле: holes + 1 голубей в holes клетках (невыполним)
+def pigeonhole(engine, holes, goals):
+    pigeons = [f"P{number}" for number in range(1, holes + 2)]
+    cells = [f"H{number}" for number in range(1, holes + 1)]
+    clauses = [engine.Clause([engine.Literal("В", [pigeon, cell], False) for cell in cells]) for pigeon in pigeons]
+    for cell in cells:
+        for first in range(len(pigeons)):
+            for second in range(first + 1, len(pigeons)):
+                clauses.append(engine.Clause([engine.Literal("В", [pigeons[first], cell], True),
+                                              engine.Literal("В", [pigeons[second], cell], True)]))
+    return clauses
+
+# Цепочка импликаций глубины depth: A0(C), Ai(x) → Ai+1(x), цель ¬Adepth(C)
+def implication_chain(engine, depth, goals):
+    clauses = [engine.Clause([engine.Literal("A0", ["C"], False)])]
+    for number in range(depth):
+        clauses.append(engine.Clause([engine.Literal(f"A{number}", ["x"], True),
+                                      engine.Literal(f"A{number + 1}", ["x"], False)]))
+    goals.append(engine.Clause([engine.Literal(f"A{depth}", ["C"], True)]))
+    return clauses + goals
+
+# Случайная k-КНФ: variables атомов, ratio * variables клауз (для 3-КНФ порог выполнимости около 4.26)
+def random_cnf(engine, variables, goals, k=3, ratio=4.26, seed=0):
+    generator = random.Random(seed)
+    clauses = []
+    for _ in range(round(ratio * variables)):
+        atoms = generator.sample(range(1, variables + 1), k)
+        clauses.append(engine.Clause([engine.Literal(f"X{atom}", [], generator.random() < 0.5) for atom in atoms]))
+    return clauses
+
+# Вложенные скулемовские термы: P(C), P(x) → P(f(x)), цель ¬P(f(f(...f(C)...))) глубины depth
+def nested_skolem(engine, depth, goals):
+    term = "C"
+    for _ in range(depth):
+        term = engine.Term("f", [term])
+    goals.append(engine.Clause([engine.Literal("P", [term], True)]))
+    return [engine.Clause([engine.Literal("P", ["C"], False)]),
+            engine.Clause([engine.Literal("P", ["x"], True), engine.Literal("P", [engine.Term("f", ["x"])], False)])] + goals
+
+# Случайные клаузы из 1-3 литералов, взятых из literals случайных литералов с термами глубины до 3.
+# Литералы повторяются, поэтому время уходит на построение и сравнение термов, поиск дубликатов и поглощение
+# входных клауз - замер разделяемых (hash-consed) термов
+def random_terms(engine, count, goals, literals=3000, seed=0):
+    generator = random.Random(seed)
+
+    def term(depth):
+        if depth == 0 or generator.random() < 0.3:
+            return generator.choice(["x", "y", "A", "B", "C"])
+        return engine.Term(generator.choice(["f", "g"]), [term(depth - 1) for _ in range(generator.randint(1, 2))])
+
+    pool = [(generator.choice(["P", "Q", "R"]), [term(3), term(3)], generator.random() < 0.5) for _ in range(literals)]
+    return [engine.Clause([engine.Literal(*generator.choice(pool)) for _ in range(generator.randint(1, 3))])
+            for _ in range(count)]
+
+GENERATORS = {
+    "pigeonhole": pigeonhole,
+    "chain": implication_chain,
+    "cnf": random_cnf,
+    "skolem": nested_skolem,
+    "terms": random_terms,
+}
+
+# Сгенерированные задачи по умолчанию: имя -> (генератор, параметр)
+GENERATED = {
+    "pigeonhole-3": ("pigeonhole", 3),
+    "pigeonhole-4": ("pigeonhole", 4),
+    "chain-50": ("chain", 50),
+    "chain-200": ("chain", 200),
+    "cnf-12": ("cnf", 12),
+    "cnf-20": ("cnf", 20),
+    "skolem-20": ("skolem", 20),
+    "skolem-100": ("skolem", 100),
+    "terms-20000": ("terms", 20000),
+}
+
+
+# Задачи набора: имя -> описание для build_case
+def load_cases(names=None):
+    cases = {f"formalized/{os.path.basename(path)[:-len('.json')]}": ("file", path)
+             for path in sorted(glob.glob(os.path.join(FORMALIZED_DIR, "*.json")))}
+    cases.update(GENERATED)
+    if names is not None:
+        unknown = [name for name in names if name not in cases]
+        if unknown:
+            raise ValueError(f"Неизвестные задачи: {', '.join(unknown)}")
+        cases = {name: cases[name] for name in names}
+    return cases
+
+def build_case(engine, case):
+    goals = []
+    kind, parameter = case
+    if kind == "file":
+        return engine.read_clauses(parameter, goals), goals
+    return GENERATORS[kind](engine, parameter, goals), goals
+
+
+# Один прогон в процессе пула (новый процесс на каждый прогон). Вернёт запись с метриками
+# или None, если стратегия cdcl к задаче неприменима
+def run_case(name, case, strategy, limits):
+    engine = pipeline.load_module(*pipeline.ENGINE)
+    clauses, goals = build_case(engine, case)
+    stats = {}
+    started = time.perf_counter()
+    if strategy == engine.CDCL:
+        saturation = engine.ground_saturation(clauses, HERBRAND, stats)
+        if saturation is None:
+            return None
+    else:
+        saturation = engine.Saturation(clauses, stats=stats, **engine.strategy_options(strategy, goals))
+    # Как в движке: насыщенное множество поддержки досчитывается полным поиском
+    saturation, status = engine.run_saturation(saturation, engine.Limits(**limits))
+    seconds = time.perf_counter() - started
+    peak = engine.peak_memory_mb()
+    # Сохранённые клаузы CDCL-решателя - выученные
+    return {
+        "case": name,
+        "strategy": strategy,
+        "status": status,
+        "reason": saturation.reason,
+        "seconds": round(seconds, 4),
+        "generated": stats["generated"],
+        "kept": stats["generated"] if strategy == engine.CDCL else len(saturation.derivations),
+        "peak_memory_mb": round(peak, 1) if peak is not None else None,
+    }
+
+# Все прогоны: каждая задача каждой стратегией. Вернёт записи в порядке задач
+def run_benchmark(cases, strategies=DEFAULT_STRATEGIES, limits=None, on_result=None):
+    if limits is None:
+        limits = DEFAULT_LIMITS
+    # Процесс на прогон: пиковая память процесса не накапливается между задачами
+    executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"), max_tasks_per_child=1)
+    results = []
+    with executor:
+        for name, case in cases.items():
+            for strategy in strategies:
+                result = executor.submit(run_case, name, case, strategy, limits).result()
+                if result is None:
+                    continue
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    return results
+
+
+def load_baseline(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return {(record["case"], record["strategy"]): record for record in json.load(f)}
+
+def save_baseline(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+
+# Сравнение с базой. tolerance - допустимый относительный рост времени.
+# Вернёт список (задача, стратегия, вид, описание); вид - "changed", "slower", "faster" или "new"
+def compare(results, baseline, tolerance=0.25):
+    differences = []
+    for result in results:
+        key = (result["case"], result["strategy"])
+        old = baseline.get(key)
+        if old is None:
+            differences.append((*key, "new", "нет в базе"))
+            continue
+        # Остановка по времени случайна, счётчики таких прогонов не сравниваются
+        fields = ("status",) if "time" in (old["reason"], result["reason"]) else ("status", "generated", "kept")
+        changes = [f"{field}: {old[field]} -> {result[field]}" for field in fields if old[field] != result[field]]
+        if changes:
+            differences.append((*key, "changed", ", ".join(changes)))
+        if max(old["seconds"], result["seconds"]) < MIN_SECONDS:
+            continue
+        ratio = result["seconds"] / max(old["seconds"], 1e-9)
+        if ratio > 1 + tolerance:
+            differences.append((*key, "slower", f"{old['seconds']} -> {result['seconds']} с (x{ratio:.2f})"))
+        elif ratio < 1 / (1 + tolerance):
+            differences.append((*key, "faster", f"{old['seconds']} -> {result['seconds']} с (x{ratio:.2f})"))
+    return differences
+
+
+def format_result(result):
+    memory = result["peak_memory_mb"]
+    return (f"{result['case']:<24} {result['strategy']:<8} {result['status']:<9} {result['reason'] or '':<7}"
+            f" {result['seconds']:>9.4f} с  сгенерировано {result['generated']:>7}  сохранено {result['kept']:>6}"
+            f"  память {memory if memory is not None else '?'} МБ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры движка резолюций на сгенерированных и замороженных задачах")
+    parser.add_argument("--cases", help="задачи через запятую (по умолчанию все, список - --list)")
+    parser.add_argument("--strategies", default=",".join(DEFAULT_STRATEGIES), help="стратегии через запятую")
+    parser.add_argument("--list", action="store_true", help="вывести имена задач и выйти")
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_LIMITS["max_steps"])
+    parser.add_argument("--max-clauses", type=int, default=DEFAULT_LIMITS["max_clauses"])
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--output", default="bench_output.txt", help="файл для отчёта")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="файл базы для сравнения")
+    parser.add_argument("--save-baseline", action="store_true", help="записать результаты как новую базу")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимый относительный рост времени")
+    args = parser.parse_args()
+
+    cases = load_cases(args.cases.split(",") if args.cases else None)
+    if args.list:
+        print("\n".join(cases))
+        return
+    strategies = args.strategies.split(",")
+    lines = []
+
+    def report(result):
+        lines.append(format_result(result))
+        print(lines[-1], flush=True)
+
+    limits = {"max_steps": args.max_steps, "max_clauses": args.max_clauses, "max_seconds": args.max_seconds}
+    results = run_benchmark(cases, strategies, limits, report)
+
+    failed = False
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        lines.append(f"База записана: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        differences = compare(results, load_baseline(args.baseline), args.tolerance)
+        lines.append(f"Сравнение с базой {args.baseline}: отличий {len(differences)}")
+        for case, strategy, kind, description in differences:
+            lines.append(f"  {kind:<8} {case} {strategy}: {description}")
+        failed = any(kind in ("changed", "slower") for _, _, kind, _ in differences)
+    print("\n".join(lines[len(results):]))
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
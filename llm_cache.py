@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Кэш ответов LLM на диске.
+# Ключ - хэш (модель, температура, системный промпт, сообщение), по одному JSON-файлу на ответ.
+# Время последнего обращения хранится в mtime файла: при превышении max_bytes удаляются давно
+# не использованные ответы (LRU), ответы старше ttl секунд считаются устаревшими.
+# Размер кэша считается счётчиком, каталог просматривается только когда счётчик превысит предел
+# (счётчик своего процесса; записи других процессов учитываются при этом просмотре).
+# В режиме read_only кэш только читается - ни записи, ни обновления mtime (для воспроизводимых прогонов).
+# Отсутствующий каталог - пустой кэш.
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache")
+EVICT_TO = 0.9# Вытеснение освобождает место с запасом - до такой доли max_bytes
+MODES = ("rw", "ro", "off")# Чтение и запись, только чтение, без кэша
+
+
+def cache_key(model, temperature, system_prompt, user_message):
+    data = json.dumps([model, temperature, system_prompt, user_message], ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    # max_bytes - предел размера кэша (None - без предела), ttl - срок жизни ответа в секундах (None - бессрочно)
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=64 * 1024 * 1024, ttl=None, read_only=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.size = None# Размер ответов в байтах (считается при первой записи)
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    # Ответ из кэша или None
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if self.ttl is not None and time.time() - entry["created"] > self.ttl:
+            self.misses += 1
+            return None
+        if not self.read_only:
+            try:
+                os.utime(path)# Отметка обращения для LRU
+            except OSError:
+                pass
+        self.hits += 1
+        return entry["content"]
+
+    def put(self, key, content):
+        if self.read_only:
+            return
+        path = self.path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "content": content}, f, ensure_ascii=False)
+        size = os.path.getsize(temp_path)
+        try:
+            size -= os.path.getsize(path)# Ответ заменяет прежний с тем же ключом
+        except OSError:
+            pass
+        os.replace(temp_path, path)# Запись целиком, чтобы параллельные читатели не видели половину файла
+        if self.max_bytes is None:
+            return
+        with self.lock:
+            if self.size is None:
+                self.size = sum(size for _, size, _ in self.files())
+            else:
+                self.size += size
+            if self.size > self.max_bytes:
+                self.evict()
+
+    # Файлы ответов: (mtime, размер, путь)
+    def files(self):
+        result = []
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return result
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            result.append((stat.st_mtime, stat.st_size, entry.path))
+        return result
+
+    # Удаление давно не использованных ответов, пока размер кэша больше EVICT_TO * max_bytes
+    # (вызывается под self.lock). Счётчик размера сверяется с каталогом
+    def evict(self):
+        files = sorted(self.files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        self.size = total
+
+    def clear(self):
+        for _, _, path in self.files():
+            os.remove(path)
+        self.size = 0
+
+
+# Кэш по переменным окружения: LLM_CACHE (rw/ro/off), LLM_CACHE_DIR, LLM_CACHE_MAX_MB, LLM_CACHE_TTL (секунды)
+def cache_from_env():
+    mode = os.environ.get("LLM_CACHE", "rw")
+    if mode not in MODES:
+        raise ValueError(f"LLM_CACHE должен быть одним из {MODES}, получено {mode!r}")
+    if mode == "off":
+        return None
+    max_mb = os.environ.get("LLM_CACHE_MAX_MB")
+    ttl = os.environ.get("LLM_CACHE_TTL")
+    return ResponseCache(
+        directory=os.environ.get("LLM_CACHE_DIR", DEFAULT_DIR),
+        max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else 64 * 1024 * 1024,
+        ttl=float(ttl) if ttl else None,
+        read_only=mode == "ro",
+    )
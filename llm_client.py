@@ -0,0 +1,164 @@
+import asyncio
+import importlib.util
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from llm_cache import cache_from_env, cache_key
+
+# Общий клиент LLM для модулей I и III.
+# Одна HTTP-сессия с пулом соединений на процесс, таймауты, повторы с джиттером на 429/5xx
+# и общий предел одновременных запросов. Адрес API можно подменить переменной окружения LLM_API_URL
+# (например, на локальную заглушку llm_stub.py). Ответы кэшируются на диске (llm_cache.py), попадание в кэш
+# обходится без сети.
+
+DEFAULT_URL = "https://api.deepseek.com/v1/chat/completions"
+DEFAULT_MODEL = "deepseek-coder"
+RETRY_STATUSES = {429, 500, 502, 503, 504}# Ответы, после которых запрос стоит повторить
+
+
+class LLMClient:
+    # timeout - (на соединение, на ответ) в секундах, retries - число повторов после первой попытки,
+    # backoff/max_backoff - базовая и наибольшая пауза между повторами, concurrency - предел одновременных запросов,
+    # cache - кэш ответов (ResponseCache) или None
+    def __init__(self, api_key, url=None, model=DEFAULT_MODEL, timeout=(10, 120), retries=4,
+                 backoff=1.0, max_backoff=30.0, concurrency=8, cache=None):
+        self.url = url or os.environ.get("LLM_API_URL", DEFAULT_URL)
+        self.model = model
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        })
+
+    # Пауза перед повтором: экспоненциальная с полным джиттером, либо Retry-After от сервера
+    def delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    # Запрос к чату: системный промпт и сообщение пользователя -> текст ответа.
+    # deadline - крайний срок ответа по time.monotonic() или None (см. request)
+    def chat(self, system_prompt, user_message, temperature=0.1, deadline=None):
+        if self.cache is not None:
+            key = cache_key(self.model, temperature, system_prompt, user_message)
+            content = self.cache.get(key)
+            if content is not None:
+                return content
+        content = self.request(system_prompt, user_message, temperature, deadline)
+        if self.cache is not None:
+            self.cache.put(key, content)
+        return content
+
+    # Запрос к API с повторами (без кэша). С крайним сроком deadline таймауты попыток урезаются до оставшегося
+    # времени, а повтор, который не успеет начаться до срока, не делается - вместо ответа requests.Timeout
+    def request(self, system_prompt, user_message, temperature=0.1, deadline=None):
+        data = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+            "temperature": temperature
+        }
+        for attempt in range(self.retries + 1):
+            self.acquire(deadline)
+            try:
+                timeout = self.timeout
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise requests.Timeout("крайний срок запроса к LLM истёк")
+                    timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+                response = self.session.post(self.url, json=data, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries or deadline is not None and time.monotonic() >= deadline:
+                    raise
+                pause = self.delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response.json()['choices'][0]['message']['content']
+                pause = self.delay(attempt, response.headers.get("Retry-After"))
+            finally:
+                self.slots.release()
+            if deadline is not None and time.monotonic() + pause >= deadline:
+                raise requests.Timeout("крайний срок запроса к LLM истечёт до повтора")
+            time.sleep(pause)# Ждём вне семафора, чтобы не занимать место других запросов
+
+    # Место среди одновременных запросов; с крайним сроком ожидание ограничено им
+    def acquire(self, deadline=None):
+        if deadline is None:
+            self.slots.acquire()
+        elif not self.slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+            raise requests.Timeout("крайний срок запроса к LLM истёк в очереди запросов")
+
+    # Асинхронный вариант chat: запрос выполняется в потоке, предел одновременных запросов общий
+    async def achat(self, system_prompt, user_message, temperature=0.1):
+        return await asyncio.to_thread(self.chat, system_prompt, user_message, temperature)
+
+    # Пачка запросов [(системный промпт, сообщение), ...] -> ответы в том же порядке
+    async def achat_many(self, requests_list, temperature=0.1):
+        return await asyncio.gather(*(self.achat(system_prompt, user_message, temperature)
+                                      for system_prompt, user_message in requests_list))
+
+    def close(self):
+        self.session.close()
+
+
+# Общие клиенты процесса (по ключу API) и их настройки
+_clients = {}
+_options = {}
+_lock = threading.Lock()
+
+
+# Общий клиент для ключа api_key (создаётся при первом обращении): модули с одним ключом делят один клиент.
+# Если кэш не задан через configure(cache=...), он настраивается переменными окружения (см. llm_cache.cache_from_env)
+def get_client(api_key):
+    with _lock:
+        client = _clients.get(api_key)
+        if client is None:
+            options = dict(_options)
+            if "cache" not in options:
+                options["cache"] = cache_from_env()
+            client = _clients[api_key] = LLMClient(api_key, **options)
+        return client
+
+
+# Изменение настроек общих клиентов (например, concurrency для пакетного запуска).
+# Текущие клиенты закрываются, следующий get_client создаст новый
+def configure(**options):
+    with _lock:
+        _options.update(options)
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+# Настройки модуля цепочки - config.py в его каталоге (в нём ключ API).
+# Файл загружается по пути: модули I и III работают в одном процессе, и import config отдал бы
+# второму модулю уже загруженные настройки первого (из sys.modules)
+def load_config(directory):
+    path = os.path.join(directory, "config.py")
+    if not os.path.exists(path):
+        raise ImportError(f"нет файла настроек {path}")
+    spec = importlib.util.spec_from_file_location(f"config_{os.path.basename(directory)}", path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return config
@@ -0,0 +1,92 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Локальная заглушка API чата (формат chat/completions) для проверки без сети и без ключа.
+# По умолчанию отвечает сообщением пользователя, reply(system_prompt, user_message) задаёт свой ответ.
+# fail_every - каждый N-й запрос получает 503 (проверка повторов), delay - задержка ответа в секундах
+# Запуск: python llm_stub.py --port 8000, затем LLM_API_URL=http://127.0.0.1:8000/v1/chat/completions
+
+
+def echo(system_prompt, user_message):
+    return user_message
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"# Соединения не закрываются после ответа - как у настоящего API
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            number = server.requests
+        if server.fail_every and number % server.fail_every == 0:
+            self.send_error(503, "Service Unavailable")# Строка статуса HTTP - только latin-1
+            return
+        if server.delay:
+            time.sleep(server.delay)
+        messages = json.loads(body)["messages"]
+        system_prompt = next((m["content"] for m in messages if m["role"] == "system"), "")
+        user_message = next((m["content"] for m in messages if m["role"] == "user"), "")
+        content = server.reply(system_prompt, user_message)
+        answer = json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]}, ensure_ascii=False)
+        data = answer.encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):# Клиент не дождался ответа (таймаут)
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Запуск заглушки в фоновом потоке. port=0 - любой свободный порт. Адрес API - в server.url
+def serve(port=0, reply=echo, fail_every=0, delay=0.0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.reply = reply
+    server.fail_every = fail_every
+    server.delay = delay
+    server.requests = 0
+    server.connections = 0# Сколько соединений принято (проверка их повторного использования)
+    server.lock = threading.Lock()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    process_request = server.process_request
+
+    def accept(request, client_address):
+        with server.lock:
+            server.connections += 1
+        process_request(request, client_address)
+
+    server.process_request = accept
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальная заглушка API чата")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reply-file", help="файл, содержимое которого возвращается на любой запрос")
+    parser.add_argument("--fail-every", type=int, default=0, help="каждый N-й запрос получает 503")
+    parser.add_argument("--delay", type=float, default=0.0, help="задержка ответа в секундах")
+    args = parser.parse_args()
+
+    reply = echo
+    if args.reply_file:
+        with open(args.reply_file, "r", encoding="utf-8") as f:
+            text = f.read()
+        reply = lambda system_prompt, user_message: text
+    server = serve(args.port, reply, args.fail_every, args.delay)
+    print(f"Заглушка LLM: {server.url}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,22 @@
+import argparse
+import functools
+import importlib.util
 import os
-import shutil
-import subprocess
-import requests
-from numpy.random import random_integers
+import sys
 from tests.problem import *
 import random
 
+# Путь к текущему каталогу
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Модули цепочки: имя для импорта и каталог
+FORMALIZER = ("rus_to_log", "1-rus-to-log")
+ENGINE = ("resolution_engine", "2-strict-resolution-engine")
+EXPLAINER = ("log_to_rus", "3-log-to-rus")
+
+# Кэш результатов резолюции: RESOLUTION_CACHE=rw|ro|off (по умолчанию rw), каталог - RESOLUTION_CACHE_DIR
+RESOLUTION_CACHE_DIR = os.path.join(BASE_DIR, ".resolution_cache")
+
 
 def launch():
     if not os.path.exists("input.txt") or os.path.getsize("input.txt") == 0:
@@ -20,94 +31,138 @@ def launch():
             return f.read()
 
 
-def main():
-    # Путь к текущему каталогу
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-
-    launch()
-
-    with open("input.txt", 'r', encoding='utf-8') as f:
-        print(f.read())
-
-    # Шаг 1: Копируем input.txt в 1-rus-to-log/input.txt
-    input_path = os.path.join(base_dir, "input.txt")
-    module1_input_path = os.path.join(base_dir, "1-rus-to-log", "input.txt")
-
-    if os.path.exists(input_path):
-        shutil.copy(input_path, module1_input_path)
-        print(f"Скопирован {input_path} в {module1_input_path}")
+# Загрузка модуля цепочки в текущий процесс.
+# Каталоги модулей содержат дефисы, поэтому модуль грузится по пути к main.py,
+# а сам каталог добавляется в sys.path для его собственных импортов (config, terms, ...)
+@functools.lru_cache(maxsize=None)
+def load_module(name, directory):
+    module_dir = os.path.join(BASE_DIR, directory)
+    if module_dir not in sys.path:
+        sys.path.append(module_dir)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(module_dir, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Результат решения одной задачи всеми тремя модулями
+class Result:
+    def __init__(self, problem_text, formalization, clauses, proof, log, log_text, explanation):
+        self.problem_text = problem_text
+        self.formalization = formalization# Ответ модуля I (JSON с клаузами)
+        self.clauses = clauses
+        self.proof = proof# True/False, None - ресурсы движка исчерпаны
+        self.log = log
+        self.log_text = log_text# Вход модуля III
+        self.explanation = explanation# Ответ модуля III
+
+
+# Запись промежуточных результатов в файлы (для отладки)
+def dump(result, dump_dir):
+    os.makedirs(dump_dir, exist_ok=True)
+    files = {
+        "input.txt": result.problem_text,
+        "1-formalization.json": result.formalization,
+        "2-resolution.txt": result.log_text,
+        "3-explanation.txt": result.explanation,
+    }
+    for filename, text in files.items():
+        with open(os.path.join(dump_dir, filename), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Кэш результатов резолюции по каноническому виду клауз (None, если отключён)
+@functools.lru_cache(maxsize=None)
+def result_cache():
+    mode = os.environ.get("RESOLUTION_CACHE", "rw")
+    if mode == "off":
+        return None
+    engine = load_module(*ENGINE)
+    return engine.ResultCache(os.environ.get("RESOLUTION_CACHE_DIR", RESOLUTION_CACHE_DIR), read_only=mode == "ro")
+
+
+# Модуль II: разбор формализации и поиск противоречия.
+# Повторные и переименованные наборы клауз берутся из кэша результатов без запуска резолюции.
+# Если противоречие найдено, в лог попадают только шаги опровержения - модулю III не нужны остальные.
+# portfolio - решать портфелем стратегий в отдельных процессах (без кэша), отчёт о победителе печатается.
+# strategy - стратегия из engine.STRATEGIES. В "sos" множество поддержки - клаузы, отмеченные формализатором
+# как цели ("goal": true), а если отметок нет - клаузы из одних отрицательных литералов.
+# profile - профиль запуска движка (engine.Profile), заполняется, если резолюция действительно запускалась.
+# Основные клаузы решает CDCL-решатель движка; herbrand - заземлять и клаузы с переменными (без функций),
+# если основных примеров не больше стольких.
+# Вернёт клаузы, ответ (True/False, None - ресурсы исчерпаны), лог и лог в текстовом виде для модуля III
+def prove(formalization, limits=None, portfolio=False, strategy="sos", profile=None, herbrand=None):
+    engine = load_module(*ENGINE)
+    goals = []
+    clauses = engine.parse_clauses(formalization, goals)
+    if limits is None:
+        limits = engine.Limits(max_steps=500, max_seconds=60)
+    options = engine.strategy_options(strategy, goals)
+    cache = result_cache()
+    if portfolio:
+        proof, log, report = engine.portfolio_resolution(clauses, limits=vars(limits), proof_only=True, goals=goals,
+                                                         herbrand=herbrand)
+        print(f"Портфель стратегий: победила {report['winner']}, {report['strategies']}")
+    elif cache is None:
+        proof, log = engine.resolution(clauses, limits=limits, proof_only=True, profile=profile, herbrand=herbrand,
+                                       **options)
     else:
-        print(f"Ошибка: файл {input_path} не найден.")
-        return
+        proof, log = engine.cached_resolution(clauses, cache, limits, proof_only=True, profile=profile, herbrand=herbrand,
+                                              **options)
+    return clauses, proof, log, engine.format_log(log, proof)
 
 
-    # Шаг 2: Запускаем main.py в каталоге 1-rus-to-log
-    module1_main_path = os.path.join(base_dir, "1-rus-to-log", "main.py")
-    if os.path.exists(module1_main_path):
-        subprocess.run(["python", module1_main_path], cwd=os.path.join(base_dir, "1-rus-to-log"))
-        print(f"Запущен {module1_main_path}")
-    else:
-        print(f"Ошибка: файл {module1_main_path} не найден.")
-        return
+# Решение задачи в одном процессе: формализация -> резолюция -> объяснение.
+# limits - ограничения движка резолюций (Limits), dump_dir - каталог для отладочных файлов,
+# portfolio, strategy, profile и herbrand - как в prove
+def solve(problem_text, limits=None, dump_dir=None, portfolio=False, strategy="sos", profile=None, herbrand=None):
+    formalizer = load_module(*FORMALIZER)
+    explainer = load_module(*EXPLAINER)
 
-    # Шаг 3: Копируем output.txt из 1-rus-to-log в input.txt для 2-strict-resolution-engine
-    module1_output_path = os.path.join(base_dir, "1-rus-to-log", "output.txt")
-    module2_input_path = os.path.join(base_dir, "2-strict-resolution-engine", "input.txt")
+    formalization = formalizer.formalize(problem_text)
+    clauses, proof, log, log_text = prove(formalization, limits, portfolio, strategy, profile, herbrand)
+    explanation = explainer.explain(log_text)
 
-    if os.path.exists(module1_output_path):
-        shutil.copy(module1_output_path, module2_input_path)
-        print(f"Скопирован {module1_output_path} в {module2_input_path}")
-    else:
-        print(f"Ошибка: файл {module1_output_path} не найден.")
-        return
-
-    # Шаг 4: Запускаем main.py в каталоге 2-strict-resolution-engine
-    module2_main_path = os.path.join(base_dir, "2-strict-resolution-engine", "main.py")
-    if os.path.exists(module2_main_path):
-        subprocess.run(["python", module2_main_path], cwd=os.path.join(base_dir, "2-strict-resolution-engine"))
-        print(f"Запущен {module2_main_path}")
-    else:
-        print(f"Ошибка: файл {module2_main_path} не найден.")
-        return
+    result = Result(problem_text, formalization, clauses, proof, log, log_text, explanation)
+    if dump_dir is not None:
+        dump(result, dump_dir)
+    return result
 
-    # Шаг 5: Копируем output.txt из 2-strict-resolution-engine в input.txt для 3-log-to-rus
-    module2_output_path = os.path.join(base_dir, "2-strict-resolution-engine", "output.txt")
-    module3_input_path = os.path.join(base_dir, "3-log-to-rus", "input.txt")
 
-    if os.path.exists(module2_output_path):
-        shutil.copy(module2_output_path, module3_input_path)
-        print(f"Скопирован {module2_output_path} в {module3_input_path}")
-    else:
-        print(f"Ошибка: файл {module2_output_path} не найден.")
-        return
-
-    # Шаг 6: Запускаем main.py в каталоге 3-log-to-rus
-    module3_main_path = os.path.join(base_dir, "3-log-to-rus", "main.py")
-    if os.path.exists(module3_main_path):
-        subprocess.run(["python", module3_main_path], cwd=os.path.join(base_dir, "3-log-to-rus"))
-        print(f"Запущен {module3_main_path}")
-    else:
-        print(f"Ошибка: файл {module3_main_path} не найден.")
-        return
+def main():
+    parser = argparse.ArgumentParser(description="Нейро-символический решатель логических задач")
+    parser.add_argument("--dump", metavar="DIR", help="сохранить промежуточные результаты модулей в каталог DIR")
+    parser.add_argument("--portfolio", action="store_true", help="запустить несколько стратегий резолюции параллельно")
+    parser.add_argument("--strategy", default="sos", choices=sorted(load_module(*ENGINE).STRATEGIES),
+                        help="стратегия резолюции (по умолчанию sos - множество поддержки с предпочтением единичных)")
+    parser.add_argument("--stats", action="store_true",
+                        help="собрать профиль движка резолюций и записать его в stats.json рядом с output.txt")
+    parser.add_argument("--herbrand", type=int, metavar="N",
+                        help="решать SAT-решателем и клаузы с переменными, если их основных примеров не больше N")
+    args = parser.parse_args()
 
-    # Шаг 7: Копируем output.txt из 3-log-to-rus в output.txt текущего каталога
-    module3_output_path = os.path.join(base_dir, "3-log-to-rus", "output.txt")
-    final_output_path = os.path.join(base_dir, "output.txt")
+    launch()
 
-    if os.path.exists(module3_output_path):
-        shutil.copy(module3_output_path, final_output_path)
-        print(f"Скопирован {module3_output_path} в {final_output_path}")
-    else:
-        print(f"Ошибка: файл {module3_output_path} не найден.")
-        return
-
-    # Шаг 8: Выводим содержимое output.txt в терминал
-    if os.path.exists(final_output_path):
-        with open(final_output_path, "r", encoding="utf-8") as file:
-            print("\nСодержимое output.txt:")
-            print(file.read())
-    else:
-        print(f"Ошибка: файл {final_output_path} не найден.")
+    with open("input.txt", 'r', encoding='utf-8') as f:
+        problem_text = f.read()
+    print(problem_text)
+
+    profile = None
+    if args.stats:
+        engine = load_module(*ENGINE)
+        profile = engine.Profile(progress=lambda snapshot: print(f"Идёт поиск: {snapshot}"), interval=5.0)
+    result = solve(problem_text, dump_dir=args.dump, portfolio=args.portfolio, strategy=args.strategy, profile=profile,
+                   herbrand=args.herbrand)
+
+    # Итоговое объяснение сохраняем в output.txt текущего каталога и выводим в терминал
+    final_output_path = os.path.join(BASE_DIR, "output.txt")
+    with open(final_output_path, "w", encoding="utf-8") as file:
+        file.write(result.explanation)
+    if profile is not None:
+        engine.write_profile(profile, os.path.join(BASE_DIR, "stats.json"))
+    print("\nСодержимое output.txt:")
+    print(result.explanation)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import llm_client
+import llm_stub
+import main as pipeline
+from batch import prove_worker
+
+# Сервис решения задач: HTTP/JSON API поверх цепочки модулей и движка резолюций.
+# Модули и промпты загружаются один раз при запуске, резолюция идёт в пуле заранее запущенных процессов,
+# запросы к LLM - через общий клиент с пулом соединений. Одновременно принимается не больше
+# workers + queue_size запросов, остальные сразу получают 503 (их стоит повторить позже).
+# У каждого запроса свой предел времени: движок получает оставшееся время в Limits, запросы к LLM -
+# крайний срок (таймауты и повторы урезаются до него), а если ответа всё равно нет вовремя, клиент получает 504.
+# Остановить уже начатую в пуле резолюцию нельзя, поэтому место запроса после 504 остаётся занятым,
+# пока процесс пула не закончит (движок сам остановится по max_seconds).
+#
+# POST /solve {"problem": "текст задачи"} - вся цепочка: формализация, резолюция, объяснение
+# POST /prove {"clauses": [...]} или {"formalization": "JSON-текст"} - только резолюция
+# GET /health - состояние сервиса
+# Необязательные поля запросов: "strategy", "max_steps", "timeout" (секунды).
+
+DEFAULT_TIMEOUT = 120.0
+MAX_STEPS = 5000# Верхняя граница max_steps из запроса
+
+
+# Ошибка запроса с кодом ответа HTTP. pending - резолюция, которая ещё идёт в пуле после ответа
+class RequestError(Exception):
+    def __init__(self, status, message, pending=None):
+        super().__init__(message)
+        self.status = status
+        self.pending = pending
+
+
+# Загрузка движка в процессе пула сразу при его запуске, а не при первом запросе
+def warm_worker():
+    pipeline.load_module(*pipeline.ENGINE)
+
+
+class SolverServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # workers - процессы резолюции, queue_size - сколько запросов может ждать сверх них,
+    # timeout - предел времени запроса по умолчанию и наибольший допустимый
+    def __init__(self, address, workers=2, queue_size=8, timeout=DEFAULT_TIMEOUT):
+        super().__init__(address, SolverHandler)
+        self.formalizer = pipeline.load_module(*pipeline.FORMALIZER)
+        self.explainer = pipeline.load_module(*pipeline.EXPLAINER)
+        self.engine = pipeline.load_module(*pipeline.ENGINE)
+        self.formalizer.system_prompt()
+        self.explainer.system_prompt()
+        self.timeout = timeout
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.slots = threading.BoundedSemaphore(self.capacity)
+        self.active = 0
+        self.lock = threading.Lock()
+        self.engines = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=warm_worker)
+        for future in [self.engines.submit(time.sleep, 0) for _ in range(workers)]:
+            future.result()# Все процессы пула запущены и прогреты
+
+    # Освобождение сокета и остановка пула (serve_forever в другом потоке останавливается shutdown())
+    def close(self):
+        self.server_close()
+        self.engines.shutdown(cancel_futures=True)
+
+    # Освобождение места запроса. Если его резолюция ещё идёт (pending), место освобождается только
+    # по её окончании - иначе сервис принял бы больше работы, чем есть свободных процессов
+    def release(self, pending=None):
+        if pending is None:
+            self.slots.release()
+        else:
+            pending.add_done_callback(lambda future: self.slots.release())
+
+    # Резолюция в пуле процессов с пределом времени deadline (по time.monotonic)
+    def prove(self, formalization, strategy, max_steps, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RequestError(504, "предел времени запроса исчерпан до резолюции")
+        limits = {"max_steps": max_steps, "max_seconds": remaining}
+        future = self.engines.submit(prove_worker, formalization, limits, strategy)
+        try:
+            # Движок сам остановится по max_seconds, запас - на передачу результата
+            return future.result(timeout=remaining + 1.0)
+        except FutureTimeoutError:
+            raise RequestError(504, "резолюция не уложилась в предел времени запроса", future) from None
+        except self.engine.ClauseFormatError as error:
+            raise RequestError(422, f"ошибка в клаузах: {error}") from None
+
+
+class SolverHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/health":
+            self.reply(404, {"error": f"неизвестный путь {self.path}"})
+            return
+        server = self.server
+        self.reply(200, {"status": "ok", "workers": server.workers, "active": server.active, "capacity": server.capacity})
+
+    def do_POST(self):
+        handlers = {"/solve": self.solve, "/prove": self.prove}
+        handler = handlers.get(self.path)
+        if handler is None:
+            self.reply(404, {"error": f"неизвестный путь {self.path}"})
+            return
+        server = self.server
+        if not server.slots.acquire(blocking=False):
+            self.reply(503, {"error": "сервис перегружен, повторите запрос позже"}, {"Retry-After": "1"})
+            return
+        with server.lock:
+            server.active += 1
+        started = time.monotonic()
+        pending = None
+        try:
+            request = self.read_request()
+            result = handler(request, started + min(request["timeout"], server.timeout))
+            result["seconds"] = round(time.monotonic() - started, 3)
+            self.reply(200, result)
+        except RequestError as error:
+            pending = error.pending
+            self.reply(error.status, {"error": str(error)})
+        except Exception as error:# Ошибка одного запроса не должна останавливать сервис
+            self.reply(500, {"error": f"{type(error).__name__}: {error}"})
+        finally:
+            with server.lock:
+                server.active -= 1
+            server.release(pending)
+
+    def read_request(self):
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError as error:
+            raise RequestError(400, f"тело запроса - не JSON: {error}") from None
+        if not isinstance(request, dict):
+            raise RequestError(400, "тело запроса должно быть JSON-объектом")
+        strategy = request.setdefault("strategy", "sos")
+        if strategy not in self.server.engine.STRATEGIES:
+            raise RequestError(400, f"неизвестная стратегия {strategy}")
+        max_steps = request.setdefault("max_steps", 500)
+        if not isinstance(max_steps, int) or not 0 < max_steps <= MAX_STEPS:
+            raise RequestError(400, f"max_steps должно быть целым от 1 до {MAX_STEPS}")
+        timeout = request.setdefault("timeout", self.server.timeout)
+        if not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise RequestError(400, "timeout должно быть положительным числом секунд")
+        return request
+
+    def solve(self, request, deadline):
+        problem_text = request.get("problem")
+        if not isinstance(problem_text, str) or not problem_text.strip():
+            raise RequestError(400, "нужно непустое строковое поле \"problem\"")
+        server = self.server
+        try:
+            formalization = server.formalizer.formalize(problem_text, deadline)
+        except requests.Timeout:
+            raise RequestError(504, "формализация не уложилась в предел времени запроса") from None
+        proof, log, log_text = server.prove(formalization, request["strategy"], request["max_steps"], deadline)
+        if time.monotonic() > deadline:
+            raise RequestError(504, "предел времени запроса исчерпан до объяснения")
+        try:
+            explanation = server.explainer.explain(log_text, deadline)
+        except requests.Timeout:
+            raise RequestError(504, "объяснение не уложилось в предел времени запроса") from None
+        return {"formalization": formalization, "proof": proof, "log": log, "explanation": explanation}
+
+    def prove(self, request, deadline):
+        if "clauses" in request:
+            formalization = json.dumps(request["clauses"], ensure_ascii=False)
+        elif isinstance(request.get("formalization"), str):
+            formalization = request["formalization"]
+        else:
+            raise RequestError(400, "нужно поле \"clauses\" (массив клауз) или \"formalization\" (JSON-текст)")
+        proof, log, _ = self.server.prove(formalization, request["strategy"], request["max_steps"], deadline)
+        return {"proof": proof, "log": log}
+
+    def reply(self, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Заглушка LLM для проверки без сети: формализатору отвечает содержимым файла с клаузами,
+# объяснителю - присланным логом
+def start_stub(formalization_file, formalizer):
+    with open(formalization_file, "r", encoding="utf-8") as f:
+        formalization = f.read()
+    prompt = formalizer.system_prompt()
+    stub = llm_stub.serve(reply=lambda system_prompt, user_message: formalization if system_prompt == prompt else user_message)
+    llm_client.configure(url=stub.url)
+    return stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON-сервис решения логических задач")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="число процессов резолюции")
+    parser.add_argument("--queue-size", type=int, default=8, help="сколько запросов может ждать сверх числа процессов")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="предел времени запроса в секундах")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="число одновременных запросов к LLM")
+    parser.add_argument("--llm-stub", metavar="FILE",
+                        help="вместо LLM - локальная заглушка, формализация берётся из FILE (JSON с клаузами)")
+    args = parser.parse_args()
+
+    llm_client.configure(concurrency=args.llm_concurrency)
+    server = SolverServer((args.host, args.port), args.workers, args.queue_size, args.timeout)
+    if args.llm_stub:
+        start_stub(args.llm_stub, server.formalizer)
+    print(f"Сервис запущен: http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import json
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("requests")
+
+import batch
+import llm_client
+from tests.problem import problem
+
+# Проверки пакетного решения задач (batch.py) без LLM: модули I и III подменяются
+
+FORMALIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formalized")
+
+
+def test_load_corpus(tmp_path):
+    assert batch.load_corpus() == [{"id": index, "problem": text} for index, text in enumerate(problem)]
+    path = tmp_path / "corpus.jsonl"
+    path.write_text('"Первая задача"\n\n{"id": "x", "problem": "Вторая задача"}\n{"problem": "Третья"}\n',
+                    encoding="utf-8")
+    assert batch.load_corpus(str(path)) == [{"problem": "Первая задача", "id": 0},
+                                            {"id": "x", "problem": "Вторая задача"},
+                                            {"problem": "Третья", "id": 3}]
+
+
+# Текст задачи - уже готовая формализация; объяснение - число строк лога.
+# Ответы и логи пакета те же, что у pipeline.prove в одном процессе, ошибка одной задачи не мешает остальным
+def test_solve_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESOLUTION_CACHE", "off")# Наследуется процессами пула
+    batch.pipeline.result_cache.cache_clear()
+    monkeypatch.setattr(llm_client, "_options", {})
+    fakes = {batch.pipeline.FORMALIZER: types.SimpleNamespace(formalize=lambda text: text),
+             batch.pipeline.EXPLAINER: types.SimpleNamespace(explain=lambda log_text: str(log_text.count("\n")))}
+    load_module = batch.pipeline.load_module
+    monkeypatch.setattr(batch.pipeline, "load_module", lambda *module: fakes.get(module) or load_module(*module))
+
+    corpus = []
+    for name in ("p1", "p3", "p5", "p8"):
+        with open(os.path.join(FORMALIZED_DIR, f"{name}.json"), "r", encoding="utf-8") as f:
+            corpus.append({"id": name, "problem": f.read()})
+    corpus.append({"id": "broken", "problem": "не JSON"})
+    output = tmp_path / "results.jsonl"
+    reported = []
+    assert batch.solve_batch(corpus, str(output), workers=2, llm_concurrency=2, on_result=reported.append) == 4
+    batch.pipeline.result_cache.cache_clear()
+
+    records = {record["id"]: record for record in map(json.loads, output.read_text(encoding="utf-8").splitlines())}
+    assert sorted(records) == sorted(item["id"] for item in corpus) and len(reported) == len(corpus)
+    assert records["broken"]["error"].startswith("ClauseFormatError")
+    engine = load_module(*batch.pipeline.ENGINE)
+    for item in corpus[:-1]:
+        _, proof, log, log_text = batch.pipeline.prove(item["problem"], engine.Limits(**batch.DEFAULT_LIMITS))
+        record = records[item["id"]]
+        assert (record["proof"], record["log"]) == (proof, log)
+        assert record["explanation"] == str(log_text.count("\n")) and "error" not in record
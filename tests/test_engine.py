@@ -0,0 +1,169 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Проверки поведения движка резолюций (без LLM): python -m pytest tests
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Clause, Literal, Term = engine.Clause, engine.Literal, engine.Term
+
+import saturation# Каталог движка добавлен в sys.path при загрузке
+
+FORMALIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formalized")
+# Ответы замороженных формализаций (p9: посылки противоречивы сами по себе, как и исходная задача 9)
+FORMALIZED = {"p1": True, "p2": True, "p3": False, "p4": True, "p5": False, "p6": True, "p7": True, "p8": True, "p9": True}
+
+
+def read_formalized(name):
+    goals = []
+    clauses = engine.read_clauses(os.path.join(FORMALIZED_DIR, f"{name}.json"), goals)
+    return clauses, goals
+
+# Принцип Дирихле: pigeons голубей по cells клеткам (основные клаузы, противоречиво при pigeons > cells)
+def pigeonhole(pigeons, cells):
+    clauses = [Clause([Literal("В", [f"P{pigeon}", f"K{cell}"]) for cell in range(cells)]) for pigeon in range(pigeons)]
+    for cell in range(cells):
+        for first in range(pigeons):
+            for second in range(first + 1, pigeons):
+                clauses.append(Clause([Literal("В", [f"P{first}", f"K{cell}"], True),
+                                       Literal("В", [f"P{second}", f"K{cell}"], True)]))
+    return clauses
+
+# Проверка опровержения по шагам: каждый шаг следует из своих родителей, исходные шаги - из clauses
+def check_refutation(solver, clauses):
+    assert solver.status == engine.PROOF
+    contradiction = solver.contradiction
+    assert not contradiction.clause.literals
+    for step in contradiction.ancestors():
+        for parent in step.parents:
+            if parent.kind == saturation.INPUT:
+                assert parent.clause in clauses
+        if step.kind == saturation.RESOLUTION:
+            partner, given = step.parents[0].clause, step.parents[1].clause
+            derived = [clause for clause, _, _ in saturation.resolvents(saturation.rename_apart(given, partner), given,
+                                                                        [step.pair])]
+            assert derived == [step.clause]
+        elif step.kind == saturation.FACTOR:
+            assert (step.clause, step.pair) in [(clause, pair) for clause, _, pair in saturation.factors(step.parents[0].clause)]
+        elif step.kind == saturation.INSTANCE:
+            substitution = dict(step.pair)
+            literals = [literal.apply_substitution(substitution) for literal in step.parents[0].clause.literals]
+            assert Clause(literals) == step.clause and all(literal.ground for literal in literals)
+        else:
+            pytest.fail(f"неизвестный вид шага {step.kind}")
+
+
+# Повторы литералов в клаузе не должны мешать опровержению: ¬X ∨ ¬X - это ¬X
+def test_duplicate_literals():
+    x = Literal("X", [])
+    assert Clause([x.negate(), x.negate()]).literals == (x.negate(),)
+    assert engine.resolution([Clause([x]), Clause([x.negate(), x.negate()])], sat=False)[0] is True
+    p = Literal("P", ["x"])
+    not_pa = Literal("P", ["A"], True)
+    assert engine.resolution([Clause([p]), Clause([not_pa, not_pa])])[0] is True
+
+
+# Основные клаузы: CDCL-решатель и насыщение дают один ответ, опровержения проверяются по шагам
+@pytest.mark.parametrize("pigeons, cells, expected", [(3, 2, True), (4, 3, True), (2, 2, False), (3, 3, False)])
+def test_ground_unsat_and_sat(pigeons, cells, expected):
+    clauses = pigeonhole(pigeons, cells)
+    ground = engine.ground_saturation(clauses)
+    assert ground is not None
+    assert {engine.PROOF: True, engine.SATURATED: False}[ground.run(engine.Limits(None))] is expected
+    full = engine.Saturation(clauses, "unit")
+    assert {engine.PROOF: True, engine.SATURATED: False}[full.run(engine.Limits(None))] is expected
+    if expected:
+        check_refutation(ground, clauses)
+        check_refutation(full, clauses)
+
+
+# Заземление по универсуму Эрбрана: шаги подстановки входят в проверяемое опровержение
+def test_herbrand_refutation():
+    x = "x"
+    clauses = [Clause([Literal("P", ["A"])]), Clause([Literal("P", [x], True), Literal("Q", [x])]),
+               Clause([Literal("Q", ["A"], True)])]
+    ground = engine.ground_saturation(clauses, herbrand=10)
+    assert ground.run(engine.Limits()) == engine.PROOF
+    check_refutation(ground, clauses)
+    assert engine.ground_saturation(clauses) is None
+    assert engine.ground_saturation([Clause([Literal("P", [Term("f", [x])])])], herbrand=10) is None
+
+
+# Случайные 3-КНФ из 12 атомов: ответ CDCL-решателя сверяется с перебором всех означиваний,
+# опровержения (восстановленные из выученных клауз) проверяются по шагам
+@pytest.mark.parametrize("seed", range(12))
+def test_cdcl_random_cnf(seed):
+    generator = random.Random(seed)
+    variables = 12
+    signs = [[(atom, generator.random() < 0.5) for atom in generator.sample(range(variables), 3)]
+             for _ in range(5 * variables)]
+    clauses = [Clause([Literal(f"X{atom}", [], negated) for atom, negated in clause]) for clause in signs]
+    satisfiable = any(all(any((model >> atom & 1) != negated for atom, negated in clause) for clause in signs)
+                      for model in range(1 << variables))
+    ground = engine.ground_saturation(clauses)
+    assert ground.run(engine.Limits(None)) == (engine.SATURATED if satisfiable else engine.PROOF)
+    if not satisfiable:
+        check_refutation(ground, clauses)
+        assert ground.proof_log()[-1].endswith("-> Противоречие.")
+
+
+# Замороженные формализации: ответ каждой стратегии и корректность опровержений.
+# Множество поддержки, насыщенное без противоречия, досчитывается полным поиском
+@pytest.mark.parametrize("name", sorted(FORMALIZED))
+@pytest.mark.parametrize("strategy", ["fifo", "sos", "ordered"])
+def test_formalized(name, strategy):
+    clauses, goals = read_formalized(name)
+    solver = engine.Saturation(clauses, **engine.strategy_options(strategy, goals))
+    solver, status = engine.run_saturation(solver, engine.Limits(2000))
+    assert {engine.PROOF: True, engine.SATURATED: False}.get(status) is FORMALIZED[name]
+    if status == engine.PROOF:
+        check_refutation(solver, clauses)
+
+
+def test_format_log_reasons():
+    assert engine.format_log([], None).endswith("неизвестно (исчерпаны ресурсы)\n")
+    assert "множество поддержки" in engine.format_log([], None, "support")
+    assert engine.format_log(["Шаг 1"], True) == "Лог шагов:\nШаг 1\nПротиворечие найдено: True\n"
+
+
+# Разбор текстовой записи: то, что печатает движок, читается обратно
+def test_notation_round_trip():
+    text = "¬P(x) ∨ Q(f(x), A)\n~R(g(y, B)) | S; T(C)  # комментарий\n"
+    clauses = engine.parse_clause_set(text)
+    assert [str(clause) for clause in clauses] == ["¬P(x) ∨ Q(f(x), A)", "¬R(g(y, B)) ∨ S()", "T(C)"]
+    assert engine.parse_clause_set(engine.format_clause_set(clauses)) == clauses
+    with pytest.raises(engine.ClauseFormatError):
+        engine.parse_clause_set("P(x ∨ Q")
+
+
+# JSON и двоичный формат клауз: отметки целей и ошибки формата
+def test_codecs():
+    clauses, goals = read_formalized("p5")
+    assert goals and all(goal in clauses for goal in goals)
+    data = json.dumps([clause.to_dict() for clause in clauses], ensure_ascii=False)
+    assert engine.parse_clauses(data) == clauses
+    assert engine.load_binary(engine.dump_binary(clauses)) == clauses
+    with pytest.raises(engine.ClauseFormatError):
+        engine.parse_clauses('[{"literals": [{"predicate": "P", "args": [1], "negated": false}]}]')
+
+
+# Кэш результатов: переименованный набор - попадание с тем же ответом и логом в исходных именах
+def test_result_cache(tmp_path):
+    cache = engine.ResultCache(str(tmp_path))
+    clauses, goals = read_formalized("p1")
+    first = engine.cached_resolution(clauses, cache, proof_only=True, support=goals)
+    stats = {}
+    assert engine.cached_resolution(clauses, cache, stats=stats, proof_only=True, support=goals) == first
+    assert stats == {}# Попадание - движок не запускался
+    renamed = engine.parse_clauses(json.dumps([clause.to_dict() for clause in clauses], ensure_ascii=False)
+                                   .replace('"x"', '"v"'))
+    assert engine.cached_resolution(renamed, cache, stats=stats, proof_only=True, support=goals)[0] is True
+    assert stats == {}
+    assert engine.replay(cache, engine.parse_clauses) == []
@@ -0,0 +1,106 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Индексы клауз (index.py): поиск партнёров по резолюции
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Clause, Literal, Term = engine.Clause, engine.Literal, engine.Term
+
+import index# Каталог движка добавлен в sys.path при загрузке
+import saturation
+from unification import unify_literal_args
+
+
+# Партнёры - клаузы с литералом того же предиката и арности, но другого знака, в порядке добавления
+def test_predicate_index_partners():
+    first = Clause([Literal("P", ["x"]), Literal("Q", ["x"], True)])
+    second = Clause([Literal("P", ["A", "B"], True)])# Другая арность
+    third = Clause([Literal("Q", ["A"]), Literal("P", ["y"], True), Literal("Q", ["B"])])
+    fourth = Clause([Literal("P", ["C"])])# Тот же знак
+    predicates = index.PredicateIndex()
+    for clause in (first, second, third, fourth):
+        predicates.add(clause)
+    given = Clause([Literal("Q", ["z"]), Literal("P", ["z"], True)])
+    assert predicates.partners(given) == [(0, first, [(0, 1), (1, 0)]), (3, fourth, [(0, 1)])]
+    assert [partner for _, partner, _ in predicates.partners(Clause([Literal("Q", ["z"], True)]))] == [third]
+    assert predicates.partners(Clause([Literal("R", [])])) == []
+
+
+def test_predicate_index_remove():
+    clauses = [Clause([Literal("P", [name])]) for name in ("A", "B", "C")]
+    predicates = index.PredicateIndex()
+    for clause in clauses:
+        predicates.add(clause)
+    assert len(predicates) == 3
+    assert predicates.remove(clauses[1]) and not predicates.remove(clauses[1])
+    assert not predicates.remove(Clause([Literal("R", ["A"])]))
+    assert len(predicates) == 2 and predicates.clauses() == [clauses[0], clauses[2]]
+    # Номера не переиспользуются: порядок выдачи партнёров сохраняется
+    predicates.add(clauses[1])
+    assert [number for number, _, _ in predicates.partners(Clause([Literal("P", ["x"], True)]))] == [0, 2, 3]
+
+
+# Случайные литералы P/Q с термами глубины до 2. Переменные с уникальными именами (линейные литералы),
+# если linear, иначе из x, y - тогда в литерале бывают повторы
+def random_literals(count, linear, seed=0):
+    generator = random.Random(seed)
+    names = iter(range(10 ** 6))
+
+    def term(depth):
+        if depth == 0 or generator.random() < 0.4:
+            if generator.random() < 0.4:
+                return f"v{seed}_{next(names)}" if linear else generator.choice(["x", "y"])
+            return generator.choice(["A", "B"])
+        return Term(generator.choice(["f", "g"]), [term(depth - 1) for _ in range(generator.randint(1, 2))])
+
+    return [Literal(generator.choice(["P", "Q"]), [term(2), term(2)]) for _ in range(count)]
+
+def unifiable(l1, l2):
+    return l1.predicate == l2.predicate and unify_literal_args(l1, l2, {}, [])
+
+# Выдача дерева различения против перебора: для линейных литералов - точно те же вхождения,
+# с повторными переменными - надмножество (их проверяет унификация)
+def test_term_index_retrieval():
+    for linear in (True, False):
+        stored = random_literals(150, linear)
+        queries = random_literals(60, linear, seed=1)
+        if not linear:
+            # Запросы без общих переменных с хранимыми литералами
+            queries = [literal.apply_substitution({"x": "u", "y": "w"}) for literal in queries]
+        terms = index.TermIndex()
+        for literal in stored:
+            terms.add(Clause([literal]))
+        checks = ((terms.unifiable, unifiable),
+                  (terms.instances, lambda query, literal: saturation.match_literal(query, literal, {}) is not None),
+                  (terms.generalizations, lambda query, literal: saturation.match_literal(literal, query, {}) is not None))
+        for query in queries:
+            for retrieve, accepts in checks:
+                found = {clause.literals[0] for _, clause, _ in retrieve(query)}
+                expected = {literal for literal in stored if accepts(query, literal)}
+                if linear:
+                    assert found == expected, (retrieve.__name__, query)
+                else:
+                    assert found >= expected, (retrieve.__name__, query)
+
+
+# Партнёры дерева различения - партнёры индекса предикатов без заведомо не унифицируемых пар
+def test_term_index_partners():
+    clauses = [Clause(random_literals(2, False, seed)) for seed in range(100)]
+    predicates, terms = index.PredicateIndex(), index.TermIndex()
+    for clause in clauses:
+        predicates.add(clause)
+        terms.add(clause)
+    for clause in clauses[:30]:
+        given = Clause([literal.negate().apply_substitution({"x": "u", "y": "w"}) for literal in clause.literals])
+        found = {(number, pair) for number, _, pairs in terms.partners(given) for pair in pairs}
+        possible = {(number, pair) for number, _, pairs in predicates.partners(given) for pair in pairs}
+        unified = {(number, (j, i)) for number, partner, pairs in predicates.partners(given) for j, i in pairs
+                   if unify_literal_args(partner.literals[j], given.literals[i], {}, [])}
+        assert unified <= found <= possible
+    assert terms.remove(clauses[0]) and not terms.remove(clauses[0])
+    assert len(terms) == 99 and terms.clauses() == clauses[1:]
@@ -0,0 +1,62 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Ограничения ресурсов (Limits): причина остановки и продолжение поиска после неё
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Clause, Literal, Term = engine.Clause, engine.Literal, engine.Term
+
+import saturation
+
+
+# Бесконечный вывод P(C), P(f(C)), P(f(f(C))), ... - поиск останавливается только ограничениями
+def endless():
+    return [Clause([Literal("P", ["C"])]), Clause([Literal("P", ["x"], True), Literal("P", [Term("f", ["x"])])])]
+
+
+def test_reasons():
+    limits = engine.Limits(max_steps=3, max_seconds=1.0, max_clauses=10)
+    assert limits.exceeded(2, 0.5, 9) is None
+    assert limits.exceeded(3, 0.5, 9) == "steps"
+    assert limits.exceeded(2, 1.0, 9) == "time"
+    assert limits.exceeded(2, 0.5, 10) == "clauses"
+    assert engine.Limits(None).exceeded(10 ** 6, 10 ** 6, 10 ** 6) is None
+
+
+# Остановка по каждому ограничению и продолжение с того же места: лог тот же, что у поиска без перерыва
+def test_run_stops_and_continues():
+    for limits, reason in ((engine.Limits(5), "steps"), (engine.Limits(None, max_clauses=3), "clauses"),
+                           (engine.Limits(None, max_seconds=0), "time")):
+        search = engine.Saturation(endless())
+        assert search.run(limits) == engine.UNKNOWN
+        assert search.reason == reason
+    whole = engine.Saturation(endless())
+    whole.run(engine.Limits(10))
+    split = engine.Saturation(endless())
+    split.run(engine.Limits(4))
+    split.run(engine.Limits(6))
+    assert split.log == whole.log
+
+
+# Ограничение памяти - по текущему объёму: большой пик в прошлом не останавливает новый запуск
+def test_memory_limit_ignores_past_peak(monkeypatch):
+    monkeypatch.setattr(saturation, "peak_memory_mb", lambda: 5000.0)
+    monkeypatch.setattr(saturation, "current_memory_mb", lambda: 50.0)
+    assert engine.Limits(max_memory_mb=100).exceeded(0, 0, 0) is None
+    assert engine.Limits(max_memory_mb=40).exceeded(0, 0, 0) == "memory"
+    search = engine.Saturation(endless())
+    assert search.run(engine.Limits(None, max_memory_mb=40)) == engine.UNKNOWN
+    assert search.reason == "memory"
+    # Без /proc остаётся только пик
+    monkeypatch.setattr(saturation, "current_memory_mb", lambda: None)
+    assert engine.Limits(max_memory_mb=100).exceeded(0, 0, 0) == "memory"
+
+
+def test_current_memory():
+    memory = engine.current_memory_mb()
+    if memory is not None:
+        assert 0 < memory <= engine.peak_memory_mb() + 1
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm_cache
+import main as pipeline
+
+# Кэш ответов LLM (llm_cache.ResponseCache): срок жизни, вытеснение давно не использованных ответов,
+# режим только для чтения. Отсутствующий каталог кэша результатов резолюции - пустой кэш
+
+
+def test_ttl(tmp_path, monkeypatch):
+    cache = llm_cache.ResponseCache(str(tmp_path), ttl=10)
+    cache.put("ключ", "ответ")
+    assert cache.get("ключ") == "ответ"
+    now = time.time()
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now + 20)
+    assert cache.get("ключ") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru(tmp_path):
+    cache = llm_cache.ResponseCache(str(tmp_path), max_bytes=None)
+    cache.put("a", "x" * 100)
+    size = os.path.getsize(cache.path("a"))
+    cache = llm_cache.ResponseCache(str(tmp_path), max_bytes=size * 5 // 2)# Два ответа помещаются и после вытеснения
+    cache.put("b", "x" * 100)
+    os.utime(cache.path("a"), (1000, 1000))
+    os.utime(cache.path("b"), (2000, 2000))
+    assert cache.get("a") is not None# Обращение обновляет mtime: теперь давно не использован b
+    cache.put("c", "x" * 100)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size == os.path.getsize(cache.path("a")) + os.path.getsize(cache.path("c"))
+
+
+# Каталог просматривается только при превышении предела, а не при каждой записи
+def test_put_does_not_scan(tmp_path, monkeypatch):
+    cache = llm_cache.ResponseCache(str(tmp_path), max_bytes=1 << 20)
+    cache.put("первый", "ответ")
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(llm_cache.os, "scandir", lambda path: scans.append(path) or scandir(path))
+    for number in range(20):
+        cache.put(str(number), "ответ")
+    assert scans == []
+
+
+def test_read_only(tmp_path):
+    directory = str(tmp_path / "нет")
+    cache = llm_cache.ResponseCache(directory, read_only=True)
+    assert not os.path.exists(directory)
+    assert cache.get("ключ") is None
+    cache.put("ключ", "ответ")
+    cache.clear()
+    assert not os.path.exists(directory)
+    writer = llm_cache.ResponseCache(str(tmp_path))
+    writer.put("ключ", "ответ")
+    os.utime(writer.path("ключ"), (1000, 1000))
+    reader = llm_cache.ResponseCache(str(tmp_path), read_only=True)
+    assert reader.get("ключ") == "ответ"
+    assert os.path.getmtime(writer.path("ключ")) == 1000# Чтение не отмечает обращение
+
+
+def test_result_cache_missing_directory(tmp_path):
+    engine = pipeline.load_module(*pipeline.ENGINE)
+    cache = engine.ResultCache(str(tmp_path / "нет"), read_only=True)
+    assert list(cache.entries()) == []
+    assert engine.replay(cache, engine.parse_clauses) == []
@@ -0,0 +1,124 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+requests = pytest.importorskip("requests")
+
+import llm_client
+import llm_stub
+
+# Проверки общего клиента LLM на локальной заглушке (llm_stub.serve): повторы, крайний срок,
+# предел одновременных запросов и повторное использование соединений
+
+
+@pytest.fixture
+def stubs():
+    started = []
+
+    def start(**options):
+        stub = llm_stub.serve(**options)
+        started.append(stub)
+        return stub
+
+    yield start
+    for stub in started:
+        stub.shutdown()
+        stub.server_close()
+
+
+def client(stub, **options):
+    options.setdefault("backoff", 0.01)
+    return llm_client.LLMClient("test", url=stub.url, cache=None, **options)
+
+
+def test_retries_on_5xx(stubs):
+    stub = stubs(fail_every=2)# Второй запрос получает 503 и повторяется
+    llm = client(stub)
+    assert llm.chat("система", "первый") == "первый"
+    assert llm.chat("система", "второй") == "второй"
+    assert stub.requests == 3
+    failing = stubs(fail_every=1)
+    with pytest.raises(requests.HTTPError):
+        client(failing, retries=2).chat("система", "всегда 503")
+    assert failing.requests == 3# Первая попытка и два повтора
+
+
+def test_retries_on_timeout(stubs):
+    stub = stubs(delay=0.5)
+    with pytest.raises(requests.Timeout):
+        client(stub, timeout=(1, 0.1), retries=1).chat("система", "медленно")
+    assert stub.requests == 2
+
+
+def test_deadline(stubs):
+    stub = stubs(delay=2.0)
+    llm = client(stub, timeout=(10, 120), retries=4)
+    started = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        llm.chat("система", "медленно", deadline=started + 0.3)
+    assert time.monotonic() - started < 1.5
+    assert stub.requests == 1# Повтор после истечения срока не начинается
+    with pytest.raises(requests.Timeout):
+        llm.chat("система", "поздно", deadline=time.monotonic() - 1)
+    assert stub.requests == 1
+
+
+def test_concurrency_limit(stubs):
+    lock = threading.Lock()
+    active = [0, 0]# Текущее и наибольшее число одновременно обрабатываемых запросов
+
+    def reply(system_prompt, user_message):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return user_message
+
+    llm = client(stubs(reply=reply), concurrency=2)
+    threads = [threading.Thread(target=llm.chat, args=("система", str(number))) for number in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert active[1] == 2
+
+
+def test_connections_reused(stubs):
+    stub = stubs()
+    llm = client(stub)
+    for number in range(5):
+        assert llm.chat("система", str(number)) == str(number)
+    assert stub.requests == 5
+    assert stub.connections == 1
+
+
+# У каждого модуля свои настройки: config.py загружается по пути, а не из sys.modules
+def test_module_configs(tmp_path):
+    for name, key in (("1-rus-to-log", "ключ-1"), ("3-log-to-rus", "ключ-3")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "config.py").write_text(f"DEEPSEEK_API_KEY = {key!r}\n", encoding="utf-8")
+    assert llm_client.load_config(str(tmp_path / "1-rus-to-log")).DEEPSEEK_API_KEY == "ключ-1"
+    assert llm_client.load_config(str(tmp_path / "3-log-to-rus")).DEEPSEEK_API_KEY == "ключ-3"
+    with pytest.raises(ImportError):
+        llm_client.load_config(str(tmp_path))
+
+
+# Общий клиент - на каждый ключ API свой
+def test_client_per_key(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE", "off")
+    llm_client.configure()
+    try:
+        first = llm_client.get_client("ключ-1")
+        assert llm_client.get_client("ключ-1") is first
+        second = llm_client.get_client("ключ-3")
+        assert second is not first
+        assert second.session.headers["Authorization"] == "Bearer ключ-3"
+    finally:
+        llm_client.configure()
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Параллельное построение резольвент (parallel.ResolventPool): ответ и лог те же, что без процессов
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+
+import parallel
+from codec import Decoder, Encoder
+
+FORMALIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formalized")
+
+# Набор, в котором новые клаузы поглощают уже обработанные
+SUBSUMING = """
+¬Q(x) ∨ ¬R(B)
+Q(A) ∨ ¬P(y)
+R(A)
+¬R(y) ∨ R(x) ∨ ¬R(A)
+¬Q(B)
+¬P(B) ∨ ¬R(A) ∨ ¬R(x)
+R(x) ∨ Q(y)
+P(y) ∨ ¬P(B)
+¬R(B) ∨ R(A)
+Q(y) ∨ ¬R(A) ∨ ¬R(B)
+"""
+
+
+# Поглощённые обработанные клаузы удаляются и из процессов: пул помнит только живые клаузы индекса
+def test_backward_subsumption_reaches_workers():
+    clauses = engine.parse_clause_set(SUBSUMING)
+    sequential = engine.Saturation(clauses)
+    status = sequential.run(engine.Limits(60))
+    removed = []
+    with parallel.ResolventPool(2, min_partners=1) as pool:
+        remove = pool.remove
+        pool.remove = lambda clause: removed.append(clause in pool.numbers) or remove(clause)
+        search = engine.Saturation(clauses, pool=pool)
+        assert search.run(engine.Limits(60)) == status
+        assert search.log == sequential.log
+        assert any(removed) and search.stats["backward_subsumed"] == sequential.stats["backward_subsumed"]
+        assert set(pool.numbers) == set(search.processed.clauses())
+
+
+# Каждая резольвента строится в процессах (min_partners=1): ответ, лог и счётчики те же, что без них.
+# Три процесса - неравные доли партнёров
+@pytest.mark.parametrize("workers", [2, 3])
+def test_same_as_sequential(workers):
+    with parallel.ResolventPool(workers, min_partners=1) as pool:
+        for name in sorted(os.listdir(FORMALIZED_DIR)):
+            clauses = engine.read_clauses(os.path.join(FORMALIZED_DIR, name))
+            sequential = engine.Saturation(clauses, trace=True)
+            search = engine.Saturation(clauses, trace=True, pool=pool)
+            assert search.run(engine.Limits(200)) == sequential.run(engine.Limits(200)), name
+            assert search.log == sequential.log and search.stats == sequential.stats, name
+            pool.clear()# Пул переиспользуется следующим набором, как при повторном поиске без множества поддержки
+
+
+# Номер клаузы, удалённой после последней отправки, после clear получает новая клауза:
+# процесс сначала забывает прежнюю и только потом сохраняет новую
+def test_clear_reuses_numbers():
+    first, second = engine.parse_clause_set("P(x) ∨ Q(x)\nP(A) ∨ R(A)")
+    given = engine.parse_clause_set("¬P(B)")[0]
+    with parallel.ResolventPool(1, min_partners=1) as pool:
+        pool.add(0, first)
+        assert [len(new) for _, new in pool.resolvents(given, [(0, first, [(0, 0)])])] == [1]
+        pool.remove(first)
+        pool.clear()
+        pool.add(0, second)
+        assert pool.pending == [[(0, second)]] and pool.removed == [[0]]
+        assert pool.resolvents(given, [(0, second, [(0, 0)])]) == [(second, [])]# P(A) и ¬P(B) не унифицируются
+        assert pool.numbers == {second: 0}
+
+
+# resolution с workers: тот же результат, процессы закрываются после поиска
+def test_resolution_workers():
+    clauses = engine.read_clauses(os.path.join(FORMALIZED_DIR, "p8.json"))
+    assert engine.resolution(clauses, workers=2, sat=False) == engine.resolution(clauses, sat=False)
+    assert not multiprocessing.active_children()
+
+
+# Кодировщик канала передаёт каждый символ один раз: следующие сообщения ссылаются на прежнюю таблицу
+def test_channel_codec():
+    clauses = engine.parse_clause_set(SUBSUMING)
+    encoder, decoder = Encoder(), Decoder()
+    first = encoder.clauses(clauses) or encoder.result()
+    second = encoder.clauses(clauses) or encoder.result()
+    assert len(second) < len(first)
+    assert decoder.feed(first).clauses() == clauses
+    assert decoder.feed(second).clauses() == clauses
@@ -0,0 +1,72 @@
+import os
+import queue
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Портфель стратегий (portfolio_resolution): победитель, цели вместо множества поддержки, отчёт о проигравших
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Clause, Literal, Term = engine.Clause, engine.Literal, engine.Term
+
+import portfolio
+
+FORMALIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formalized")
+X = Literal("X", [])
+Q = Literal("Q", ["C"])
+
+
+# Противоречие X, ¬X и бесконечный вывод Q(C), Q(f(C)), ... без противоречия
+def contradiction_and_endless_chain():
+    return [Clause([X]), Clause([X.negate()]), Clause([Q]),
+            Clause([Literal("Q", ["x"], True), Literal("Q", [Term("f", ["x"])])])]
+
+
+def run_strategy(options, goals=None, limits=None):
+    results = queue.Queue()
+    goal_data = engine.dump_binary(goals) if goals else None
+    portfolio.run_strategy("test", engine.dump_binary(contradiction_and_endless_chain()), options,
+                           limits or {"max_steps": 50}, False, results, goal_data)
+    return results.get_nowait()
+
+
+# Цели заменяют множество поддержки из отрицательных клауз: от Q(C) противоречие не выводится
+def test_goals_replace_support():
+    options = {"selection": "fifo", "support": engine.NEGATIVE}
+    assert run_strategy(options)[1:3] == (engine.PROOF, None)
+    assert run_strategy(options, [Clause([Q])])[1:3] == (engine.UNKNOWN, "steps")
+
+
+# Побеждает стратегия, нашедшая противоречие; стратегия, которая всё ещё ищет, остановлена
+def test_winner_and_cancelled():
+    strategies = {
+        "full": ({"selection": "fifo"}, True),
+        "goal": ({"selection": "fifo", "support": engine.NEGATIVE}, True),
+    }
+    proof, log, report = engine.portfolio_resolution(contradiction_and_endless_chain(), strategies,
+                                                     {"max_steps": None, "max_seconds": 60}, goals=[Clause([Q])])
+    assert proof is True and log
+    assert report["winner"] == "full"
+    assert report["strategies"]["full"]["status"] == engine.PROOF
+    assert report["strategies"]["goal"]["status"] == "cancelled"
+
+
+# Насыщение неполной стратегии не побеждает: ждём полную, а без неё ответа нет
+def test_incomplete_never_wins():
+    goals = []
+    clauses = engine.read_clauses(os.path.join(FORMALIZED_DIR, "p5.json"), goals)
+    strategies = {"partial": ({"selection": "unit"}, False), "full": ({"selection": "fifo"}, True)}
+    proof, _, report = engine.portfolio_resolution(clauses, strategies, sat=False)
+    assert proof is False and report["winner"] == "full"
+    assert report["strategies"]["partial"]["status"] in ("incomplete", "cancelled")
+    proof, _, report = engine.portfolio_resolution(clauses, {"partial": strategies["partial"]}, sat=False)
+    assert proof is None and report["winner"] is None
+    assert report["strategies"]["partial"]["status"] == "incomplete"
+
+
+# Основные клаузы решает CDCL-решатель без процессов
+def test_ground_input():
+    proof, log, report = engine.portfolio_resolution([Clause([X]), Clause([X.negate()])])
+    assert proof is True and report == {"winner": "cdcl", "strategies": {"cdcl": report["strategies"]["cdcl"]}}
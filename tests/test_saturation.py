@@ -0,0 +1,141 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Цикл данной клаузы (Saturation): удаление избыточных клауз, ответ и лог
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Clause, Literal = engine.Clause, engine.Literal
+
+import saturation# Каталог движка добавлен в sys.path при загрузке
+
+FORMALIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formalized")
+
+
+# Счётчики удалённых клауз: тавтологии и дубликаты входа, прямое и обратное поглощение
+def test_redundancy_counters():
+    clauses = engine.parse_clause_set("""
+        P(x) ∨ ¬P(x)
+        Q(A) ∨ R(A)
+        Q(A) ∨ R(A)
+        Q(A) ∨ R(A) ∨ S(B)
+        Q(x)
+    """)
+    search = engine.Saturation(clauses)
+    assert search.stats["tautologies"] == 1
+    assert search.stats["duplicates"] == 1
+    assert search.stats["forward_subsumed"] == 1# Q(A) ∨ R(A) ∨ S(B) поглощена Q(A) ∨ R(A)
+    assert search.stats["backward_subsumed"] == 1# Q(x) поглощает Q(A) ∨ R(A)
+    assert set(search.kept.clauses()) == {Clause([Literal("Q", ["x"])])}
+    assert search.run(engine.Limits()) == engine.SATURATED
+
+
+# Очередь необработанных клауз: порядок выбора каждой стратегии и удаление без выбора
+def test_clause_queue_order():
+    heavy = Clause([Literal("P", [engine.Term("f", [engine.Term("f", ["x"])])])])
+    pair = Clause([Literal("Q", ["x"]), Literal("R", ["x"])])
+    light = Clause([Literal("S", ["x"])])
+    clauses = [heavy, pair, light]
+
+    def order(selection, **options):
+        queue = saturation.ClauseQueue(selection, **options)
+        for clause in clauses:
+            queue.push(clause)
+        return [queue.pop() for _ in range(len(queue))]
+
+    assert order("fifo") == [heavy, pair, light]
+    assert order("weight") == [light, heavy, pair]# Веса 2, 4, 4: при равном весе - старшая
+    assert order("unit") == [light, heavy, pair]
+    assert order("ratio", pick_ratio=1) == [light, heavy, pair]# Лёгкая, старая, лёгкая
+    queue = saturation.ClauseQueue("ratio")
+    for clause in clauses:
+        queue.push(clause)
+    assert queue.remove(light) and not queue.remove(light)
+    assert len(queue) == 2 and [queue.pop(), queue.pop()] == [heavy, pair]
+    with pytest.raises(ValueError):
+        saturation.ClauseQueue("random")
+
+
+# Ответ цикла данной клаузы не зависит от стратегии выбора; насыщение без противоречия - полное
+@pytest.mark.parametrize("selection", saturation.SELECTION_STRATEGIES)
+def test_selection_answers(selection):
+    proof = engine.parse_clause_set("""
+        ¬Человек(x) ∨ Смертен(x)
+        Человек(Сократ)
+        ¬Смертен(Сократ)
+    """)
+    satisfiable = engine.parse_clause_set("""
+        ¬P(x) ∨ Q(f(x))
+        P(A)
+        ¬Q(B)
+    """)
+    assert engine.resolution(proof, selection=selection, sat=False)[0] is True
+    answer, log = engine.resolution(satisfiable, selection=selection, sat=False)
+    assert answer is False and log
+    search = engine.Saturation(satisfiable, selection)
+    assert search.run() == engine.SATURATED and len(search.unprocessed) == 0
+    assert set(search.derivations) >= set(search.processed.clauses())
+
+
+# Данная клауза резольвирует и сама с собой (после переименования переменных)
+def test_given_resolves_with_itself():
+    clauses = engine.parse_clause_set("""
+        ¬P(x) ∨ P(f(x))
+        P(A)
+        ¬P(f(f(A)))
+    """)
+    search = engine.Saturation(clauses)
+    assert search.run() == engine.PROOF
+    assert Clause([Literal("P", ["x"], True), Literal("P", [engine.Term("f", [engine.Term("f", ["x"])])])]) \
+        in search.derivations
+
+
+# Поиск, который строит строки лога сразу при записи шага (как до графа вывода)
+class EagerSaturation(engine.Saturation):
+    def __init__(self, *args, **kwargs):
+        self.eager_log = []
+        super().__init__(*args, **kwargs)
+
+    def record(self, step):
+        super().record(step)
+        if step.kind != saturation.INPUT:
+            self.eager_log += step.render(trace=self.trace)
+
+
+# Ленивый лог совпадает с построенным сразу, в том числе если его читать по частям между запусками
+@pytest.mark.parametrize("name", ["p4", "p5", "p8", "p9"])
+@pytest.mark.parametrize("trace", [False, True])
+def test_lazy_log(name, trace):
+    clauses = engine.read_clauses(os.path.join(FORMALIZED_DIR, f"{name}.json"))
+    eager = EagerSaturation(clauses, trace=trace)
+    status = eager.run(engine.Limits(300))
+    if eager.contradiction is not None:
+        eager.eager_log += eager.contradiction.render(trace=trace)
+    assert eager.log == eager.eager_log
+    lazy = engine.Saturation(clauses, trace=trace)
+    for _ in range(300):# Те же 300 шагов по одному
+        if lazy.run(engine.Limits(1)) != engine.UNKNOWN:
+            break
+        parts = list(lazy.log)
+        assert eager.eager_log[:len(parts)] == parts
+    assert lazy.status == status and lazy.log == eager.eager_log
+
+
+# Лог доказательства - только предки противоречия, перенумерованные по порядку
+def test_proof_log():
+    clauses = engine.read_clauses(os.path.join(FORMALIZED_DIR, "p8.json"))
+    search = engine.Saturation(clauses)
+    assert search.run(engine.Limits(300)) == engine.PROOF
+    ancestors = search.contradiction.ancestors()
+    assert ancestors[-1] is search.contradiction and len(ancestors) < len(search.steps)
+    assert search.proof_log() == [line for number, step in enumerate(ancestors, 1) for line in step.render(number)]
+    numbers = {id(step) for step in ancestors}
+    for step in ancestors:
+        assert all(parent.kind == saturation.INPUT or id(parent) in numbers for parent in step.parents)
+        assert step.render()[0] in search.log
+    assert engine.Saturation(clauses).proof_log() == []
@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("requests")
+
+import server
+
+# Проверки сервиса решения задач (server.py)
+
+FORMALIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formalized")
+
+
+# Сервер без загрузки модулей I и III и без процессов: резолюция идёт в потоке
+def bare_server(capacity=1):
+    service = object.__new__(server.SolverServer)
+    service.engines = ThreadPoolExecutor(1)
+    service.slots = threading.BoundedSemaphore(capacity)
+    service.engine = server.pipeline.load_module(*server.pipeline.ENGINE)
+    return service
+
+
+# После 504 место запроса занято, пока резолюция в пуле не закончится
+def test_slot_held_until_engine_finishes(monkeypatch):
+    finish = threading.Event()
+    monkeypatch.setattr(server, "prove_worker", lambda formalization, limits, strategy: finish.wait(5))
+    service = bare_server()
+    assert service.slots.acquire(blocking=False)
+    with pytest.raises(server.RequestError) as error:
+        service.prove("[]", "sos", 10, time.monotonic() + 0.05)# Результат ждётся ещё секунду сверх срока
+    assert error.value.status == 504 and error.value.pending is not None
+    service.release(error.value.pending)
+    assert not service.slots.acquire(blocking=False)
+    finish.set()
+    error.value.pending.result(timeout=5)
+    assert service.slots.acquire(timeout=5)
+    service.release()
+    service.engines.shutdown()
+
+
+# Сервис: /health и /prove без LLM (формализатор и объяснитель лишь загружаются)
+def test_server():
+    try:
+        service = server.SolverServer(("127.0.0.1", 0), workers=1, queue_size=1, timeout=30)
+    except ImportError as error:# Модулям I и III нужен config.py с ключом API в их каталогах
+        pytest.skip(f"модули сервиса не загружаются: {error}")
+    threading.Thread(target=service.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{service.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{url}/health") as response:
+            assert json.loads(response.read())["status"] == "ok"
+        with open(os.path.join(FORMALIZED_DIR, "p1.json"), encoding="utf-8") as f:
+            body = json.dumps({"formalization": f.read()}).encode("utf-8")
+        with urllib.request.urlopen(urllib.request.Request(f"{url}/prove", data=body)) as response:
+            assert json.loads(response.read())["proof"] is True
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(urllib.request.Request(f"{url}/prove", data=b"{}"))
+        assert error.value.code == 400
+    finally:
+        service.shutdown()
+        service.close()
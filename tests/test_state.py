@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Сохранение и продолжение насыщения (save_state/read_state)
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Clause, Literal = engine.Clause, engine.Literal
+
+FORMALIZED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "formalized")
+
+
+# Посылки противоречивы, цель к противоречию не ведёт: после загрузки состояния запасной полный поиск
+# должен идти по исходным клаузам, а не по пустому набору
+def test_resume_support_fallback(tmp_path):
+    a, g = Literal("A", []), Literal("G", [])
+    goal = Clause([g.negate()])
+    clauses = [Clause([a]), Clause([a.negate()]), Clause([g.negate(), Literal("H", ["x"])]), goal]
+    assert engine.run_saturation(engine.Saturation(clauses, support=[goal]), engine.Limits())[1] == engine.PROOF
+    saturation = engine.Saturation(clauses, support=[goal])
+    assert saturation.run(engine.Limits(0)) == engine.UNKNOWN
+    path = str(tmp_path / "state.bin")
+    engine.save_state(saturation, path)
+    assert engine.run_saturation(engine.read_state(path), engine.Limits())[1] == engine.PROOF
+
+
+# Поиск, прерванный ограничением, сохранённый и продолженный после загрузки, даёт тот же ответ и лог,
+# что и поиск без перерыва - со множеством поддержки из целей и без него
+@pytest.mark.parametrize("name", ["p4", "p5", "p8", "p9"])
+@pytest.mark.parametrize("strategy", ["fifo", "sos"])
+@pytest.mark.parametrize("split", [0, 1, 3])
+def test_resume_matches_uninterrupted(tmp_path, name, strategy, split):
+    goals = []
+    clauses = engine.read_clauses(os.path.join(FORMALIZED_DIR, f"{name}.json"), goals)
+    options = engine.strategy_options(strategy, goals)
+    whole, status = engine.run_saturation(engine.Saturation(clauses, **options), engine.Limits(None))
+    saturation = engine.Saturation(clauses, **options)
+    if saturation.run(engine.Limits(split)) == engine.UNKNOWN:
+        path = str(tmp_path / "state.bin")
+        engine.save_state(saturation, path)
+        saturation = engine.read_state(path)
+    resumed, resumed_status = engine.run_saturation(saturation, engine.Limits(None))
+    assert resumed_status == status
+    assert resumed.log == whole.log
@@ -0,0 +1,60 @@
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Неизменяемые разделяемые (hash-consed) термы, литералы и клаузы
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Clause, Literal, Term = engine.Clause, engine.Literal, engine.Term
+
+
+def test_structurally_equal_are_identical():
+    assert Term("f", ["x", Term("g", ["C"])]) is Term("f", ["x", Term("g", ["C"])])
+    assert Term("f", ["x"]) is not Term("f", ["y"])
+    assert Literal("P", [Term("f", ["x"])], True) is Literal("P", (Term("f", ["x"]),), True)
+    assert Literal("P", ["x"], True) is not Literal("P", ["x"], False)
+    assert Literal("P", ["x"]).negate() is Literal("P", ["x"], True)
+
+
+def test_clause_is_a_set():
+    p, q = Literal("P", ["x"]), Literal("Q", ["C"], True)
+    assert Clause([p, q]) == Clause([q, p])
+    assert hash(Clause([p, q])) == hash(Clause([q, p]))
+    assert Clause([p, q, p]).literals == (p, q)
+    assert Clause([p, q]) != Clause([p])
+    assert len({Clause([p, q]), Clause([q, p]), Clause([p])}) == 2
+
+
+@pytest.mark.parametrize("value", [Term("f", ["x"]), Literal("P", ["x"]), Clause([Literal("P", ["x"])])])
+def test_immutable(value):
+    with pytest.raises(AttributeError):
+        value.args = ()
+    with pytest.raises(AttributeError):
+        del value.ground
+
+
+def test_substitution_keeps_unchanged_objects():
+    term = Term("f", ["x", Term("g", ["C"])])
+    literal = Literal("P", [term, "y"])
+    assert term.apply_substitution({}) is term
+    assert term.apply_substitution({"z": "C"}) is term
+    assert term.args[1].apply_substitution({"x": "C"}) is term.args[1]
+    assert literal.apply_substitution({"z": "C"}) is literal
+    assert literal.apply_substitution({"x": "C"}) is Literal("P", [Term("f", ["C", Term("g", ["C"])]), "y"])
+    assert term.ground is False and term.args[1].ground is True
+
+
+def test_pickle_interns_again():
+    term = Term("f", ["x", Term("g", ["C"])])
+    literal = Literal("P", [term], True)
+    clause = Clause([literal, Literal("Q", ["C"])])
+    assert pickle.loads(pickle.dumps(term)) is term
+    assert pickle.loads(pickle.dumps(literal)) is literal
+    loaded = pickle.loads(pickle.dumps(clause))
+    assert loaded == clause and loaded.literals[0] is literal
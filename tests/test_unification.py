@@ -0,0 +1,101 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as pipeline
+
+# Унификация (unification.py): треугольные привязки, откат по trail и лог только по запросу
+
+engine = pipeline.load_module(*pipeline.ENGINE)
+Literal, Term = engine.Literal, engine.Term
+
+import saturation# Каталог движка добавлен в sys.path при загрузке
+import unification
+
+
+def f(*args):
+    return Term("f", args)
+
+def g(*args):
+    return Term("g", args)
+
+
+# Наибольший общий унификатор идемпотентен и делает литералы контрарными
+def test_most_general_unifier():
+    l1 = Literal("P", ["x", g("y"), "y"])
+    l2 = Literal("P", [f("z"), g("A"), "z"], True)
+    substitution = engine.unify(l1, l2, {})
+    assert substitution == {"x": f("A"), "y": "A", "z": "A"}
+    assert engine.apply_substitution(l1, substitution).negate() == engine.apply_substitution(l2, substitution)
+    assert {var: engine.apply_substitution(Literal("R", [value]), substitution).args[0]
+            for var, value in substitution.items()} == substitution
+    assert engine.unify(Literal("P", ["x"]), Literal("P", ["A"]), {}) is None# Один знак
+    assert engine.unify(Literal("P", ["x"]), Literal("Q", ["A"], True), {}) is None
+    assert engine.unify(Literal("P", ["x"]), Literal("P", ["B"], True), {"x": "A"}) is None
+
+
+def test_occurs_check():
+    assert engine.unify(Literal("P", ["x"]), Literal("P", [f("x")], True), {}) is None
+    # Цикл через цепочку привязок: x -> f(y), затем y с g(x)
+    assert engine.unify(Literal("P", ["x", "y"]), Literal("P", [f("y"), g("x")], True), {}) is None
+
+
+# Привязки хранятся треугольными, resolved_substitution разыменовывает их до конца
+def test_triangular_bindings():
+    bindings, trail = {}, []
+    assert engine.unify_literal_args(Literal("P", ["x", "y"]), Literal("P", [f("y"), g("z")]), bindings, trail)
+    assert bindings == {"x": f("y"), "y": g("z")} and trail == ["x", "y"]
+    assert engine.resolved_substitution(bindings) == {"x": f(g("z")), "y": g("z")}
+
+
+# Неудачная унификация снимает только свои привязки, откат к отметке - все более поздние
+def test_undo():
+    bindings, trail = {"u": "A"}, ["u"]
+    assert not engine.unify_literal_args(Literal("P", ["x", "y", "B"]), Literal("P", ["A", "u", "C"]), bindings, trail)
+    assert bindings == {"u": "A"} and trail == ["u"]
+    assert engine.unify_literal_args(Literal("P", ["x", "y"]), Literal("P", ["A", "u"]), bindings, trail)
+    assert bindings == {"u": "A", "x": "A", "y": "A"}# Значения разыменовываются перед привязкой
+    unification.undo(bindings, trail, 1)
+    assert bindings == {"u": "A"} and trail == ["u"]
+
+
+# Строки лога строятся только при переданном trace; без него результат тот же
+def test_trace_only_when_requested():
+    l1, l2 = Literal("P", ["x", f("x")]), Literal("P", ["A", "y"], True)
+    trace = []
+    assert engine.unify(l1, l2, {}, trace) == engine.unify(l1, l2, {}) == {"x": "A", "y": f("A")}
+    assert trace == ["Шаг 1: Переменная x связана с A.", "Шаг 2: Переменная y связана с f(x)."]
+    trace = []
+    assert engine.unify(Literal("P", ["x"]), Literal("P", [f("x")], True), {}, trace) is None
+    assert trace == ["Шаг 1: Циклическая подстановка: переменная x входит в терм f(x)."]
+
+
+# Поиск без trace не строит шаги унификации; с trace они добавляются к тем же строкам лога с отступом
+def test_saturation_trace(monkeypatch):
+    clauses = engine.parse_clause_set("""
+        ¬P(x, f(x)) ∨ Q(x)
+        P(A, y)
+        ¬Q(A)
+    """)
+    traced = engine.Saturation(clauses, trace=True)
+    assert traced.run() == engine.PROOF
+    assert any(line.startswith("    Шаг") for line in traced.log)
+
+    def fail(l1, l2):
+        raise AssertionError("шаги унификации без trace")
+
+    monkeypatch.setattr(saturation, "unification_trace", fail)
+    plain = engine.Saturation(clauses)
+    assert plain.run() == engine.PROOF
+    assert plain.log == [line for line in traced.log if not line.startswith("    ")]
+
+
+# Унификация без рекурсии: глубина термов не ограничена стеком интерпретатора
+def test_deep_terms():
+    depth = sys.getrecursionlimit() * 3
+    ground, open_term = "A", "x"
+    for _ in range(depth):
+        ground, open_term = f(ground), f(open_term)
+    assert engine.unify(Literal("P", [ground]), Literal("P", [open_term], True), {}) == {"x": "A"}
+    assert engine.unify(Literal("P", [ground]), Literal("P", [f(open_term)], True), {}) is None